@@ -0,0 +1,76 @@
+"""Benchmark: sequential batch vs the load → render → write pipeline.
+
+The batch is mostly small 職務経歴書 with --large large ones at the end of
+the list. Writes go through a writer that sleeps --write-latency seconds
+per PDF, standing in for a slow network mount.
+
+- sequential    : load, render and write one document after the other
+- arrival order : BatchPipeline with lookahead=1 (rendered as loaded)
+- longest first : BatchPipeline ordering by estimate_render_cost, per-stage stats
+
+Usage: uv run python -m benchmarks.bench_batch [--font-dir fonts] [--documents 24]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from jp_tenshoku_docs_builder.batch import BatchJob, BatchPipeline, write_file
+from jp_tenshoku_docs_builder.work_history.builder import render_pdf
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from tests.synthetic import make_work_history
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font-dir", default=None)
+    parser.add_argument("--documents", type=int, default=24)
+    parser.add_argument("--large", type=int, default=2)
+    parser.add_argument("--write-latency", type=float, default=0.2)
+    parser.add_argument("--render-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    def slow_writer(path: Path, pdf: bytes) -> None:
+        time.sleep(args.write_latency)
+        write_file(path, pdf)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        sources = {
+            "small": make_work_history(companies=2, projects_per_company=5),
+            "large": make_work_history(companies=8, projects_per_company=15),
+        }
+        for name, data in sources.items():
+            text = yaml.safe_dump(data.model_dump(mode="json"), allow_unicode=True)
+            (Path(workdir) / f"{name}.yaml").write_text(text, encoding="utf-8")
+        sizes = ["small"] * (args.documents - args.large) + ["large"] * args.large
+        jobs = [
+            BatchJob(Path(workdir) / f"{size}.yaml", Path(workdir) / "out" / f"{i}.pdf",
+                     SAMPLE_DIR / "credential.yaml", options={"font_dir": args.font_dir})
+            for i, size in enumerate(sizes)
+        ]
+
+        start = time.perf_counter()
+        for job in jobs:
+            slow_writer(job.output, render_pdf(load_yaml(job.input, job.credential), args.font_dir))
+        sequential = time.perf_counter() - start
+
+        arrival = BatchPipeline(render_workers=args.render_workers, lookahead=1, writer=slow_writer).run(jobs)
+        pipeline = BatchPipeline(render_workers=args.render_workers, writer=slow_writer)
+        result = pipeline.run(jobs)
+
+    print(f"{args.documents} documents ({args.large} large), {args.write_latency * 1000:.0f} ms per write")
+    print(f"  sequential   : {sequential:8.2f} s")
+    print(f"  arrival order: {arrival.wall:8.2f} s ({pipeline.render_workers} render workers)")
+    print(f"  longest first: {result.wall:8.2f} s")
+    print("\n".join(f"    {line}" for line in result.to_text().splitlines()[1:]))
+
+
+if __name__ == "__main__":
+    main()
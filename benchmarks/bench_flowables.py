@@ -0,0 +1,47 @@
+"""Microbenchmark: flowable construction with and without the markup parser.
+
+Usage: uv run python -m benchmarks.bench_flowables [--font-dir fonts]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from unittest import mock
+
+from reportlab.platypus import Paragraph
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.work_history import builder
+from jp_tenshoku_docs_builder.work_history.styles import build_styles
+from tests.synthetic import make_work_history
+
+
+def _markup_paragraph(lines, style):
+    """The previous path: escape, join with <br/>, let the XML parser split it again."""
+    return Paragraph("<br/>".join(builder._escape(line) for line in lines), style)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font-dir", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    styles = build_styles(register_fonts(args.font_dir))
+    data = make_work_history(companies=3, projects_per_company=20, skill_categories=12, skills_per_category=10)
+
+    def build():
+        return builder._build_elements(data, styles)
+
+    fast = min(timeit.repeat(build, number=1, repeat=args.repeat))
+    with mock.patch.object(builder, "_plain_paragraph", _markup_paragraph):
+        parsed = min(timeit.repeat(build, number=1, repeat=args.repeat))
+
+    print(f"flowables: {len(build())}")
+    print(f"markup parser : {parsed * 1000:8.2f} ms")
+    print(f"direct frags  : {fast * 1000:8.2f} ms  ({parsed / fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark: layout of a 500-project CV with each line-breaking mode.
+
+- latin    : ReportLab's default word wrap (break at spaces only)
+- rl-cjk   : ReportLab's wordWrap="CJK" (stringWidth per glyph, hanging only)
+- kinsoku  : JapaneseParagraph (cached glyph widths, 行頭/行末禁則)
+
+Usage: uv run python -m benchmarks.bench_linebreak [--font-dir fonts]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from unittest import mock
+
+from reportlab.platypus import Paragraph
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.work_history import builder
+from jp_tenshoku_docs_builder.work_history.styles import build_styles
+from tests.synthetic import make_work_history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font-dir", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fonts = register_fonts(args.font_dir)
+    data = make_work_history(companies=5, projects_per_company=100)
+
+    def layout(word_wrap: str | None, paragraph_class: type) -> tuple[float, int]:
+        styles = build_styles(fonts)
+        for style in styles.values():
+            style.wordWrap = word_wrap
+        with mock.patch.object(builder, "JapaneseParagraph", paragraph_class):
+            pages = builder._layout(data, styles, "standard", 1, 1.0).pages
+            seconds = min(timeit.repeat(
+                lambda: builder._layout(data, styles, "standard", 1, 1.0), number=1, repeat=args.repeat,
+            ))
+        return seconds, pages
+
+    for label, word_wrap, cls in (
+        ("latin", None, Paragraph),
+        ("rl-cjk", "CJK", Paragraph),
+        ("kinsoku", "CJK", builder.JapaneseParagraph),
+    ):
+        seconds, pages = layout(word_wrap, cls)
+        print(f"{label:<8}: {seconds * 1000:8.1f} ms  ({pages} pages)")
+
+
+if __name__ == "__main__":
+    main()
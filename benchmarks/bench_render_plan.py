@@ -0,0 +1,52 @@
+"""Benchmark: full render vs painting a recorded render plan.
+
+- render : render_pdf / render_resume_pdf (layout + PDF writing)
+- plan   : plan_pdf / plan_resume_pdf (layout, recording the drawing calls)
+- paint  : paint_pdf on the plan (PDF writing only), compressed and not
+
+Usage: uv run python -m benchmarks.bench_render_plan [--font-dir fonts]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from pathlib import Path
+
+
+from jp_tenshoku_docs_builder.render_plan import paint_pdf
+from jp_tenshoku_docs_builder.resume.builder import plan_resume_pdf, render_resume_pdf
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.work_history.builder import plan_pdf, render_pdf
+from tests.synthetic import make_work_history
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font-dir", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    resume = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=SAMPLE_DIR / "credential.yaml")
+    documents = [
+        ("職務経歴書 3x30", make_work_history(companies=3, projects_per_company=30), render_pdf, plan_pdf),
+        ("履歴書", resume, render_resume_pdf, plan_resume_pdf),
+    ]
+    for label, data, render, plan_document in documents:
+        plan = plan_document(data, args.font_dir)
+        runs = {
+            "render": lambda: render(data, args.font_dir),
+            "plan": lambda: plan_document(data, args.font_dir),
+            "paint": lambda: paint_pdf(plan),
+            "paint (no compression)": lambda: paint_pdf(plan, compression=False),
+        }
+        print(f"{label} ({len(plan.pages)} pages, plan JSON {len(plan.to_json()) / 1024:.0f} KiB)")
+        for name, run in runs.items():
+            seconds = min(timeit.repeat(run, number=1, repeat=args.repeat))
+            print(f"  {name:<24}: {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
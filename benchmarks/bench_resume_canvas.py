@@ -0,0 +1,51 @@
+"""Benchmark: drawing the 履歴書 pages with and without graphics-state tracking.
+
+- canvas   : ReportLab's Canvas (every setter writes an operator)
+- tracking : StateTrackingCanvas (repeated font / line width / dash / colour elided)
+
+Usage: uv run python -m benchmarks.bench_resume_canvas [--font-dir fonts]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from pathlib import Path
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen.canvas import Canvas
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.resume.builder import _draw_page1, _draw_page2
+from jp_tenshoku_docs_builder.resume.canvas import StateTrackingCanvas
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font-dir", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    fonts = register_fonts(args.font_dir)
+    resume = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=SAMPLE_DIR / "credential.yaml")
+
+    def draw(canvas_class: type) -> Canvas:
+        c = canvas_class(None, pagesize=A4)
+        _draw_page1(c, resume, fonts)
+        c.showPage()
+        _draw_page2(c, resume, fonts)
+        c.showPage()
+        return c
+
+    for label, cls in (("canvas", Canvas), ("tracking", StateTrackingCanvas)):
+        content = sum(len(page.stream) for page in draw(cls)._doc.Pages.pages)
+        seconds = min(timeit.repeat(lambda: draw(cls), number=args.number, repeat=args.repeat)) / args.number
+        print(f"{label:<9}: {seconds * 1000:8.2f} ms  ({content} content bytes)")
+
+
+if __name__ == "__main__":
+    main()
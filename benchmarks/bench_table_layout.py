@@ -0,0 +1,44 @@
+"""Benchmark: 職務経歴 tables per project vs per company on large companies.
+
+- project : one Table per project, each with its own 期間/内容/開発環境/規模 row
+- company : one Table per company, column headers repeated at each page top
+
+Usage: uv run python -m benchmarks.bench_table_layout [--font-dir fonts]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.work_history import builder
+from jp_tenshoku_docs_builder.work_history.styles import build_styles
+from tests.synthetic import make_work_history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font-dir", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fonts = register_fonts(args.font_dir)
+    styles = build_styles(fonts)
+    data = make_work_history(companies=3, projects_per_company=100)
+
+    for split_in_row in (1, 0):
+        for table_layout in ("project", "company"):
+            def layout():
+                return builder._layout(data, styles, "standard", split_in_row, table_layout=table_layout)
+
+            pages = layout().pages
+            seconds = min(timeit.repeat(layout, number=1, repeat=args.repeat))
+            pdf = builder.render_pdf(data, args.font_dir, split_in_row=split_in_row, table_layout=table_layout)
+            label = f"{table_layout} (splitInRow={split_in_row})"
+            print(f"{label:<24}: {seconds * 1000:8.1f} ms  {len(pdf) / 1024:7.1f} KiB  ({pages} pages)")
+
+
+if __name__ == "__main__":
+    main()
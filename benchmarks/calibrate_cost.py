@@ -0,0 +1,158 @@
+"""Calibrate cost.estimate_render_cost against the benchmark corpus.
+
+Renders synthetic documents of varied size and shape (tests/synthetic.py), the
+adversarial inputs that render successfully (tests/adversarial.py) and 履歴書
+variants, fits the coefficients of each document kind by least squares
+on the relative error (negative coefficients are dropped and the rest
+refitted), and prints them in the form of cost.COEFFICIENTS next to the
+error of the current and of the fitted coefficients.
+
+Usage: uv run python -m benchmarks.calibrate_cost [--font-dir fonts] [--repeat 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import timeit
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from jp_tenshoku_docs_builder.cost import COEFFICIENTS, cost_features
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.resume.builder import render_resume_pdf
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.resume.models import HistoryEntry
+from jp_tenshoku_docs_builder.work_history.builder import render_pdf
+from tests.adversarial import stress_cases
+from tests.synthetic import make_work_history
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+_CALIBRATION_CASES = ("unbreakable_latin", "unbreakable_env_token", "many_companies", "markup_like_text")
+
+
+def _work_histories(rng: random.Random) -> list[BaseModel]:
+    documents = []
+    for _ in range(24):
+        data = make_work_history(
+            companies=rng.choice([1, 2, 4, 8]),
+            projects_per_company=rng.choice([1, 3, 8, 15]),
+            skill_categories=rng.choice([0, 4, 12]),
+            skills_per_category=rng.choice([4, 10]),
+            qualifications=rng.choice([0, 10, 40]),
+        )
+        # Vary the text per project independently of the counts
+        lines = rng.choice([1, 2, 6])
+        for company in data.experience:
+            for project in company.projects:
+                project.overview = "\n".join([project.overview.split("\n")[0]] * lines)
+                project.environment.tools = project.environment.tools * rng.choice([1, 4])
+        documents.append(data)
+    return documents
+
+
+def _photo(workdir: Path) -> str:
+    # A phone-camera-sized JPEG, scaled down and re-encoded when rendered
+    from PIL import Image
+
+    path = workdir / "photo.jpg"
+    Image.effect_noise((3000, 4000), 64).convert("RGB").save(path, quality=90)
+    return str(path)
+
+
+def _resumes(rng: random.Random, workdir: Path) -> list[BaseModel]:
+    sample = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=SAMPLE_DIR / "credential.yaml")
+    photo = _photo(workdir)
+    documents = []
+    for _ in range(12):
+        entries = [HistoryEntry(year="2012", month="4", value="株式会社サンプル 入社")] * rng.choice([2, 10, 40])
+        documents.append(sample.model_copy(update={
+            "experience": entries,
+            "motivation": "志望動機の本文。" * rng.choice([1, 20, 80]),
+            "hobby": "\n".join(["読書"] * rng.choice([1, 10, 200])),
+            "photo": rng.choice(["", photo]),
+        }))
+    return documents
+
+
+def _fit(rows: list[tuple[dict[str, int], float]], names: list[str]) -> dict[str, float]:
+    """Least squares of seconds / seconds = 1 over the given features (plus "base")."""
+    names = ["base", *names]
+    matrix = [[(1 if name == "base" else features[name]) / seconds for name in names] for features, seconds in rows]
+    size = len(names)
+    # Normal equations, solved by Gaussian elimination with partial pivoting
+    a = [[sum(row[i] * row[j] for row in matrix) for j in range(size)] for i in range(size)]
+    b = [sum(row[i] for row in matrix) for i in range(size)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(a[r][col]))
+        a[col], a[pivot] = a[pivot], a[col]
+        b[col], b[pivot] = b[pivot], b[col]
+        if abs(a[col][col]) < 1e-300:
+            continue
+        for r in range(size):
+            if r != col:
+                factor = a[r][col] / a[col][col]
+                a[r] = [x - factor * y for x, y in zip(a[r], a[col])]
+                b[r] -= factor * b[col]
+    return {name: b[i] / a[i][i] if a[i][i] else 0.0 for i, name in enumerate(names)}
+
+
+def _fit_non_negative(rows: list[tuple[dict[str, int], float]]) -> dict[str, float]:
+    names = list(rows[0][0])
+    while True:
+        coefficients = _fit(rows, names)
+        negative = [name for name in names if coefficients[name] < 0]
+        if not negative:
+            return {name: coefficients.get(name, 0.0) for name in ["base", *rows[0][0]]}
+        names = [name for name in names if name not in negative]
+
+
+def _error(coefficients: dict[str, float], rows: list[tuple[dict[str, int], float]]) -> float:
+    """Mean absolute relative error of the estimates."""
+    total = 0.0
+    for features, seconds in rows:
+        estimate = coefficients["base"] + sum(coefficients[name] * value for name, value in features.items())
+        total += abs(estimate - seconds) / seconds
+    return total / len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font-dir", default=None)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    register_fonts(args.font_dir)  # registration is not part of the estimate
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        adversarial = [case.build(Path(workdir)) for case in stress_cases() if case.name in _CALIBRATION_CASES]
+        corpus = {
+            "work_history": (render_pdf, _work_histories(rng) + adversarial),
+            "resume": (render_resume_pdf, _resumes(rng, Path(workdir))),
+        }
+        fitted = {}
+        for kind, (render, documents) in corpus.items():
+            rows = []
+            for data in documents:
+                seconds = min(timeit.repeat(lambda: render(data, args.font_dir), number=1, repeat=args.repeat))
+                rows.append((cost_features(data), seconds))
+            fitted[kind] = _fit_non_negative(rows)
+            print(f"{kind}: {len(rows)} documents, {min(s for _, s in rows):.3f}-{max(s for _, s in rows):.3f} s")
+            print(f"  error of current coefficients: {_error(COEFFICIENTS[kind], rows):6.1%}")
+            print(f"  error of fitted coefficients : {_error(fitted[kind], rows):6.1%}")
+
+    print("COEFFICIENTS = {")
+    for kind, coefficients in fitted.items():
+        print(f'    "{kind}": {{')
+        for name, value in coefficients.items():
+            print(f'        "{name}": {value:.3g},')
+        print("    },")
+    print("}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Stress test: render the adversarial corpus under the render watchdog.
+
+Renders every case of tests/adversarial.py in a supervised
+subprocess and reports its outcome, elapsed time and whether it matched
+the expected outcome. Exits with status 1 if any case did not.
+
+Usage: uv run python -m benchmarks.stress_watchdog [--font-dir fonts] [--fuzz 50 --seed 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+from jp_tenshoku_docs_builder.watchdog import RenderError, RenderWatchdog
+from tests.adversarial import fuzz_cases, stress_cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font-dir", default=None)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-memory", type=int, default=256, help="MiB")
+    parser.add_argument("--fuzz", type=int, default=20, help="number of random documents")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    watchdog = RenderWatchdog(timeout=args.timeout, max_memory=args.max_memory * 1024 * 1024)
+    unexpected = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        for case in stress_cases() + fuzz_cases(args.seed, args.fuzz):
+            data = case.build(Path(workdir))
+            start = time.monotonic()
+            try:
+                if case.kind == "resume":
+                    watchdog.render_resume(data, font_dir=args.font_dir, **case.options)
+                else:
+                    watchdog.render_work_history(data, font_dir=args.font_dir, **case.options)
+                outcome, message = "ok", ""
+            except RenderError as e:
+                outcome, message = e.failure.kind, e.failure.message
+            elapsed = time.monotonic() - start
+            mark = "  " if outcome in case.expect else "!!"
+            unexpected += outcome not in case.expect
+            print(f"{mark} {case.name:<24}: {outcome:<8} {elapsed:6.1f} s  {message[:60]}")
+
+    print(f"{unexpected} unexpected outcome(s)")
+    sys.exit(1 if unexpected else 0)
+
+
+if __name__ == "__main__":
+    main()
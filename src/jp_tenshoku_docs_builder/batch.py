@@ -0,0 +1,483 @@
+"""Pipelined batch rendering (``jp_tenshoku_docs_builder batch``).
+
+Many documents are rendered by three stages connected by bounded
+queues: load (YAML parsing and validation), render (layout and PDF
+generation) and write. Each stage has its own number of workers, so the
+CPU-bound stages keep working while the writers wait on a slow disk or
+network mount; when the writers fall behind, the full queues block the
+stages before them (backpressure), which bounds the number of PDFs held
+in memory to render_workers + queue_size + write_workers, and of loaded
+models to load_workers + lookahead + render_workers.
+
+Loaded documents wait for a render worker in a queue of up to lookahead
+models that hands out the one with the highest estimate_render_cost
+first, so a few large documents do not start last and stretch the
+batch; documents estimated above max_cost are reported before rendering.
+
+With processes (the default) the load and render stages run their work
+in process pools of their worker count, so they do not share the GIL;
+the stage threads only hand items over. A failure in any stage is
+recorded for its job and the batch goes on. Per-stage timings show where
+the time goes (see StageStats).
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from jp_tenshoku_docs_builder.cost import estimate_render_cost
+from jp_tenshoku_docs_builder.fonts import write_atomic
+from jp_tenshoku_docs_builder.watchdog import process_context, renderer
+
+_DONE = object()
+
+
+@dataclass
+class BatchJob:
+    """One document: input YAML (+ credential) rendered to output."""
+
+    input: Path
+    output: Path
+    credential: Path
+    kind: str = "work_history"  # or "resume"
+    content_format: str = "standard"  # work_history only
+    options: dict = field(default_factory=dict)  # keyword options of render_pdf / render_resume_pdf
+    include_root: Path | None = None  # !include root (default: the directory of input)
+
+
+@dataclass
+class BatchFailure:
+    """A job that produced no file."""
+
+    input: str
+    stage: str  # "load", "render" or "write"
+    message: str
+
+
+@dataclass
+class CostWarning:
+    """A job whose estimated render cost exceeds max_cost (it is rendered anyway)."""
+
+    input: str
+    estimate: float  # estimate_render_cost seconds
+    max_cost: float
+
+    def __str__(self) -> str:
+        return f"{self.input}: estimated render cost {self.estimate:.2f}s exceeds {self.max_cost:g}s"
+
+
+@dataclass
+class StageStats:
+    """Time the workers of one stage spent on each state, in seconds (summed over workers)."""
+
+    stage: str
+    workers: int
+    items: int = 0  # jobs processed, including failed ones
+    busy: float = 0.0  # processing a job
+    idle: float = 0.0  # waiting for the previous stage
+    blocked: float = 0.0  # waiting for room in the next stage's queue (backpressure)
+    max_queued: int = 0  # highest number of jobs waiting in the stage's input queue
+    wall: float = 0.0  # wall-clock time of the whole batch
+
+    @property
+    def utilisation(self) -> float:
+        """Fraction of the stage's worker time spent busy."""
+        return self.busy / (self.workers * self.wall) if self.wall else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "utilisation": self.utilisation}
+
+
+@dataclass
+class BatchResult:
+    """Outcome of BatchPipeline.run."""
+
+    written: list[Path] = field(default_factory=list)  # in completion order
+    failures: list[BatchFailure] = field(default_factory=list)
+    warnings: list[CostWarning] = field(default_factory=list)
+    stages: list[StageStats] = field(default_factory=list)
+    wall: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "written": [str(path) for path in self.written],
+            "failures": [asdict(f) for f in self.failures],
+            "warnings": [asdict(w) for w in self.warnings],
+            "stages": [s.to_dict() for s in self.stages],
+            "wall": self.wall,
+        }
+
+    def to_text(self) -> str:
+        lines = [f"{len(self.written)} written, {len(self.failures)} failed in {self.wall:.2f}s"]
+        if self.warnings:
+            lines[0] += f" ({len(self.warnings)} over the cost threshold)"
+        for s in self.stages:
+            lines.append(
+                f"{s.stage:<6} {s.workers:>2} workers {s.items:>5} jobs  utilisation {s.utilisation:6.1%}  "
+                f"busy {s.busy:7.2f}s idle {s.idle:7.2f}s blocked {s.blocked:7.2f}s  max queued {s.max_queued}"
+            )
+        lines.extend(f"{f.input}: {f.stage}: {f.message}" for f in self.failures)
+        return "\n".join(lines)
+
+
+def _load(job: BatchJob, _: None) -> tuple[BaseModel, float]:
+    """(model, estimated render cost) of the job."""
+    if job.kind == "resume":
+        from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+
+        data = load_resume_yaml(job.input, job.credential, job.include_root)
+    else:
+        from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+
+        data = load_yaml(job.input, job.credential, job.content_format, job.include_root)
+    return data, estimate_render_cost(data)
+
+
+def _render(job: BatchJob, loaded: tuple[BaseModel, float]) -> bytes:
+    options = job.options if job.kind == "resume" else {"content_format": job.content_format, **job.options}
+    return renderer(job.kind)(loaded[0], **options)
+
+
+def write_file(path: Path, pdf: bytes) -> None:
+    """Default writer: write through a temporary file, so readers never see a partial PDF."""
+    write_atomic(path, pdf)
+
+
+class _Stage:
+    """Worker threads taking (job, payload) from inbox and putting (job, result) into outbox."""
+
+    def __init__(self, name: str, workers: int, work: Callable, inbox: queue.Queue, fail: Callable):
+        self.name = name
+        self.work = work
+        self.inbox = inbox
+        self.outbox: queue.Queue | None = None
+        self.next_workers = 0
+        self.fail = fail
+        self.stats = StageStats(name, workers)
+        self._lock = threading.Lock()
+        self._running = workers
+        self._threads = [
+            threading.Thread(target=self._run, name=f"batch-{name}-{i}", daemon=True) for i in range(workers)
+        ]
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                waiting = time.monotonic()
+                item = self.inbox.get()
+                started = time.monotonic()
+                if item is _DONE:
+                    with self._lock:
+                        self.stats.idle += started - waiting
+                    return
+                job, payload = item
+                try:
+                    output = self.work(job, payload)
+                except Exception as e:
+                    output = None
+                    self.fail(BatchFailure(str(job.input), self.name, f"{type(e).__name__}: {e}"))
+                finished = time.monotonic()
+                if output is not None and self.outbox is not None:
+                    self.outbox.put((job, output))
+                with self._lock:
+                    self.stats.items += 1
+                    self.stats.idle += started - waiting
+                    self.stats.busy += finished - started
+                    self.stats.blocked += time.monotonic() - finished
+        finally:
+            with self._lock:
+                self._running -= 1
+                last = self._running == 0
+            if last and self.outbox is not None:
+                for _ in range(self.next_workers):
+                    self.outbox.put(_DONE)
+
+
+class _TrackedQueue(queue.Queue):
+    """Queue recording its highest length on stats.
+
+    With key, items are handed out lowest key(item) first (ties in order of
+    arrival) and _DONE after all items.
+    """
+
+    def __init__(self, maxsize: int, stats: list[StageStats], key: Callable | None = None):
+        self._key = key
+        self._arrival = itertools.count()
+        super().__init__(maxsize)
+        self._stats = stats  # filled in once the consuming stage exists
+
+    def _init(self, maxsize: int) -> None:
+        self.queue = [] if self._key else deque()
+
+    def _put(self, item) -> None:
+        if self._key is None:
+            self.queue.append(item)
+        else:
+            key = math.inf if item is _DONE else self._key(item)
+            heapq.heappush(self.queue, (key, next(self._arrival), item))
+        if self._stats and item is not _DONE:
+            self._stats[0].max_queued = max(self._stats[0].max_queued, self._qsize())
+
+    def _get(self):
+        if self._key is None:
+            return self.queue.popleft()
+        return heapq.heappop(self.queue)[2]
+
+
+class BatchPipeline:
+    """Load → render → write pipeline with bounded queues between the stages.
+
+    load_workers / render_workers / write_workers: workers per stage
+        (render_workers defaults to the CPU count).
+    queue_size: capacity of the queues in front of the load and write stages.
+    lookahead: capacity of the queue in front of the render stage, which
+        hands out the most expensive document first; models are small next
+        to PDFs, so it can be large (covering the whole batch makes the
+        order strictly longest-first).
+    max_cost: estimate_render_cost above which a CostWarning is recorded
+        (and passed to on_warning) before the document is rendered.
+    processes: run load and render in process pools (False keeps them in
+        threads of this process, e.g. when the jobs are few or small).
+    writer: writer(path, pdf) storing one PDF; defaults to write_file.
+    """
+
+    def __init__(
+        self,
+        load_workers: int = 1,
+        render_workers: int | None = None,
+        write_workers: int = 2,
+        queue_size: int = 4,
+        lookahead: int = 64,
+        max_cost: float | None = None,
+        on_warning: Callable[[CostWarning], None] | None = None,
+        processes: bool = True,
+        writer: Callable[[Path, bytes], None] = write_file,
+    ):
+        render_workers = render_workers or os.cpu_count() or 1
+        for name, value in (
+            ("load_workers", load_workers), ("render_workers", render_workers),
+            ("write_workers", write_workers), ("queue_size", queue_size), ("lookahead", lookahead),
+        ):
+            if value < 1:
+                raise ValueError(f"{name} must be positive: {value}")
+        if max_cost is not None and max_cost <= 0:
+            raise ValueError(f"max_cost must be positive: {max_cost}")
+        self.load_workers = load_workers
+        self.render_workers = render_workers
+        self.write_workers = write_workers
+        self.queue_size = queue_size
+        self.lookahead = lookahead
+        self.max_cost = max_cost
+        self.on_warning = on_warning
+        self.processes = processes
+        self.writer = writer
+
+    def _in_pool(self, pool: Executor | None, function: Callable) -> Callable:
+        if pool is None:
+            return function
+        return lambda *args: pool.submit(function, *args).result()
+
+    def run(self, jobs: Iterable[BatchJob]) -> BatchResult:
+        """Run all jobs (consumed lazily as the load stage has room) and wait for the last write."""
+        result = BatchResult()
+        pools: list[Executor | None] = [None, None]
+        if self.processes:
+            pools = [
+                ProcessPoolExecutor(self.load_workers, mp_context=process_context()),
+                ProcessPoolExecutor(self.render_workers, mp_context=process_context()),
+            ]
+        load_in_pool = self._in_pool(pools[0], _load)
+        render = self._in_pool(pools[1], _render)
+        lock = threading.Lock()  # guards result, shared by all stages
+
+        def fail(failure: BatchFailure) -> None:
+            with lock:
+                result.failures.append(failure)
+
+        def load(job: BatchJob, _: None) -> tuple[BaseModel, float]:
+            loaded = load_in_pool(job, None)
+            if self.max_cost is not None and loaded[1] > self.max_cost:
+                warning = CostWarning(str(job.input), loaded[1], self.max_cost)
+                with lock:
+                    result.warnings.append(warning)
+                if self.on_warning is not None:
+                    self.on_warning(warning)
+            return loaded
+
+        def write(job: BatchJob, pdf: bytes) -> None:
+            self.writer(job.output, pdf)
+            with lock:
+                result.written.append(job.output)
+
+        stages: list[_Stage] = []
+        previous = None
+        for name, workers, work, capacity, key in (
+            ("load", self.load_workers, load, self.queue_size, None),
+            # (job, (model, cost)): most expensive first
+            ("render", self.render_workers, render, self.lookahead, lambda item: -item[1][1]),
+            ("write", self.write_workers, write, self.queue_size, None),
+        ):
+            consumer: list[StageStats] = []
+            inbox = _TrackedQueue(capacity, consumer, key)
+            stage = _Stage(name, workers, work, inbox, fail)
+            consumer.append(stage.stats)
+            if previous is not None:
+                previous.outbox = inbox
+                previous.next_workers = workers
+            stages.append(stage)
+            previous = stage
+
+        start = time.monotonic()
+        try:
+            for stage in stages:
+                stage.start()
+            # The caller's thread feeds the load stage, blocking while its queue is full
+            for job in jobs:
+                stages[0].inbox.put((job, None))
+            for _ in range(self.load_workers):
+                stages[0].inbox.put(_DONE)
+            for stage in stages:
+                stage.join()
+        finally:
+            for pool in pools:
+                if pool is not None:
+                    pool.shutdown(cancel_futures=True)
+        result.wall = time.monotonic() - start
+        for stage in stages:
+            stage.stats.wall = result.wall
+        result.stages = [stage.stats for stage in stages]
+        return result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="jp_tenshoku_docs_builder batch",
+        description="複数のYAMLを 読込・検証 → レイアウト・PDF生成 → 書き出し のパイプラインでまとめてPDF化",
+    )
+    parser.add_argument("inputs", type=Path, nargs="+", help="Input YAML file paths")
+    parser.add_argument(
+        "-o", "--output-dir",
+        type=Path,
+        default=Path("output"),
+        help="PDFの出力先ディレクトリ（<入力ファイル名>.pdf、default: output）",
+    )
+    parser.add_argument(
+        "-c", "--credential",
+        type=Path,
+        required=True,
+        help="Path to credential YAML file containing personal info (name, address, etc.)",
+    )
+    parser.add_argument(
+        "--include-root",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="!include で読み込めるファイルの範囲とするディレクトリ (default: 各入力YAMLのディレクトリ)",
+    )
+    parser.add_argument(
+        "--type",
+        choices=["work-history", "resume"],
+        default="work-history",
+        dest="doc_type",
+        help="Document type: work-history (職務経歴書) or resume (履歴書) (default: work-history)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["standard", "star"],
+        default="standard",
+        dest="content_format",
+        help="プロジェクト内容の表示形式 (default: standard, work-history only)",
+    )
+    parser.add_argument("--font-dir", type=Path, default=None, help="Directory containing Japanese font files")
+    parser.add_argument("--fallback-font", type=Path, default=None, help="フォールバックフォント (.ttf)")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="縮小済み写真・フォントの解析結果を実行間で再利用するキャッシュディレクトリ",
+    )
+    parser.add_argument("--load-workers", type=int, default=1, help="読込・検証の並列数 (default: 1)")
+    parser.add_argument("--render-workers", type=int, default=None, help="PDF生成の並列数 (default: CPU数)")
+    parser.add_argument("--write-workers", type=int, default=2, help="書き出しの並列数 (default: 2)")
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=4,
+        help="読込・書き出しの前で待機できる件数（書き出しが遅れた時のメモリ上限を決める、default: 4）",
+    )
+    parser.add_argument(
+        "--lookahead",
+        type=int,
+        default=64,
+        help="PDF生成を待つ文書の最大数。この中から推定コストの大きい順に生成する (default: 64)",
+    )
+    parser.add_argument(
+        "--max-cost",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="推定生成時間（秒）がこれを超える文書を生成前に警告",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["text", "json"],
+        default="text",
+        help="結果・各段の使用率の出力形式 (default: text)",
+    )
+    args = parser.parse_args(argv)
+
+    missing = [str(path) for path in [*args.inputs, args.credential] if not path.exists()]
+    if missing:
+        print(f"Error: Input file not found: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+    outputs = [args.output_dir / f"{path.stem}.pdf" for path in args.inputs]
+    if len(set(outputs)) != len(outputs):
+        print("Error: input file names must be unique (outputs are named after them)", file=sys.stderr)
+        sys.exit(1)
+
+    kind = "resume" if args.doc_type == "resume" else "work_history"
+    options = {"font_dir": args.font_dir, "fallback_font": args.fallback_font, "cache_dir": args.cache_dir}
+    jobs = [
+        BatchJob(path, output, args.credential, kind, args.content_format, options, args.include_root)
+        for path, output in zip(args.inputs, outputs)
+    ]
+    try:
+        pipeline = BatchPipeline(
+            args.load_workers, args.render_workers, args.write_workers, args.queue_size, args.lookahead,
+            args.max_cost, on_warning=lambda warning: print(f"WARNING: {warning}", file=sys.stderr),
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    result = pipeline.run(jobs)
+
+    if args.output_format == "json":
+        print(json.dumps(result.to_dict(), ensure_ascii=False))
+    else:
+        print(result.to_text())
+    if result.failures:
+        sys.exit(1)
@@ -0,0 +1,248 @@
+"""Opt-in in-memory cache of rendered PDFs for the library API.
+
+A service that renders the same 職務経歴書 / 履歴書 repeatedly (previews,
+re-downloads) can route renders through a RenderCache. Entries are keyed
+by a canonical hash of the validated model, the render options and the
+package version; the registered font names and the photo digest are part
+of the key, so a changed font or photo file never returns a stale PDF.
+
+plan_work_history / plan_resume cache RenderPlans (serialised, in the
+same LRU) instead, for callers that paint one layout with several PDF
+options.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from jp_tenshoku_docs_builder import __version__
+from jp_tenshoku_docs_builder.fonts import FontConfig, register_fonts
+from jp_tenshoku_docs_builder.render_plan import RenderPlan
+
+if TYPE_CHECKING:
+    from jp_tenshoku_docs_builder.work_history.styles import StyleScale
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """Counters of a RenderCache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _photo_digest(photo: str) -> str | None:
+    """Content hash of the photo file, or None when there is none to draw."""
+    if not photo or not Path(photo).exists():
+        return None
+    return hashlib.sha256(Path(photo).read_bytes()).hexdigest()
+
+
+def _work_history_options(
+    fonts: FontConfig, content_format: str, split_in_row: int, scale: StyleScale, table_layout: str,
+) -> dict:
+    return {
+        "fonts": asdict(fonts),
+        "content_format": content_format,
+        "split_in_row": split_in_row,
+        "table_layout": table_layout,
+        "scale": asdict(scale),
+    }
+
+
+def _resume_options(fonts: FontConfig, photo_dpi: int, photo: str) -> dict:
+    return {"fonts": asdict(fonts), "photo_dpi": photo_dpi, "photo": _photo_digest(photo)}
+
+
+def cache_key(kind: str, data: BaseModel, options: dict) -> str:
+    """Canonical hash of (document kind, model, options, package version).
+
+    options must be JSON-serialisable; dict order does not matter.
+    """
+    payload = {
+        "kind": kind,
+        "version": __version__,
+        "data": data.model_dump(mode="json"),
+        "options": options,
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Bounded LRU cache of rendered PDF bytes.
+
+    The total size of the stored PDFs never exceeds max_bytes; the least
+    recently used entries are evicted first, and a PDF larger than
+    max_bytes on its own is returned but not stored. Thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive: {max_bytes}")
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return pdf
+
+    def put(self, key: str, pdf: bytes) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            if len(pdf) > self.max_bytes:
+                return
+            self._entries[key] = pdf
+            self._size += len(pdf)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (the hit/miss counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render_work_history(
+        self,
+        data: BaseModel,
+        font_dir: str | Path | None = None,
+        content_format: str = "standard",
+        split_in_row: int = 1,
+        scale: StyleScale | None = None,
+        fallback_font: str | Path | None = None,
+        cache_dir: str | Path | None = None,
+        table_layout: str = "project",
+    ) -> bytes:
+        """Cached work_history.builder.render_pdf (same arguments).
+
+        cache_dir does not affect the output, so it is not part of the key.
+        """
+        from jp_tenshoku_docs_builder.work_history.builder import render_pdf
+        from jp_tenshoku_docs_builder.work_history.styles import StyleScale
+
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+        options = _work_history_options(fonts, content_format, split_in_row, scale or StyleScale(), table_layout)
+        key = cache_key("work_history", data, options)
+        pdf = self.get(key)
+        if pdf is None:
+            pdf = render_pdf(
+                data, font_dir, content_format, split_in_row, scale, fallback_font, cache_dir, table_layout,
+            )
+            self.put(key, pdf)
+        return pdf
+
+    def render_resume(
+        self,
+        data: BaseModel,
+        font_dir: str | Path | None = None,
+        fallback_font: str | Path | None = None,
+        photo_dpi: int | None = None,
+        cache_dir: str | Path | None = None,
+    ) -> bytes:
+        """Cached resume.builder.render_resume_pdf (same arguments).
+
+        cache_dir only affects where prepared photos and font snapshots
+        are kept, not the output, so it is not part of the key.
+        """
+        from jp_tenshoku_docs_builder.resume.builder import render_resume_pdf
+        from jp_tenshoku_docs_builder.resume.photo import DEFAULT_DPI
+
+        photo_dpi = photo_dpi or DEFAULT_DPI
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+        key = cache_key("resume", data, _resume_options(fonts, photo_dpi, data.photo))
+        pdf = self.get(key)
+        if pdf is None:
+            pdf = render_resume_pdf(data, font_dir, fallback_font, photo_dpi, cache_dir)
+            self.put(key, pdf)
+        return pdf
+
+    def plan_work_history(
+        self,
+        data: BaseModel,
+        font_dir: str | Path | None = None,
+        content_format: str = "standard",
+        split_in_row: int = 1,
+        scale: StyleScale | None = None,
+        fallback_font: str | Path | None = None,
+        cache_dir: str | Path | None = None,
+        table_layout: str = "project",
+    ) -> RenderPlan:
+        """Cached work_history.builder.plan_pdf (same arguments).
+
+        Plans are stored as JSON, so each call returns a fresh RenderPlan.
+        """
+        from jp_tenshoku_docs_builder.work_history.builder import plan_pdf
+        from jp_tenshoku_docs_builder.work_history.styles import StyleScale
+
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+        options = _work_history_options(fonts, content_format, split_in_row, scale or StyleScale(), table_layout)
+        key = cache_key("work_history-plan", data, options)
+        stored = self.get(key)
+        if stored is None:
+            plan = plan_pdf(data, font_dir, content_format, split_in_row, scale, fallback_font, cache_dir, table_layout)
+            stored = plan.to_json().encode("utf-8")
+            self.put(key, stored)
+        return RenderPlan.from_json(stored)
+
+    def plan_resume(
+        self,
+        data: BaseModel,
+        font_dir: str | Path | None = None,
+        fallback_font: str | Path | None = None,
+        photo_dpi: int | None = None,
+        cache_dir: str | Path | None = None,
+    ) -> RenderPlan:
+        """Cached resume.builder.plan_resume_pdf (same arguments)."""
+        from jp_tenshoku_docs_builder.resume.builder import plan_resume_pdf
+        from jp_tenshoku_docs_builder.resume.photo import DEFAULT_DPI
+
+        photo_dpi = photo_dpi or DEFAULT_DPI
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+        key = cache_key("resume-plan", data, _resume_options(fonts, photo_dpi, data.photo))
+        stored = self.get(key)
+        if stored is None:
+            stored = plan_resume_pdf(data, font_dir, fallback_font, photo_dpi, cache_dir).to_json().encode("utf-8")
+            self.put(key, stored)
+        return RenderPlan.from_json(stored)
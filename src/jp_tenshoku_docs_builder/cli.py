@@ -3,14 +3,37 @@
 from __future__ import annotations
 
 import argparse
+import json
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from jp_tenshoku_docs_builder.work_history.builder import build_pdf
 from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from jp_tenshoku_docs_builder.work_history.models import _WorkHistoryBase
+
+# PDF builders (and reportlab) are imported lazily so that preview runs
+# never pay for them.
+if TYPE_CHECKING:
+    from jp_tenshoku_docs_builder.coverage import CoverageReport
+    from jp_tenshoku_docs_builder.resume.models import Resume
+    from jp_tenshoku_docs_builder.work_history.styles import StyleScale
 
 
 def main(argv: list[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    # `validate` subcommand: models only, never imports reportlab
+    if argv[:1] == ["validate"]:
+        from jp_tenshoku_docs_builder.validate import main as validate_main
+
+        validate_main(argv[1:])
+        return
+    if argv[:1] == ["batch"]:
+        from jp_tenshoku_docs_builder.batch import main as batch_main
+
+        batch_main(argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         prog="jp_tenshoku_docs_builder",
         description="職務経歴書・履歴書 PDF Generator - Generate Japanese CV/Resume PDFs from YAML",
@@ -32,6 +55,12 @@ def main(argv: list[str] | None = None) -> None:
         default=None,
         help="Directory containing Japanese font files",
     )
+    parser.add_argument(
+        "--fallback-font",
+        type=Path,
+        default=None,
+        help="日本語フォントに無い文字（環境依存文字・絵文字等）を描画するフォールバックフォント (.ttf)",
+    )
     parser.add_argument(
         "--type",
         choices=["work-history", "resume"],
@@ -45,6 +74,13 @@ def main(argv: list[str] | None = None) -> None:
         required=True,
         help="Path to credential YAML file containing personal info (name, address, etc.)",
     )
+    parser.add_argument(
+        "--include-root",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="!include で読み込めるファイルの範囲とするディレクトリ (default: 入力YAMLのディレクトリ)",
+    )
     parser.add_argument(
         "--format",
         choices=["standard", "star"],
@@ -58,6 +94,99 @@ def main(argv: list[str] | None = None) -> None:
         default=False,
         help="プロジェクト行のページ途中分割を無効化（丸ごと次ページへ送る）",
     )
+    parser.add_argument(
+        "--table-layout",
+        choices=["project", "company"],
+        default="project",
+        help="職務経歴のプロジェクト表の構成: project=プロジェクトごとに表を分ける, "
+             "company=会社ごとに1つの表（列見出しは各ページ先頭のみ） (default: project, work-history only)",
+    )
+    parser.add_argument(
+        "--sections",
+        default=None,
+        metavar="NAMES",
+        help="指定したセクションのみ出力（カンマ区切り: summary, highlights, experience, side_experience, "
+             "technical_skills, qualifications, self_pr、work-history only）",
+    )
+    parser.add_argument(
+        "--since",
+        default=None,
+        metavar="YYYY-MM",
+        help="指定した年月より前に終了したプロジェクトを除外（期間を解釈できないものは残す、work-history only）",
+    )
+    parser.add_argument(
+        "--dry-run-layout",
+        nargs="?",
+        const="text",
+        choices=["text", "json"],
+        default=None,
+        help="PDFを書き出さずにレイアウトのみ実行し、総ページ数と各セクション・会社の開始位置を出力 "
+             "(text / json, work-history only)",
+    )
+    parser.add_argument(
+        "--preview",
+        choices=["html", "markdown"],
+        default=None,
+        help="PDFの代わりにHTML / Markdownのプレビューを出力 (reportlab不要、高速)",
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=None,
+        help="指定ページ数に収まるようフォントサイズ・行間・余白を縮小 (work-history only)",
+    )
+
+    parser.add_argument(
+        "--packet",
+        type=Path,
+        default=None,
+        metavar="RESUME_YAML",
+        help="履歴書YAMLを指定し、履歴書＋職務経歴書を1つのPDFに出力（フォントは1回だけ埋め込み、work-history only）",
+    )
+    parser.add_argument(
+        "--linearize",
+        action="store_true",
+        default=False,
+        help="Web表示用に最適化（リニアライズ）したPDFを出力（全体のダウンロード前に1ページ目を表示可能）",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        default=False,
+        help="完成したページから順にファイルへ書き出し、ページ数によらずメモリ使用量を一定に保つ (work-history only)",
+    )
+    parser.add_argument(
+        "--photo-dpi",
+        type=int,
+        default=None,
+        help="履歴書の写真を枠サイズ(30x40mm)に縮小する解像度 (default: 300, resume only)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="縮小済み写真・フォントの解析結果を実行間で再利用するキャッシュディレクトリ",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        default=False,
+        help="PDFを生成せず、各項目が枠内に収まるかを検査（はみ出しがあれば終了コード1、resume only）",
+    )
+    parser.add_argument(
+        "--check-glyphs",
+        action="store_true",
+        default=False,
+        help="PDFを生成せず、フォントに無い文字とその項目を一覧表示（不足があれば終了コード1）",
+    )
+    parser.add_argument(
+        "--memprofile",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="tracemallocで処理段階（読込・検証・フォント登録・フローアブル生成・レイアウト・書き出し）ごとの"
+             "ピークメモリと主な確保箇所を計測し、JSONで出力（処理は大幅に遅くなる）",
+    )
 
     args = parser.parse_args(argv)
 
@@ -72,45 +201,289 @@ def main(argv: list[str] | None = None) -> None:
         )
         sys.exit(1)
 
+    if args.doc_type == "resume":
+        for flag, value in (
+            ("--dry-run-layout", args.dry_run_layout), ("--max-pages", args.max_pages), ("--packet", args.packet),
+            ("--streaming", args.streaming or None), ("--sections", args.sections), ("--since", args.since),
+        ):
+            if value is not None:
+                print(f"Error: {flag} is only supported for work-history", file=sys.stderr)
+                sys.exit(1)
+    elif args.check:
+        print("Error: --check is only supported for resume", file=sys.stderr)
+        sys.exit(1)
+    elif args.packet and args.streaming:
+        print("Error: --streaming cannot be combined with --packet", file=sys.stderr)
+        sys.exit(1)
+    elif args.packet and not args.packet.exists():
+        print(f"Error: Resume file not found: {args.packet}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.memprofile:
+        from jp_tenshoku_docs_builder.memprofile import profile_memory
+
+        profile = None
+        try:
+            with profile_memory() as profile:
+                _run(args)
+        finally:
+            # Also on errors (sys.exit included): the profile up to the failure.
+            # None if profiling itself failed to start; let that error through.
+            if profile is not None:
+                args.memprofile.parent.mkdir(parents=True, exist_ok=True)
+                args.memprofile.write_text(
+                    json.dumps(profile.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8",
+                )
+                print(f"Memory profile: {args.memprofile}", file=sys.stderr)
+    else:
+        _run(args)
+
+
+def _run(args: argparse.Namespace) -> None:
+    if args.preview:
+        _build_preview(args)
+        return
+
+    if args.check_glyphs:
+        _check_glyphs(args)
+        return
+
+    if args.check:
+        _check_resume(args)
+        return
+
+    if args.dry_run_layout:
+        _dry_run_layout(args)
+        return
+
     args.output.parent.mkdir(parents=True, exist_ok=True)
 
     if args.doc_type == "resume":
         _build_resume(args)
+    elif args.packet:
+        _build_packet(args)
     else:
         _build_work_history(args)
 
 
-def _build_work_history(args: argparse.Namespace) -> None:
+def _load_work_history(args: argparse.Namespace) -> _WorkHistoryBase:
     try:
-        data = load_yaml(args.input, content_format=args.content_format, credential_path=args.credential)
+        data = load_yaml(
+            args.input, content_format=args.content_format, credential_path=args.credential,
+            include_root=args.include_root,
+        )
     except Exception as e:
         print(
             f"Error: YAML validation failed for '{args.content_format}' format: {e}",
             file=sys.stderr,
         )
         sys.exit(1)
+    if args.sections is None and args.since is None:
+        return data
+    # Pruned before anything is built, so previews only do the work for what is shown
+    from jp_tenshoku_docs_builder.work_history.period import YearMonth
+    from jp_tenshoku_docs_builder.work_history.prune import prune
+
+    try:
+        sections = None if args.sections is None else [name.strip() for name in args.sections.split(",")]
+        since = None if args.since is None else YearMonth.parse(args.since)
+        return prune(data, sections, since)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _fit_scale(args: argparse.Namespace, data: _WorkHistoryBase) -> StyleScale | None:
+    """Resolve --max-pages into a style scale (None when not requested)."""
+    if args.max_pages is None:
+        return None
+    from jp_tenshoku_docs_builder.work_history.fit import fit_to_pages
+
+    try:
+        result = fit_to_pages(
+            data, args.max_pages, args.font_dir,
+            content_format=args.content_format,
+            split_in_row=0 if args.no_split_row else 1,
+            fallback_font=args.fallback_font, cache_dir=args.cache_dir, table_layout=args.table_layout,
+        )
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"Scale: {result.scale.font:.3f} ({result.pages} pages, {result.passes} layout passes)",
+        file=sys.stderr,
+    )
+    return result.scale
+
+
+def _dry_run_layout(args: argparse.Namespace) -> None:
+    from jp_tenshoku_docs_builder.work_history.builder import layout_pdf
+
+    data = _load_work_history(args)
+    scale = _fit_scale(args, data)
+
+    try:
+        split_in_row = 0 if args.no_split_row else 1
+        report = layout_pdf(
+            data, args.font_dir, content_format=args.content_format, split_in_row=split_in_row, scale=scale,
+            fallback_font=args.fallback_font, cache_dir=args.cache_dir, table_layout=args.table_layout,
+        )
+    except Exception as e:
+        print(f"Error: Layout failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.dry_run_layout == "json":
+        print(json.dumps(report.to_dict(), ensure_ascii=False))
+    else:
+        print(report.to_text())
+
+
+def _scan_glyphs(args: argparse.Namespace, data: _WorkHistoryBase | Resume) -> CoverageReport:
+    from jp_tenshoku_docs_builder.coverage import scan_coverage
+    from jp_tenshoku_docs_builder.fonts import register_fonts
+
+    try:
+        fonts = register_fonts(args.font_dir, args.fallback_font, args.cache_dir)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    return scan_coverage(data, fonts)
+
+
+def _check_glyphs(args: argparse.Namespace) -> None:
+    data = _load_resume(args) if args.doc_type == "resume" else _load_work_history(args)
+    report = _scan_glyphs(args, data)
+    print(report.to_text())
+    if not report.ok:
+        sys.exit(1)
+
+
+def _warn_missing_glyphs(args: argparse.Namespace, data: _WorkHistoryBase | Resume) -> None:
+    """Pre-flight with --fallback-font: warn about characters even the fallback cannot draw.
+
+    Without a fallback font the scan is left to --check-glyphs, so a plain
+    render does not register the fonts and walk the model an extra time.
+    """
+    if not args.fallback_font:
+        return
+    missing = [m.char for m in _scan_glyphs(args, data).missing if not m.fallback]
+    if missing:
+        shown = " ".join(missing[:10]) + (" ..." if len(missing) > 10 else "")
+        print(
+            f"WARNING: {len(missing)} character(s) have no glyph in the fonts or the fallback font: {shown} "
+            "(see --check-glyphs)",
+            file=sys.stderr,
+        )
+
+
+def _build_work_history(args: argparse.Namespace) -> None:
+    from jp_tenshoku_docs_builder.work_history.builder import build_pdf
+
+    data = _load_work_history(args)
+    _warn_missing_glyphs(args, data)
+    scale = _fit_scale(args, data)
 
     try:
         split_in_row = 0 if args.no_split_row else 1
-        result = build_pdf(data, args.output, args.font_dir, content_format=args.content_format, split_in_row=split_in_row)
+        result = build_pdf(
+            data, args.output, args.font_dir,
+            content_format=args.content_format, split_in_row=split_in_row, scale=scale,
+            fallback_font=args.fallback_font, cache_dir=args.cache_dir, streaming=args.streaming,
+            table_layout=args.table_layout,
+        )
+        if args.linearize:
+            _linearize(result)
         print(f"Generated: {result}")
     except Exception as e:
         print(f"Error: Failed to generate PDF: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def _build_resume(args: argparse.Namespace) -> None:
-    from jp_tenshoku_docs_builder.resume.builder import build_resume_pdf
+def _build_packet(args: argparse.Namespace) -> None:
+    from jp_tenshoku_docs_builder.packet import build_packet_pdf
+    from jp_tenshoku_docs_builder.resume.photo import DEFAULT_DPI
+
+    data = _load_work_history(args)
+    resume = _load_resume(args, args.packet)
+    photo_dpi = DEFAULT_DPI if args.photo_dpi is None else args.photo_dpi
+    _warn_missing_glyphs(args, resume)
+    _warn_missing_glyphs(args, data)
+    scale = _fit_scale(args, data)
+
+    try:
+        result = build_packet_pdf(
+            resume, data, args.output, args.font_dir,
+            content_format=args.content_format, split_in_row=0 if args.no_split_row else 1, scale=scale,
+            fallback_font=args.fallback_font, photo_dpi=photo_dpi, cache_dir=args.cache_dir,
+            table_layout=args.table_layout,
+        )
+        if args.linearize:
+            _linearize(result)
+        print(f"Generated: {result}")
+    except Exception as e:
+        print(f"Error: Failed to generate PDF: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _linearize(path: Path) -> None:
+    """Rewrite a generated PDF in place as a linearized ("fast web view") PDF."""
+    from jp_tenshoku_docs_builder.linearize import linearize_pdf
+
+    path.write_bytes(linearize_pdf(path.read_bytes()))
+
+
+def _load_resume(args: argparse.Namespace, path: Path | None = None) -> Resume:
     from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
 
     try:
-        data = load_resume_yaml(args.input, credential_path=args.credential)
+        return load_resume_yaml(path or args.input, credential_path=args.credential, include_root=args.include_root)
     except Exception as e:
         print(f"Error: YAML validation failed for resume: {e}", file=sys.stderr)
         sys.exit(1)
 
+
+def _build_preview(args: argparse.Namespace) -> None:
+    from jp_tenshoku_docs_builder.preview import to_html, to_markdown
+
+    data = _load_resume(args) if args.doc_type == "resume" else _load_work_history(args)
+    if args.preview == "html":
+        text, suffix = to_html(data), ".html"
+    else:
+        text, suffix = to_markdown(data), ".md"
+
+    # -o の拡張子が .pdf のまま（デフォルト含む）ならプレビュー用に置き換える
+    output = args.output.with_suffix(suffix) if args.output.suffix == ".pdf" else args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(text, encoding="utf-8")
+    print(f"Generated: {output}")
+
+
+def _check_resume(args: argparse.Namespace) -> None:
+    from jp_tenshoku_docs_builder.resume.check import check_resume
+
+    overflows = check_resume(_load_resume(args), args.font_dir, args.cache_dir)
+    for overflow in overflows:
+        print(overflow)
+    if overflows:
+        sys.exit(1)
+    print("OK: all fields fit")
+
+
+def _build_resume(args: argparse.Namespace) -> None:
+    from jp_tenshoku_docs_builder.resume.builder import build_resume_pdf
+    from jp_tenshoku_docs_builder.resume.photo import DEFAULT_DPI
+
+    data = _load_resume(args)
+    photo_dpi = DEFAULT_DPI if args.photo_dpi is None else args.photo_dpi
+    _warn_missing_glyphs(args, data)
+
     try:
-        result = build_resume_pdf(data, args.output, args.font_dir)
+        result = build_resume_pdf(
+            data, args.output, args.font_dir, args.fallback_font,
+            photo_dpi=photo_dpi, cache_dir=args.cache_dir,
+        )
+        if args.linearize:
+            _linearize(result)
         print(f"Generated: {result}")
     except Exception as e:
         print(f"Error: Failed to generate PDF: {e}", file=sys.stderr)
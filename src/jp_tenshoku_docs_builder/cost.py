@@ -0,0 +1,77 @@
+"""Render cost estimate from model features, for scheduling batches.
+
+estimate_render_cost() predicts the seconds render_pdf /
+render_resume_pdf take for a model, as a linear function of a few counts
+(cost_features). The coefficients are fitted on the benchmark corpus by
+benchmarks/calibrate_cost.py; the seconds are those of the machine it
+ran on, so the estimate is mainly good for ordering documents and for
+thresholds relative to it. Fonts registered for the first time in a
+process are not included.
+
+The calibration found the 職務経歴書 time to depend on the number of
+companies, projects and skill rows and on the amount of text, and the
+履歴書 time on the amount of text and on whether it has a photo (scaled
+down and re-encoded on every render). Counts it fitted no time to, even
+where the corpus varied them (environment entries per project, 履歴書
+history rows), are left out: their cost is already in the text they add.
+
+Imports only the models, so estimating never loads reportlab.
+"""
+
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from jp_tenshoku_docs_builder.resume.models import Resume
+
+# Seconds per unit of each feature, fitted by benchmarks/calibrate_cost.py (mean
+# error 12% for 職務経歴書 of 0.05-6 s, 4% for 履歴書)
+COEFFICIENTS = {
+    "work_history": {
+        "base": 0.0175,
+        "companies": 0.00113,
+        "projects": 0.00252,
+        "characters": 2.93e-05,
+        "skill_rows": 0.00063,
+    },
+    "resume": {
+        "base": 0.0181,
+        "characters": 2.43e-06,
+        "photo": 0.0331,
+    },
+}
+
+
+def _characters(value) -> int:
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_characters(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(_characters(v) for v in value)
+    return 0
+
+
+def cost_features(data: BaseModel) -> dict[str, int]:
+    """Counts the render time depends on; keys match COEFFICIENTS (without "base")."""
+    characters = _characters(data.model_dump())
+    if isinstance(data, Resume):
+        return {
+            "characters": characters,
+            "photo": int(bool(data.photo)),
+        }
+    companies = [*data.experience, *data.side_experience]
+    projects = [project for company in companies for project in company.projects]
+    return {
+        "companies": len(companies),
+        "projects": len(projects),
+        "characters": characters,
+        "skill_rows": sum(len(category.items) for category in data.technical_skills) + len(data.qualifications),
+    }
+
+
+def estimate_render_cost(data: BaseModel) -> float:
+    """Predicted render time of a 職務経歴書 or 履歴書 model, in (calibration machine) seconds."""
+    coefficients = COEFFICIENTS["resume" if isinstance(data, Resume) else "work_history"]
+    features = cost_features(data)
+    return coefficients["base"] + sum(coefficients[name] * value for name, value in features.items())
@@ -0,0 +1,153 @@
+"""Pre-flight glyph coverage check for the registered fonts.
+
+Collects every character used by a document model, checks it against a
+coverage bitset per font (built once from the font's cmap) and reports
+which fields contain characters that would render as tofu.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator
+
+from pydantic import BaseModel
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from jp_tenshoku_docs_builder.fonts import FontConfig
+
+_BITSET_SIZE = (0x10FFFF >> 3) + 1
+
+# Fields listed per missing character in reports
+_MAX_FIELDS = 5
+
+
+@lru_cache(maxsize=None)
+def coverage_bits(font_name: str) -> bytes:
+    """Return a bitset (1 bit per code point) of the characters a font can draw.
+
+    TrueType fonts use their cmap; standard Type 1 fonts cover what their
+    encoding (WinAnsi for Helvetica etc.) can represent.
+    """
+    bits = bytearray(_BITSET_SIZE)
+    font = pdfmetrics.getFont(font_name)
+    if isinstance(font, TTFont):
+        codes = font.face.charToGlyph.keys()
+    else:
+        codec = "cp1252" if font.encoding.name == "WinAnsiEncoding" else "latin-1"
+        codes = []
+        for code in range(0x2200):
+            try:
+                chr(code).encode(codec)
+            except UnicodeEncodeError:
+                continue
+            codes.append(code)
+    for code in codes:
+        bits[code >> 3] |= 1 << (code & 7)
+    return bytes(bits)
+
+
+def covers(font_name: str, ch: str) -> bool:
+    """True if font_name has a glyph for ch."""
+    code = ord(ch)
+    return bool(coverage_bits(font_name)[code >> 3] & (1 << (code & 7)))
+
+
+def split_runs(text: str, font_name: str, fallback: str) -> list[tuple[str, str]]:
+    """Split text into (font_name, run) pairs, routing uncovered characters to fallback.
+
+    Characters neither font covers stay with font_name.
+    """
+    runs: list[tuple[str, str]] = []
+    start = 0
+    current = font_name
+    for i, ch in enumerate(text):
+        font = fallback if not covers(font_name, ch) and covers(fallback, ch) else font_name
+        if font != current and i > start:
+            runs.append((current, text[start:i]))
+            start = i
+        current = font
+    if start < len(text):
+        runs.append((current, text[start:]))
+    return runs
+
+
+def _iter_strings(value, path: str) -> Iterator[tuple[str, str]]:
+    """Yield (field path, text) for every string in a model, e.g. "experience[0].company"."""
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, BaseModel):
+        for name in type(value).model_fields:
+            yield from _iter_strings(getattr(value, name), f"{path}.{name}" if path else name)
+    elif isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            yield from _iter_strings(item, f"{path}[{i}]")
+
+
+def _drawable(ch: str) -> bool:
+    """Characters that need a glyph (not whitespace or control characters)."""
+    return not ch.isspace() and not unicodedata.category(ch).startswith("C")
+
+
+@dataclass
+class MissingGlyph:
+    """A character some of the document fonts cannot draw."""
+
+    char: str
+    fonts: list[str]  # document fonts without the glyph
+    fields: list[str] = field(default_factory=list)
+    fallback: bool = False  # drawn with the fallback font instead
+
+    @property
+    def codepoint(self) -> str:
+        return f"U+{ord(self.char):04X}"
+
+
+@dataclass
+class CoverageReport:
+    """Result of scan_coverage."""
+
+    characters: int  # distinct drawable characters in the document
+    missing: list[MissingGlyph] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True when every character is drawn by a document or fallback font."""
+        return all(m.fallback for m in self.missing)
+
+    def to_text(self) -> str:
+        lines = [f"characters: {self.characters}, missing: {len(self.missing)}"]
+        for m in self.missing:
+            status = "fallback" if m.fallback else "MISSING"
+            fields = ", ".join(m.fields[:_MAX_FIELDS])
+            if len(m.fields) > _MAX_FIELDS:
+                fields += f", ... (+{len(m.fields) - _MAX_FIELDS})"
+            lines.append(f"{m.codepoint} {m.char!r:<5} {status:<8} {fields}")
+        return "\n".join(lines)
+
+
+def scan_coverage(data: BaseModel, fonts: FontConfig) -> CoverageReport:
+    """Check every character of a document model against the registered fonts.
+
+    A character counts as missing when the gothic or mincho font lacks it;
+    it is marked as ``fallback`` when fonts.fallback can draw it.
+    """
+    strings = list(_iter_strings(data, ""))
+    chars = {ch for _, text in strings for ch in text}
+    chars = sorted(ch for ch in chars if _drawable(ch))
+    document_fonts = list(dict.fromkeys((fonts.gothic, fonts.mincho)))
+
+    missing: dict[str, MissingGlyph] = {}
+    for ch in chars:
+        lacking = [f for f in document_fonts if not covers(f, ch)]
+        if lacking:
+            missing[ch] = MissingGlyph(
+                ch, lacking, fallback=bool(fonts.fallback) and covers(fonts.fallback, ch),
+            )
+    if missing:
+        for path, text in strings:
+            for ch in missing.keys() & set(text):
+                missing[ch].fields.append(path)
+    return CoverageReport(len(chars), list(missing.values()))
@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import hashlib
+import mmap
+import os
+import pickle
 import sys
+import tempfile
+import threading
 from dataclasses import dataclass
 from pathlib import Path
+from weakref import WeakKeyDictionary
 
+import reportlab
 from reportlab.lib.fonts import addMapping
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
 
 # Font search candidates: (file_name, family_name, subfont_index or None)
 # Ordered by preference. subfont_index is needed for .ttc files.
@@ -66,18 +74,147 @@ def _find_font(
                         path = sub / font_file
                         if path.exists():
                             return path, family_name, subfont_idx
-            except PermissionError:
+            except OSError:  # missing directory or no permission
                 continue
     return None
 
 
-def _register_font(name: str, path: Path, subfont_index: int | None) -> None:
-    """Register a single font with ReportLab."""
+# pdfmetrics is process-global; every registration goes through this lock.
+_REGISTRY_LOCK = threading.Lock()
+
+# (resolved path, mtime_ns, size) -> sha256 hex digest of the file content
+_DIGEST_CACHE: dict[tuple[str, int, int], str] = {}
+
+
+def _file_digest(path: Path) -> str:
+    """Return the content hash of a font file (cached by path, mtime and size)."""
+    st = path.stat()
+    key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    digest = _DIGEST_CACHE.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = _DIGEST_CACHE[key] = h.hexdigest()
+    return digest
+
+
+def _font_name(family: str, path: Path, subfont_index: int | None) -> str:
+    """Build a registration name unique to the font file's content.
+
+    Two renders using different files never share a name, while the same
+    file (from any directory) always maps to the same name.
+    """
+    name = f"{family}-{_file_digest(path)[:12]}"
     if subfont_index is not None:
-        pdfmetrics.registerFont(TTFont(name, str(path), subfontIndex=subfont_index))
+        name += f"-{subfont_index}"
+    return name
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temporary file so concurrent processes never read a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# Bump when the snapshot layout changes; old files are then ignored.
+_SNAPSHOT_FORMAT = 1
+
+# Attributes rebuilt on load instead of being stored in the snapshot:
+# the raw file data (mapped from the font file), the units-per-em scale
+# function (a lambda) and the per-document subset state.
+_FACE_TRANSIENT = ("_ttf_data", "_pdfScale")
+_FONT_TRANSIENT = ("face", "state")
+
+
+def _snapshot_path(cache_dir: str | Path, path: Path, subfont_index: int | None) -> Path:
+    """Snapshot file name, keyed by font content, subfont and reportlab version."""
+    index = 0 if subfont_index is None else subfont_index
+    return Path(cache_dir) / (
+        f"font-{_file_digest(path)[:16]}-{index}-rl{reportlab.Version}-v{_SNAPSHOT_FORMAT}.pickle"
+    )
+
+
+def _snapshot_header(path: Path, subfont_index: int | None) -> tuple:
+    return (_SNAPSHOT_FORMAT, reportlab.Version, _file_digest(path), subfont_index)
+
+
+def _pdf_scale(units_per_em: int):
+    """Same scale function TTFontFile.extractInfo builds (font units -> 1/1000 em)."""
+    if units_per_em == 1000:
+        return lambda x: x
+    factor = 1000 / units_per_em
+    return lambda x: x * factor
+
+
+def _save_snapshot(font: TTFont, path: Path, subfont_index: int | None, snapshot: Path) -> None:
+    face_state = {k: v for k, v in vars(font.face).items() if k not in _FACE_TRANSIENT}
+    font_state = {k: v for k, v in vars(font).items() if k not in _FONT_TRANSIENT}
+    payload = (_snapshot_header(path, subfont_index), font_state, face_state)
+    write_atomic(snapshot, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _load_snapshot(name: str, path: Path, subfont_index: int | None, snapshot: Path) -> TTFont | None:
+    """Rebuild a TTFont from its snapshot; None when missing, stale or unreadable."""
+    try:
+        header, font_state, face_state = pickle.loads(snapshot.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError):
+        return None
+    if header != _snapshot_header(path, subfont_index):
+        return None
+
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(face_state)
+    with path.open("rb") as f:
+        # Map the file instead of reading it: only the glyphs a document
+        # uses are touched when the subset is built.
+        face._ttf_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    face._pdfScale = _pdf_scale(face.unitsPerEm)
+
+    font = TTFont.__new__(TTFont)
+    font.__dict__.update(font_state)
+    font.fontName = name
+    font.face = face
+    font.state = WeakKeyDictionary()
+    return font
+
+
+def _load_font(name: str, path: Path, subfont_index: int | None, cache_dir: str | Path | None) -> TTFont:
+    """Parse a TrueType font, or restore it from a snapshot in cache_dir."""
+    snapshot = _snapshot_path(cache_dir, path, subfont_index) if cache_dir is not None else None
+    if snapshot is not None:
+        font = _load_snapshot(name, path, subfont_index, snapshot)
+        if font is not None:
+            return font
+    if subfont_index is not None:
+        font = TTFont(name, str(path), subfontIndex=subfont_index)
     else:
-        pdfmetrics.registerFont(TTFont(name, str(path)))
-    addMapping(name, 0, 0, name)
+        font = TTFont(name, str(path))
+    if snapshot is not None:
+        try:
+            _save_snapshot(font, path, subfont_index, snapshot)
+        except OSError as e:  # read-only or full cache directory: just parse next time
+            print(f"WARNING: Could not write font snapshot {snapshot}: {e}", file=sys.stderr)
+    return font
+
+
+def _register_font(
+    name: str, path: Path, subfont_index: int | None, cache_dir: str | Path | None = None,
+) -> None:
+    """Register a single font with ReportLab (idempotent, thread-safe)."""
+    with _REGISTRY_LOCK:
+        if name in pdfmetrics.getRegisteredFontNames():
+            return
+        pdfmetrics.registerFont(_load_font(name, path, subfont_index, cache_dir))
+        addMapping(name, 0, 0, name)
 
 
 @dataclass
@@ -86,11 +223,28 @@ class FontConfig:
 
     gothic: str  # Font name for headings (gothic/sans-serif)
     mincho: str  # Font name for body text (mincho/serif)
+    fallback: str | None = None  # Font name for characters the above lack
 
 
-def register_fonts(font_dir: str | Path | None = None) -> FontConfig:
+def register_fonts(
+    font_dir: str | Path | None = None,
+    fallback_font: str | Path | None = None,
+    cache_dir: str | Path | None = None,
+) -> FontConfig:
     """Discover and register Japanese fonts. Returns FontConfig with registered names.
 
+    Registered names are derived from the font file content (e.g.
+    "IPAexGothic-1a2b3c4d5e6f"), so concurrent renders with different
+    font_dir values can safely run in one process.
+
+    fallback_font is an optional TrueType file (.ttf, or the first face of a
+    .ttc) used for characters the gothic/mincho fonts have no glyph for.
+
+    With cache_dir, the parsed font tables are kept there as a snapshot
+    (keyed by font content and reportlab version) and later processes
+    load it instead of parsing the TrueType file again. The snapshot is a
+    pickle: only point cache_dir at a directory you trust.
+
     Search order:
     1. Specified font_dir (if provided)
     2. Project's fonts/ directory
@@ -110,18 +264,18 @@ def register_fonts(font_dir: str | Path | None = None) -> FontConfig:
     # Find and register gothic font
     gothic_result = _find_font(_GOTHIC_CANDIDATES, search_dirs)
     if gothic_result:
-        path, _family, subfont_idx = gothic_result
-        gothic_name = "Gothic"
-        _register_font(gothic_name, path, subfont_idx)
+        path, family, subfont_idx = gothic_result
+        gothic_name = _font_name(family, path, subfont_idx)
+        _register_font(gothic_name, path, subfont_idx, cache_dir)
     else:
         gothic_name = "Helvetica"
 
     # Find and register mincho font
     mincho_result = _find_font(_MINCHO_CANDIDATES, search_dirs)
     if mincho_result:
-        path, _family, subfont_idx = mincho_result
-        mincho_name = "Mincho"
-        _register_font(mincho_name, path, subfont_idx)
+        path, family, subfont_idx = mincho_result
+        mincho_name = _font_name(family, path, subfont_idx)
+        _register_font(mincho_name, path, subfont_idx, cache_dir)
     else:
         # Fall back to gothic if available, otherwise Helvetica
         mincho_name = gothic_name
@@ -130,7 +284,17 @@ def register_fonts(font_dir: str | Path | None = None) -> FontConfig:
         print(
             "WARNING: No Japanese fonts found. "
             "Please install IPAex fonts or specify --font-dir. "
-            "See fonts/README.md for details."
+            "See fonts/README.md for details.",
+            file=sys.stderr,
         )
 
-    return FontConfig(gothic=gothic_name, mincho=mincho_name)
+    fallback_name = None
+    if fallback_font:
+        path = Path(fallback_font)
+        if not path.is_file():
+            raise ValueError(f"Fallback font not found: {path}")
+        subfont_idx = 0 if path.suffix.lower() == ".ttc" else None
+        fallback_name = _font_name(path.stem, path, subfont_idx)
+        _register_font(fallback_name, path, subfont_idx, cache_dir)
+
+    return FontConfig(gothic=gothic_name, mincho=mincho_name, fallback=fallback_name)
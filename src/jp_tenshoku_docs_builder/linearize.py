@@ -0,0 +1,479 @@
+"""Linearized ("fast web view") PDF output.
+
+Rewrites a finished PDF so that a viewer can display page 1 before the
+rest of the file has arrived (PDF 32000-1:2008, Annex F): a linearization
+dictionary and a first-page cross-reference section at the start of the
+file, then the catalog, the primary hint stream, every object page 1
+needs, the remaining pages one after another, the objects they share,
+and finally the main cross-reference section.
+
+Only what ReportLab writes is supported: a classic cross-reference table
+and generation 0 objects, without object streams or encryption.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from dataclasses import dataclass, field
+
+_HEADER_RE = re.compile(rb"(\d+)\s+(\d+)\s+obj\b")
+_REF_RE = re.compile(rb"(?<![\d.])(\d+)\s+(\d+)\s+R\b")
+_BODY_END_RE = re.compile(rb"endobj|stream\r?\n")
+_LENGTH_RE = re.compile(rb"/Length\s+(\d+)(\s+\d+\s+R)?")
+_KEY_REF_RE = rb"/%s\s+(\d+)\s+\d+\s+R"
+_KIDS_RE = re.compile(rb"/Kids\s*\[([^\]]*)\]")
+_TYPE_PAGES_RE = re.compile(rb"/Type\s*/Pages\b")
+_PARENT_RE = re.compile(rb"/Parent\s+\d+\s+\d+\s+R")
+_ID_RE = re.compile(rb"/ID\s*(\[[^\]]*\])")
+
+# Shared object references in the page offset hint table carry a
+# "fractional position" we do not use; any non-zero denominator will do.
+_SHARED_DENOMINATOR = 4
+
+
+@dataclass
+class _Object:
+    """An indirect object: dictionary / value bytes and optional stream data."""
+
+    body: bytes  # everything between "n 0 obj" and "stream" / "endobj"
+    stream: bytes | None = None  # raw (still encoded) stream data
+    refs: list[int] = field(default_factory=list)
+
+
+def _code_segments(body: bytes) -> list[tuple[bool, bytes]]:
+    """Split a PDF fragment into (is_code, bytes); strings and comments are not code."""
+    segments: list[tuple[bool, bytes]] = []
+    start = i = 0
+    n = len(body)
+    while i < n:
+        c = body[i:i + 1]
+        if c == b"(":
+            segments.append((True, body[start:i]))
+            depth, j = 1, i + 1
+            while j < n and depth:
+                ch = body[j:j + 1]
+                if ch == b"\\":
+                    j += 1
+                elif ch == b"(":
+                    depth += 1
+                elif ch == b")":
+                    depth -= 1
+                j += 1
+            segments.append((False, body[i:j]))
+            start = i = j
+        elif c == b"<" and body[i + 1:i + 2] != b"<":
+            j = body.find(b">", i) + 1 or n
+            segments.append((True, body[start:i]))
+            segments.append((False, body[i:j]))
+            start = i = j
+        elif c == b"<":
+            i += 2  # dictionary start
+        elif c == b"%":
+            j = min(k for k in (body.find(b"\n", i), body.find(b"\r", i), n) if k >= 0)
+            segments.append((True, body[start:i]))
+            segments.append((False, body[i:j]))
+            start = i = j
+        else:
+            i += 1
+    segments.append((True, body[start:]))
+    return segments
+
+
+def _references(body: bytes) -> list[int]:
+    return [int(m.group(1)) for code, seg in _code_segments(body) if code for m in _REF_RE.finditer(seg)]
+
+
+def _renumber(body: bytes, numbers: dict[int, int]) -> bytes:
+    def sub(m: re.Match) -> bytes:
+        return b"%d 0 R" % numbers[int(m.group(1))]
+
+    return b"".join(_REF_RE.sub(sub, seg) if code else seg for code, seg in _code_segments(body))
+
+
+def _ref(body: bytes, key: bytes) -> int | None:
+    for code, seg in _code_segments(body):
+        if code:
+            m = re.search(_KEY_REF_RE % key, seg)
+            if m:
+                return int(m.group(1))
+    return None
+
+
+def _parse(pdf: bytes) -> tuple[bytes, dict[int, _Object], bytes]:
+    """Return (header line(s), objects by number, trailer dictionary)."""
+    startxref = pdf.rfind(b"startxref")
+    if startxref < 0:
+        raise ValueError("not a PDF: startxref not found")
+    xref_offset = int(pdf[startxref + 9:].split()[0])
+    if not pdf.startswith(b"xref", xref_offset):
+        raise ValueError("unsupported PDF: cross-reference streams are not supported")
+    if b"/Linearized" in pdf[:1024]:
+        raise ValueError("PDF is already linearized")
+
+    trailer_at = pdf.index(b"trailer", xref_offset)
+    lines = pdf[xref_offset + 4:trailer_at].split()
+    offsets: dict[int, int] = {}
+    i = 0
+    while i < len(lines):
+        first, count = int(lines[i]), int(lines[i + 1])
+        i += 2
+        for k in range(count):
+            offset, gen, kind = lines[i:i + 3]
+            i += 3
+            if kind == b"n":
+                if int(gen) != 0:
+                    raise ValueError("unsupported PDF: object generations other than 0")
+                offsets[first + k] = int(offset)
+    trailer = pdf[trailer_at + 7:startxref]
+    if b"/Prev" in trailer or b"/Encrypt" in trailer:
+        raise ValueError("unsupported PDF: incremental updates or encryption")
+
+    objects: dict[int, _Object] = {}
+    for num, offset in offsets.items():
+        m = _HEADER_RE.match(pdf, offset)
+        if not m or int(m.group(1)) != num:
+            raise ValueError(f"broken cross-reference entry for object {num}")
+        end = _BODY_END_RE.search(pdf, m.end())
+        body = pdf[m.end():end.start()]
+        stream = None
+        if end.group(0).startswith(b"stream"):
+            length = _LENGTH_RE.search(body)
+            if length.group(2):  # indirect /Length
+                target = pdf[offsets[int(length.group(2).split()[0])]:]
+                size = int(_HEADER_RE.sub(b"", target, count=1).split()[0])
+            else:
+                size = int(length.group(1))
+            stream = pdf[end.end():end.end() + size]
+        objects[num] = _Object(body, stream, _references(body))
+
+    first_obj = min(offsets.values())
+    header = pdf[:first_obj]
+    return header, objects, trailer
+
+
+def _page_numbers(objects: dict[int, _Object], root: int) -> tuple[list[int], set[int]]:
+    """Walk the page tree: (page object numbers in order, page tree node numbers)."""
+    pages_root = _ref(objects[root].body, b"Pages")
+    pages: list[int] = []
+    nodes: set[int] = set()
+
+    def walk(num: int) -> None:
+        body = objects[num].body
+        if _TYPE_PAGES_RE.search(body):
+            nodes.add(num)
+            for kid in _REF_RE.finditer(_KIDS_RE.search(body).group(1)):
+                walk(int(kid.group(1)))
+        else:
+            pages.append(num)
+
+    walk(pages_root)
+    return pages, nodes
+
+
+def _closure(start: int, objects: dict[int, _Object], stop: set[int]) -> list[int]:
+    """Objects reachable from start (in discovery order), not following /Parent or stop."""
+    seen = [start]
+    found = {start}
+    queue = [start]
+    while queue:
+        num = queue.pop(0)
+        body = objects[num].body
+        refs = _references(_PARENT_RE.sub(b"", body)) if num == start else objects[num].refs
+        for ref in refs:
+            if ref not in found and ref not in stop and ref in objects:
+                found.add(ref)
+                seen.append(ref)
+                queue.append(ref)
+    return seen
+
+
+class _BitWriter:
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    def write(self, value: int, bits: int) -> None:
+        for shift in range(bits - 1, -1, -1):
+            self._acc = (self._acc << 1) | ((value >> shift) & 1)
+            self._bits += 1
+            if self._bits == 8:
+                self.data.append(self._acc)
+                self._acc = self._bits = 0
+
+    def flush(self) -> None:
+        if self._bits:
+            self.data.append(self._acc << (8 - self._bits))
+            self._acc = self._bits = 0
+
+
+def _bits(value: int) -> int:
+    return value.bit_length()
+
+
+@dataclass
+class _PageHint:
+    nobjects: int
+    length: int
+    shared: list[int]  # shared object hint table indices
+
+
+def _hint_tables(
+    pages: list[_PageHint],
+    first_page_offset: int,
+    shared_lengths: list[int],
+    nshared_first_page: int,
+    first_shared_obj: int,
+    first_shared_offset: int,
+) -> bytes:
+    """Encode the page offset and shared object hint tables.
+
+    Returns the stream data and the offset of the shared object hint
+    table within it (the hint stream's /S entry).
+    """
+    w = _BitWriter()
+    min_nobj = min(p.nobjects for p in pages)
+    min_len = min(p.length for p in pages)
+    nbits_nobj = _bits(max(p.nobjects for p in pages) - min_nobj)
+    nbits_len = _bits(max(p.length for p in pages) - min_len)
+    nbits_nshared = _bits(max(len(p.shared) for p in pages))
+    nbits_shared_id = _bits(max((i for p in pages for i in p.shared), default=0))
+
+    # Page offset hint table header (Table F.3)
+    w.write(min_nobj, 32)
+    w.write(first_page_offset, 32)
+    w.write(nbits_nobj, 16)
+    w.write(min_len, 32)
+    w.write(nbits_len, 16)
+    w.write(0, 32)  # least content stream offset (not used)
+    w.write(0, 16)
+    w.write(min_len, 32)  # content stream length: the page length
+    w.write(nbits_len, 16)
+    w.write(nbits_nshared, 16)
+    w.write(nbits_shared_id, 16)
+    w.write(0, 16)  # bits per numerator
+    w.write(_SHARED_DENOMINATOR, 16)
+
+    # Per-page entries, item by item (Table F.4)
+    for p in pages:
+        w.write(p.nobjects - min_nobj, nbits_nobj)
+    w.flush()
+    for p in pages:
+        w.write(p.length - min_len, nbits_len)
+    w.flush()
+    for p in pages:
+        w.write(len(p.shared), nbits_nshared)
+    w.flush()
+    for p in pages:
+        for i in p.shared:
+            w.write(i, nbits_shared_id)
+    w.flush()
+    # Items 5 (fractional position numerators) and 6 (content stream
+    # offsets) are 0 bits wide; item 7: content stream length per page
+    for p in pages:
+        w.write(p.length - min_len, nbits_len)
+    w.flush()
+
+    shared_table = len(w.data)
+    # Shared object hint table header (Table F.5); one object per group
+    min_group = min(shared_lengths, default=0)
+    nbits_group = _bits(max(shared_lengths, default=0) - min_group)
+    w.write(first_shared_obj, 32)
+    w.write(first_shared_offset, 32)
+    w.write(nshared_first_page, 32)
+    w.write(len(shared_lengths), 32)
+    w.write(0, 16)  # bits for objects per group - 1
+    w.write(min_group, 32)
+    w.write(nbits_group, 16)
+    for length in shared_lengths:
+        w.write(length - min_group, nbits_group)
+    w.flush()
+    for _ in shared_lengths:
+        w.write(0, 1)  # no MD5 signatures
+    w.flush()
+    return bytes(w.data), shared_table
+
+
+def _serialize(num: int, obj: _Object, numbers: dict[int, int]) -> bytes:
+    body = _renumber(obj.body, numbers)
+    out = b"%d 0 obj" % num + body
+    if obj.stream is not None:
+        out += b"stream\n" + obj.stream + b"\nendstream\n"
+    return out + b"endobj\n"
+
+
+def _xref(first: int, offsets: list[int], free_head: bool) -> bytes:
+    count = len(offsets) + (1 if free_head else 0)
+    out = [b"xref\n%d %d\n" % (0 if free_head else first, count)]
+    if free_head:
+        out.append(b"0000000000 65535 f \n")
+    out += [b"%010d 00000 n \n" % offset for offset in offsets]
+    return b"".join(out)
+
+
+def linearize_pdf(pdf: bytes) -> bytes:
+    """Return a linearized copy of a ReportLab-generated PDF.
+
+    Raises:
+        ValueError: if the PDF uses features this writer does not handle
+            (cross-reference streams, incremental updates, encryption) or
+            is already linearized.
+    """
+    header, objects, trailer = _parse(pdf)
+    root = _ref(trailer, b"Root")
+    info = _ref(trailer, b"Info")
+    doc_id = _ID_RE.search(trailer)
+    pages, tree_nodes = _page_numbers(objects, root)
+    page_set = set(pages)
+
+    # Objects needed by each page, and how many pages need each object
+    closures = [_closure(p, objects, (page_set - {p}) | tree_nodes | {root}) for p in pages]
+    users: dict[int, int] = {}
+    for closure in closures:
+        for num in closure:
+            users[num] = users.get(num, 0) + 1
+
+    part6 = closures[0]
+    placed = {root, *part6}
+    part7: list[list[int]] = []
+    for closure in closures[1:]:
+        private = [closure[0]] + [n for n in closure[1:] if users[n] == 1 and n not in placed]
+        placed.update(private)
+        part7.append(private)
+    part8: list[int] = []
+    for closure in closures[1:]:
+        for num in closure:
+            if num not in placed:
+                placed.add(num)
+                part8.append(num)
+    part9 = [n for n in objects if n not in placed]
+
+    # Main section (parts 7-9) gets 1..m-1; the first-page section gets
+    # m.. for the linearization dict, catalog, page 1 objects, hint stream.
+    second_half = [n for group in part7 for n in group] + part8 + part9
+    numbers = {old: new for new, old in enumerate(second_half, start=1)}
+    m = len(second_half) + 1
+    numbers[root] = m + 1
+    for i, old in enumerate(part6):
+        numbers[old] = m + 2 + i
+    hint_num = m + 2 + len(part6)
+    size = hint_num + 1
+
+    catalog = _serialize(numbers[root], objects[root], numbers)
+    first_page = [_serialize(numbers[n], objects[n], numbers) for n in part6]
+    rest = [_serialize(numbers[n], objects[n], numbers) for n in second_half]
+    rest_lengths = [len(b) for b in rest]
+
+    trailer_refs = b"/Root %d 0 R" % numbers[root]
+    if info is not None:
+        trailer_refs += b" /Info %d 0 R" % numbers[info]
+    if doc_id:
+        trailer_refs += b" /ID " + doc_id.group(1)
+
+    # The linearization dict, first-page xref and hint stream depend on
+    # offsets that depend on their own sizes: reserve space, fill it in and
+    # grow the reservation until everything fits (two or three rounds).
+    reserved = (0, 0, 0)
+    while True:
+        lin, xref1, hint, main_xref, main_trailer = _offset_dependent(
+            header, reserved, catalog, first_page, rest_lengths,
+            pages=[numbers[p] for p in pages], part6=[numbers[n] for n in part6],
+            part7=[[numbers[n] for n in group] for group in part7], part8=[numbers[n] for n in part8],
+            shared_refs=[[numbers[n] for n in closure if users[n] > 1] for closure in closures[1:]],
+            m=m, size=size, hint_num=hint_num, trailer_refs=trailer_refs,
+        )
+        sizes = (len(lin), len(xref1), len(hint))
+        if all(a <= b for a, b in zip(sizes, reserved)):
+            break
+        reserved = tuple(max(a, b) for a, b in zip(sizes, reserved))
+
+    lin = _pad(lin, reserved[0], b">>\nendobj")
+    xref1 = _pad(xref1, reserved[1], b">>\nstartxref")
+    hint = _pad(hint, reserved[2], b"endobj")
+    return b"".join([header, lin, xref1, catalog, hint, *first_page, *rest, main_xref, main_trailer])
+
+
+def _pad(chunk: bytes, size: int, marker: bytes) -> bytes:
+    """Pad chunk to size with spaces inserted before its last marker."""
+    at = chunk.rindex(marker)
+    return chunk[:at] + b" " * (size - len(chunk)) + chunk[at:]
+
+
+def _offset_dependent(
+    header: bytes,
+    reserved: tuple[int, int, int],
+    catalog: bytes,
+    first_page: list[bytes],
+    rest_lengths: list[int],
+    *,
+    pages: list[int],
+    part6: list[int],
+    part7: list[list[int]],
+    part8: list[int],
+    shared_refs: list[list[int]],
+    m: int,
+    size: int,
+    hint_num: int,
+    trailer_refs: bytes,
+) -> tuple[bytes, bytes, bytes, bytes, bytes]:
+    """Lay the file out with reserved sizes for the linearization dict,
+    first-page xref and hint stream, and build those plus the main xref.
+
+    All object numbers here are the new ones; objects 1..m-1 (parts 7-9)
+    are stored consecutively after page 1, in number order.
+    """
+    lin_size, xref1_size, hint_size = reserved
+    lin_at = len(header)
+    xref1_at = lin_at + lin_size
+    catalog_at = xref1_at + xref1_size
+    hint_at = catalog_at + len(catalog)
+    page1_at = hint_at + hint_size
+
+    offsets = []
+    pos = page1_at
+    for chunk in first_page:
+        offsets.append(pos)
+        pos += len(chunk)
+    first_page_end = pos
+    rest_offsets = []
+    for length in rest_lengths:
+        rest_offsets.append(pos)
+        pos += length
+    main_xref_at = pos
+    main_xref = _xref(0, rest_offsets, free_head=True)
+    main_trailer = b"trailer\n<< /Size %d >>\nstartxref\n%d\n%%%%EOF\n" % (m, xref1_at)
+    file_length = main_xref_at + len(main_xref) + len(main_trailer)
+
+    def adjusted(offset: int) -> int:
+        # Hint table offsets are given as if the hint stream were absent
+        return offset - hint_size if offset > hint_at else offset
+
+    # Shared object hint table entries: every page 1 object, then part 8
+    shared_index = {num: i for i, num in enumerate(part6 + part8)}
+    shared_lengths = [len(chunk) for chunk in first_page] + [rest_lengths[num - 1] for num in part8]
+    page_hints = [_PageHint(len(part6), first_page_end - page1_at, [])]
+    for group, refs in zip(part7, shared_refs):
+        length = sum(rest_lengths[num - 1] for num in group)
+        page_hints.append(_PageHint(len(group), length, [shared_index[num] for num in refs]))
+
+    hint_data, shared_at = _hint_tables(
+        page_hints,
+        adjusted(page1_at),
+        shared_lengths,
+        len(part6),
+        part8[0] if part8 else 0,
+        adjusted(rest_offsets[part8[0] - 1]) if part8 else 0,
+    )
+    hint_data = zlib.compress(hint_data)
+    hint = (
+        b"%d 0 obj\n<< /Filter /FlateDecode /Length %d /S %d >>\nstream\n" % (hint_num, len(hint_data), shared_at)
+        + hint_data + b"\nendstream\nendobj\n"
+    )
+    first_entry = main_xref_at + main_xref.index(b"\n0000000000")
+    lin = b"%d 0 obj\n<< /Linearized 1 /L %d /H [ %d %d ] /O %d /E %d /N %d /T %d >>\nendobj\n" % (
+        m, file_length, hint_at, hint_size, pages[0], first_page_end, len(pages), first_entry,
+    )
+    xref1 = _xref(m, [lin_at, catalog_at] + offsets + [hint_at], free_head=False)
+    xref1 += b"trailer\n<< /Size %d /Prev %d %s >>\nstartxref\n0\n%%%%EOF\n" % (size, main_xref_at, trailer_refs)
+    return lin, xref1, hint, main_xref, main_trailer
@@ -0,0 +1,200 @@
+"""Memory profile of the render pipeline (tracemalloc, per phase).
+
+Inside ``profile_memory()`` the loaders and builders mark their phases
+(load, validate, fonts, build, layout, write, and photo for the 履歴書),
+and each phase records its peak traced memory, what it still holds at
+its end and the source lines that allocated most of that. Phases are
+attributed to the function that ran them, e.g.
+``work_history.builder._render``; the builders also note the page and
+project count, so memory per page and per project can be tracked.
+
+    with profile_memory() as profile:
+        data = load_yaml(path, credential_path)
+        pdf = render_pdf(data)
+    json.dumps(profile.to_dict())
+
+The profile is found through a context variable, so nothing is threaded
+through the builders and marking a phase costs nothing when no profile
+is active. tracemalloc traces the whole process: profile one render at
+a time. Allocation sites are taken from snapshots at the phase
+boundaries, which slows rendering down noticeably.
+"""
+
+from __future__ import annotations
+
+import sys
+import sysconfig
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+
+_PACKAGE = "jp_tenshoku_docs_builder."
+
+
+@dataclass
+class AllocationSite:
+    """A source line and the memory its allocations during a phase still hold."""
+
+    location: str  # "path:line", relative to the stdlib, site-packages or src/
+    size: int
+    count: int
+
+
+@dataclass
+class PhaseMemory:
+    """Traced memory of one phase, relative to the memory at its start."""
+
+    phase: str
+    function: str
+    peak: int
+    retained: int  # traced memory at the end minus at the start
+    top: list[AllocationSite] = field(default_factory=list)
+
+
+@dataclass
+class MemoryProfile:
+    """Per-phase memory of everything run inside profile_memory()."""
+
+    phases: list[PhaseMemory] = field(default_factory=list)
+    peak: int = 0  # highest traced memory above the start of the profile
+    pages: int | None = None
+    projects: int | None = None
+
+    @property
+    def per_page(self) -> float | None:
+        return self.peak / self.pages if self.pages else None
+
+    @property
+    def per_project(self) -> float | None:
+        return self.peak / self.projects if self.projects else None
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "per_page": self.per_page, "per_project": self.per_project}
+
+    def to_text(self) -> str:
+        lines = [f"peak: {self.peak / 1024:.0f} KiB"]
+        if self.pages:
+            lines[0] += f" ({self.per_page / 1024:.0f} KiB/page"
+            lines[0] += f", {self.per_project / 1024:.0f} KiB/project)" if self.projects else ")"
+        for p in self.phases:
+            line = f"{p.phase:<9} {p.peak / 1024:9.0f} KiB peak {p.retained / 1024:9.0f} KiB retained  {p.function}"
+            lines.append(line)
+            lines.extend(f"    {site.size / 1024:9.0f} KiB  {site.location}" for site in p.top[:3])
+        return "\n".join(lines)
+
+
+class _Session:
+    def __init__(self, profile: MemoryProfile, top: int):
+        self.profile = profile
+        self.top = top
+        self.stack: list[list[int]] = []  # [start, highest seen] of each open phase, outermost first
+
+    def enter(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        if self.stack:
+            self.stack[-1][1] = max(self.stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self.stack.append([current, current])
+
+    def exit(self) -> tuple[int, int]:
+        """(peak, retained) of the innermost phase, which is closed."""
+        current, peak = tracemalloc.get_traced_memory()
+        start, seen = self.stack.pop()
+        seen = max(seen, peak)
+        if self.stack:
+            self.stack[-1][1] = max(self.stack[-1][1], seen)
+        return seen - start, current - start
+
+
+_session: ContextVar[_Session | None] = ContextVar("memprofile_session", default=None)
+
+_IGNORED = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+
+_STDLIB = sysconfig.get_paths()["stdlib"] + "/"
+
+
+def _location(filename: str, lineno: int) -> str:
+    filename = filename.removeprefix(_STDLIB)
+    for marker in ("site-packages/", "/src/"):
+        if marker in filename:
+            filename = filename.rsplit(marker, 1)[1]
+            break
+    return f"{filename}:{lineno}"
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+
+class _Phase:
+    def __init__(self, session: _Session, name: str, function: str):
+        self.session = session
+        self.name = name
+        self.function = function
+        self.start: tracemalloc.Snapshot | None = None
+
+    def __enter__(self) -> None:
+        if self.session.top:
+            self.start = _snapshot()  # taken before the phase's own measurement starts
+        self.session.enter()
+
+    def __exit__(self, *exc) -> None:
+        peak, retained = self.session.exit()
+        top = []
+        if self.start is not None:
+            diffs = _snapshot().compare_to(self.start, "lineno")
+            top = [
+                AllocationSite(_location(d.traceback[0].filename, d.traceback[0].lineno), d.size_diff, d.count_diff)
+                for d in sorted(diffs, key=lambda d: d.size_diff, reverse=True)[: self.session.top]
+                if d.size_diff > 0
+            ]
+        self.session.profile.phases.append(PhaseMemory(self.name, self.function, peak, retained, top))
+
+
+def phase(name: str):
+    """Context manager marking a pipeline phase; a no-op outside profile_memory()."""
+    session = _session.get()
+    if session is None:
+        return nullcontext()
+    caller = sys._getframe(1)
+    module = caller.f_globals.get("__name__", "")
+    return _Phase(session, name, f"{module.removeprefix(_PACKAGE)}.{caller.f_code.co_qualname}")
+
+
+def note(pages: int | None = None, projects: int | None = None) -> None:
+    """Record the document size on the active profile (ignored without one)."""
+    session = _session.get()
+    if session is None:
+        return
+    if pages is not None:
+        session.profile.pages = pages
+    if projects is not None:
+        session.profile.projects = projects
+
+
+@contextmanager
+def profile_memory(top: int = 10):
+    """Profile the memory of the phases run inside the block.
+
+    top: number of allocation sites kept per phase (0 skips the snapshots,
+        which makes profiling much cheaper).
+    Starts tracemalloc unless it is already tracing (and stops it again).
+    """
+    if top < 0:
+        raise ValueError(f"top must not be negative: {top}")
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    profile = MemoryProfile()
+    session = _Session(profile, top)
+    token = _session.set(session)
+    session.enter()
+    try:
+        yield profile
+    finally:
+        profile.peak = session.exit()[0]
+        _session.reset(token)
+        if started:
+            tracemalloc.stop()
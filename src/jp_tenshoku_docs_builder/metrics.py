@@ -0,0 +1,111 @@
+"""Glyph advance-width tables for fast text measuring.
+
+``canvas.stringWidth`` re-walks the whole string on every call, so measuring
+each prefix of a line to find a break point is O(n²). A GlyphWidths table
+is built once per registered font and answers every prefix width of a
+string from one cumulative pass.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+_BMP_SIZE = 0x10000
+_UNKNOWN = -1.0
+_BREAKABLE_SPACES = (" ", "\u3000")  # half-width or full-width space
+
+
+class GlyphWidths:
+    """Advance widths of one registered font, in 1/1000 em, by code point.
+
+    TrueType fonts are filled from the font's own width table up front;
+    other (Type 1) fonts are measured lazily, one code point at a time.
+    """
+
+    def __init__(self, font_name: str):
+        self.font_name = font_name
+        font = pdfmetrics.getFont(font_name)
+        self._astral: dict[int, float] = {}
+        self._default: float | None = None
+        if isinstance(font, TTFont):
+            face = font.face
+            self._default = float(face.defaultWidth)
+            self._table = array("d", [self._default]) * _BMP_SIZE
+            for code, width in face.charWidths.items():
+                if code < _BMP_SIZE:
+                    self._table[code] = width
+                else:
+                    self._astral[code] = width
+        else:
+            self._table = array("d", [_UNKNOWN]) * _BMP_SIZE
+
+    def _width(self, code: int) -> float:
+        if code < _BMP_SIZE:
+            w = self._table[code]
+            if w == _UNKNOWN:
+                w = self._table[code] = pdfmetrics.stringWidth(chr(code), self.font_name, 1000)
+            return w
+        w = self._astral.get(code)
+        if w is None:
+            w = self._default
+            if w is None:
+                w = pdfmetrics.stringWidth(chr(code), self.font_name, 1000)
+            self._astral[code] = w
+        return w
+
+    def advances(self, text: str) -> list[float]:
+        """Return the advance width of each character of text, in 1/1000 em."""
+        return list(map(self._width, map(ord, text)))
+
+    def cumulative(self, text: str) -> list[float]:
+        """Return the width of every prefix text[:i + 1], in 1/1000 em."""
+        return list(accumulate(map(self._width, map(ord, text))))
+
+    def string_width(self, text: str, font_size: float) -> float:
+        """Width of text in points (same result as canvas.stringWidth)."""
+        return sum(map(self._width, map(ord, text))) * font_size / 1000
+
+    def fit(self, text: str, font_size: float, max_width: float) -> int:
+        """Return how many leading characters of text fit within max_width points."""
+        return bisect_right(self.cumulative(text), max_width * 1000 / font_size)
+
+    def split(self, text: str, font_size: float, max_width: float) -> tuple[str, str]:
+        """Split text into a first line that fits max_width and the remainder.
+
+        Breaks at the last half/full-width space that fits (the space itself
+        is dropped); without one, hard-breaks at the overflow point. At least
+        one character is always kept on the first line.
+        """
+        n = self.fit(text, font_size, max_width)
+        if n >= len(text):
+            return text, ""
+        last_space = max(text.rfind(sp, 0, n) for sp in _BREAKABLE_SPACES)
+        if last_space > 0:
+            return text[:last_space], text[last_space + 1:]
+        n = max(n, 1)
+        return text[:n], text[n:]
+
+    def wrap(self, text: str, font_size: float, max_width: float) -> list[str]:
+        """Wrap text into lines that each fit within max_width points."""
+        lines: list[str] = []
+        while True:
+            line, text = self.split(text, font_size, max_width)
+            lines.append(line)
+            if not text:
+                return lines
+
+
+@lru_cache(maxsize=None)
+def glyph_widths(font_name: str) -> GlyphWidths:
+    """Return the (cached) width table for a registered font.
+
+    Font names from register_fonts are derived from the file content, so a
+    name always refers to the same glyph widths and is safe to cache on.
+    """
+    return GlyphWidths(font_name)
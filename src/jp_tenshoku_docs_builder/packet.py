@@ -0,0 +1,157 @@
+"""Application packet: 履歴書 followed by 職務経歴書 in one PDF.
+
+Both documents are drawn onto one canvas in one pass: the two 履歴書
+pages are page templates whose onPage callbacks run the resume's Canvas
+drawing code, and the 職務経歴書 flowables follow on the "main" template.
+The fonts are registered once and each is embedded as a single subset,
+instead of twice as when two separately rendered PDFs are concatenated.
+Page numbers ("n / total") count only the 職務経歴書 pages.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import Frame, NextPageTemplate, PageBreak, PageTemplate
+
+from jp_tenshoku_docs_builder.fonts import FontConfig, register_fonts
+from jp_tenshoku_docs_builder.memprofile import note, phase
+from jp_tenshoku_docs_builder.resume.builder import _draw_page1, _draw_page2, _FallbackCanvas, _prepare_photo
+from jp_tenshoku_docs_builder.resume.canvas import StateTrackingCanvas
+from jp_tenshoku_docs_builder.resume.models import Resume
+from jp_tenshoku_docs_builder.resume.photo import DEFAULT_DPI
+from jp_tenshoku_docs_builder.work_history.builder import (
+    _build_elements,
+    _layout,
+    _make_doc,
+    _page_number_drawer,
+)
+from jp_tenshoku_docs_builder.work_history.models import _WorkHistoryBase
+from jp_tenshoku_docs_builder.work_history.styles import StyleScale, build_styles
+
+# Pages taken by the 履歴書 at the start of the packet
+RESUME_PAGES = 2
+
+
+def _resume_template(template_id: str, draw) -> PageTemplate:
+    # The frame stays empty: a PageBreak moves on to the next template
+    frame = Frame(0, 0, A4[0], A4[1], id=template_id)
+    return PageTemplate(id=template_id, frames=[frame], onPage=lambda canvas, doc: draw(canvas))
+
+
+def _render(
+    resume: Resume,
+    work_history: _WorkHistoryBase,
+    target: str | BinaryIO,
+    fonts: FontConfig,
+    content_format: str,
+    split_in_row: int,
+    scale: StyleScale,
+    photo_dpi: int,
+    cache_dir: str | Path | None,
+    table_layout: str,
+) -> None:
+    """Render the packet into target (a file name or a binary file object)."""
+    styles = build_styles(fonts, scale)
+    total_pages = _layout(
+        work_history, styles, content_format, split_in_row, scale.spacing, table_layout=table_layout,
+    ).pages
+    with phase("photo"):
+        photo = _prepare_photo(resume, photo_dpi, cache_dir)
+
+    templates = [
+        _resume_template("resume1", lambda c: _draw_page1(c, resume, fonts, photo)),
+        _resume_template("resume2", lambda c: _draw_page2(c, resume, fonts)),
+    ]
+    doc = _make_doc(
+        target, _page_number_drawer(fonts.mincho, total_pages, offset=RESUME_PAGES), leading_templates=templates,
+    )
+    note(
+        pages=RESUME_PAGES + total_pages,
+        projects=sum(len(company.projects) for company in work_history.experience),
+    )
+    with phase("build"):
+        elements = [
+            NextPageTemplate("resume2"),
+            PageBreak(),
+            NextPageTemplate("main"),
+            PageBreak(),
+            *_build_elements(
+                work_history, styles, content_format, split_in_row, scale.spacing, table_layout=table_layout,
+            ),
+        ]
+    canvasmaker = partial(_FallbackCanvas, fallback=fonts.fallback) if fonts.fallback else StateTrackingCanvas
+    with phase("write"):
+        doc.build(elements, canvasmaker=canvasmaker)
+
+
+def build_packet_pdf(
+    resume: Resume,
+    work_history: _WorkHistoryBase,
+    output: str | Path,
+    font_dir: str | Path | None = None,
+    content_format: str = "standard",
+    split_in_row: int = 1,
+    scale: StyleScale | None = None,
+    fallback_font: str | Path | None = None,
+    photo_dpi: int = DEFAULT_DPI,
+    cache_dir: str | Path | None = None,
+    table_layout: str = "project",
+) -> Path:
+    """Generate the 履歴書 + 職務経歴書 packet PDF.
+
+    Args:
+        resume: Validated Resume data.
+        work_history: Validated WorkHistory data.
+        output: Output PDF file path.
+        font_dir: Optional directory containing Japanese fonts.
+        content_format: Project content format ("standard" or "star").
+        split_in_row: 1=行途中でページ分割, 0=プロジェクト丸ごと次ページ.
+        scale: Optional style scale factors for the 職務経歴書 (see fit_to_pages).
+        fallback_font: Optional font file for characters the Japanese fonts lack.
+        photo_dpi: Resolution the photo is downscaled to within its 30x40mm box.
+        cache_dir: Optional directory to keep prepared photos and font snapshots across runs.
+        table_layout: "project" (one table per project) or "company" (one
+            table per company, column headers repeated on each page).
+
+    Returns:
+        Path to the generated PDF.
+    """
+    output = Path(output)
+    with phase("fonts"):
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    _render(
+        resume, work_history, str(output), fonts, content_format, split_in_row, scale or StyleScale(),
+        photo_dpi, cache_dir, table_layout,
+    )
+    return output
+
+
+def render_packet_pdf(
+    resume: Resume,
+    work_history: _WorkHistoryBase,
+    font_dir: str | Path | None = None,
+    content_format: str = "standard",
+    split_in_row: int = 1,
+    scale: StyleScale | None = None,
+    fallback_font: str | Path | None = None,
+    photo_dpi: int = DEFAULT_DPI,
+    cache_dir: str | Path | None = None,
+    table_layout: str = "project",
+) -> bytes:
+    """Generate the packet PDF in memory and return its bytes.
+
+    Takes the same options as build_packet_pdf.
+    """
+    buffer = BytesIO()
+    with phase("fonts"):
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    _render(
+        resume, work_history, buffer, fonts, content_format, split_in_row, scale or StyleScale(),
+        photo_dpi, cache_dir, table_layout,
+    )
+    return buffer.getvalue()
@@ -0,0 +1,401 @@
+"""Lightweight HTML / Markdown preview of 職務経歴書 and 履歴書.
+
+Renders the same models as the PDF builders, in the same section order and
+with the same "◆" headings, but without importing reportlab. Intended for
+live previews; generate the PDF only when exporting.
+"""
+
+from __future__ import annotations
+
+from html import escape
+
+from jp_tenshoku_docs_builder.resume.models import HistoryEntry, Resume
+from jp_tenshoku_docs_builder.work_history.models import (
+    SideCompany,
+    SideProject,
+    StarProject,
+    _CompanyBase,
+    _ProjectBase,
+    _WorkHistoryBase,
+)
+
+_CSS = """
+body { font-family: serif; max-width: 170mm; margin: 15mm auto; font-size: 9pt; line-height: 1.8; }
+h1 { font-family: sans-serif; font-size: 16pt; text-align: center; font-weight: normal; }
+h2 { font-family: sans-serif; font-size: 11pt; font-weight: normal; margin: 4mm 0 2mm; }
+h3 { font-family: sans-serif; font-size: 9pt; font-weight: normal; background: #ebebeb;
+     border: 0.5pt solid black; margin: 0; padding: 3pt 4pt; }
+.right { text-align: right; margin: 0; }
+table { border-collapse: collapse; width: 100%; font-size: 8pt; line-height: 1.6; }
+th, td { border: 0.5pt solid black; padding: 2pt 3pt; vertical-align: top; text-align: left; }
+th { font-family: sans-serif; background: #f2f2f2; text-align: center; }
+.company { margin-bottom: 3mm; }
+.box { border: 2pt solid black; padding: 2mm; margin-bottom: 3mm; white-space: pre-wrap; }
+"""
+
+
+def to_html(data: _WorkHistoryBase | Resume) -> str:
+    """Render a work history or resume model to a standalone HTML page."""
+    if isinstance(data, Resume):
+        title, body = "履歴書", _resume_html(data)
+    else:
+        title, body = "職務経歴書", _work_history_html(data)
+    return (
+        '<!DOCTYPE html>\n<html lang="ja">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{title}</title>\n<style>{_CSS}</style>\n</head>\n<body>\n"
+        f"{body}\n</body>\n</html>\n"
+    )
+
+
+def to_markdown(data: _WorkHistoryBase | Resume) -> str:
+    """Render a work history or resume model to Markdown."""
+    if isinstance(data, Resume):
+        lines = _resume_markdown(data)
+    else:
+        lines = _work_history_markdown(data)
+    return "\n".join(lines).rstrip() + "\n"
+
+
+# ── 職務経歴書 (共通) ──
+
+
+def _lines(text: str) -> list[str]:
+    return text.strip().split("\n") if text else []
+
+
+def _bullets(items: list[str]) -> list[str]:
+    return [f"・{i}" for i in items]
+
+
+def _project_blocks(project: _ProjectBase) -> list[tuple[str, list[str]]]:
+    """Return the (◆ heading, lines) blocks of a project content cell."""
+    if isinstance(project, StarProject):
+        blocks = [
+            ("状況（Situation）", _lines(project.situation)),
+            ("課題（Task）", _lines(project.task)),
+            ("行動（Action）", _bullets(project.action)),
+            ("結果（Result）", _bullets(project.result)),
+        ]
+    else:
+        blocks = [
+            ("プロジェクト概要", _lines(project.overview)),
+            ("担当フェーズ", [project.phases] if project.phases else []),
+            ("業務内容", _bullets(project.responsibilities)),
+            ("実績・取り組み", _bullets(project.achievements)),
+        ]
+    return [(label, lines) for label, lines in blocks if lines]
+
+
+def _project_title(project: _ProjectBase) -> str:
+    if project.industry:
+        return f"{project.industry} / {project.name}"
+    return project.name
+
+
+def _company_info(company: _CompanyBase) -> list[str]:
+    info = []
+    if company.business:
+        info.append(f"事業内容：{company.business}")
+    finance = [f"{k}：{v}" for k, v in (("資本金", company.capital), ("売上高", company.revenue)) if v]
+    if finance:
+        info.append("　".join(finance))
+    size = [f"{k}：{v}" for k, v in (("従業員数", company.employees), ("上場", company.listing)) if v]
+    if size:
+        info.append("　".join(size))
+    return info
+
+
+# ── 職務経歴書 (HTML) ──
+
+
+def _text(text: str) -> str:
+    """Escape multi-line text, keeping line breaks (same as <br/> in the PDF)."""
+    return escape(text.strip()).replace("\n", "<br>")
+
+
+def _html_items(items: list[str]) -> str:
+    return "<br>".join(f"・{escape(i)}" for i in items)
+
+
+def _period_html(period: str) -> str:
+    return escape(period).replace("～", "<br>～<br>", 1)
+
+
+def _env_html(project: _ProjectBase | SideProject) -> str:
+    if project.abbreviate_env:
+        return "同環境のため省略"
+    return "<br>".join(
+        f"◆ {label}<br>" + "<br>".join(escape(i) for i in items)
+        for label, items in project.environment.categories() if items
+    )
+
+
+def _team_html(project: _ProjectBase | SideProject) -> str:
+    return "<br>".join(escape(p) for p in (project.team_size, project.role) if p)
+
+
+_PROJECT_HEAD = "<tr><th>期間</th><th>内容</th><th>開発環境</th><th>規模</th></tr>"
+
+
+def _project_row(period: str, content: str, project: _ProjectBase | SideProject) -> str:
+    return (
+        f"<tr><td>{_period_html(period)}</td><td>{content}</td>"
+        f"<td>{_env_html(project)}</td><td>{_team_html(project)}</td></tr>"
+    )
+
+
+def _company_html(company: _CompanyBase) -> list[str]:
+    out = ['<div class="company">', f"<h3>{escape(company.period)}　{escape(company.company)}</h3>"]
+    out.append(
+        f'<table><tr><td style="width:79%">{"<br>".join(escape(i) for i in _company_info(company))}</td>'
+        f"<td>{escape(company.employment_type)}</td></tr></table>"
+    )
+    for project in company.projects:
+        blocks = [f"<b>{escape(_project_title(project))}</b>"]
+        blocks += [
+            f"◆ {label}<br>" + "<br>".join(escape(line) for line in lines)
+            for label, lines in _project_blocks(project)
+        ]
+        out.append(f"<table>{_PROJECT_HEAD}{_project_row(project.period, '<br><br>'.join(blocks), project)}</table>")
+    if company.other_activities:
+        out.append(
+            "<table><tr><th>その他取り組み内容</th></tr>"
+            f"<tr><td>{_html_items(company.other_activities)}</td></tr></table>"
+        )
+    out.append("</div>")
+    return out
+
+
+def _side_company_html(company: SideCompany) -> list[str]:
+    header = f"{escape(company.period)}　{escape(company.company)}"
+    if company.employment_type:
+        header += f"（{escape(company.employment_type)}）"
+    out = ['<div class="company">', f"<h3>{header}</h3>"]
+    if company.projects:
+        rows = []
+        for project in company.projects:
+            content = f"<b>{escape(project.name)}</b>"
+            if project.description:
+                content += f"<br>{_text(project.description)}"
+            rows.append(_project_row(project.period, content, project))
+        out.append(f"<table>{_PROJECT_HEAD}{''.join(rows)}</table>")
+    out.append("</div>")
+    return out
+
+
+def _work_history_html(data: _WorkHistoryBase) -> str:
+    # Same order as work_history.builder._build_elements
+    out = [
+        "<h1>職 務 経 歴 書</h1>",
+        f'<p class="right">{escape(data.date)}</p>',
+        f'<p class="right">{escape(data.name)}</p>',
+    ]
+    if data.summary:
+        out += ["<h2>■職務要約</h2>", f"<p>{_text(data.summary)}</p>"]
+    if data.highlights:
+        out.append("<h2>■活かせる経験・知識・技術</h2>")
+        out += [f"<p>・{escape(h)}</p>" for h in data.highlights]
+    if data.experience:
+        out.append("<h2>■職務経歴</h2>")
+        for company in data.experience:
+            out += _company_html(company)
+    if data.side_experience:
+        out.append("<h2>■副業・その他経歴</h2>")
+        for side in data.side_experience:
+            out += _side_company_html(side)
+    if data.technical_skills:
+        out += ["<h2>■テクニカルスキル</h2>", "<table>",
+                "<tr><th>種類</th><th>名称</th><th>使用期間</th><th>レベル</th></tr>"]
+        for cat in data.technical_skills:
+            for i, item in enumerate(cat.items):
+                head = f'<th rowspan="{len(cat.items)}">{escape(cat.category)}</th>' if i == 0 else ""
+                out.append(
+                    f"<tr>{head}<td>{escape(item.name)}</td><td>{escape(item.period)}</td>"
+                    f"<td>{escape(item.level)}</td></tr>"
+                )
+        out.append("</table>")
+    if data.qualifications:
+        out += ["<h2>■資格</h2>", "<table>"]
+        out += [f"<tr><td>{escape(q.name)}</td><td>{escape(q.date)}</td></tr>" for q in data.qualifications]
+        out.append("</table>")
+    if data.self_pr:
+        out.append("<h2>■自己PR</h2>")
+        for pr in data.self_pr:
+            out += [f"<h2>＜{escape(pr.title)}＞</h2>", f"<p>{_text(pr.content)}</p>"]
+    out.append('<p class="right">以上</p>')
+    return "\n".join(out)
+
+
+# ── 職務経歴書 (Markdown) ──
+
+
+def _md(text: str) -> str:
+    """Escape text for Markdown: renderers pass inline HTML through."""
+    return escape(text, quote=False)
+
+
+def _md_text(text: str) -> str:
+    """Escape multi-line text, keeping line breaks (hard breaks)."""
+    return _md(text.strip()).replace("\n", "  \n")
+
+
+def _md_cell(text: str) -> str:
+    """Escape text for a pipe table cell."""
+    return _md(text).replace("|", "\\|").replace("\n", " ")
+
+
+def _md_project(period: str, title: str, project: _ProjectBase | SideProject) -> list[str]:
+    out = [f"#### {_md(period)}　{_md(title)}", ""]
+    team = " / ".join(_md(p) for p in (project.team_size, project.role) if p)
+    if team:
+        out += [f"規模：{team}", ""]
+    if isinstance(project, _ProjectBase):
+        for label, lines in _project_blocks(project):
+            out += [f"**◆ {label}**", "", "  \n".join(_md(line) for line in lines), ""]
+    elif project.description:
+        out += [_md_text(project.description), ""]
+    if project.abbreviate_env:
+        out += ["**◆ 開発環境**：同環境のため省略", ""]
+    else:
+        env = [
+            f"- {label}：{', '.join(_md(i) for i in items)}"
+            for label, items in project.environment.categories() if items
+        ]
+        if env:
+            out += ["**◆ 開発環境**", "", *env, ""]
+    return out
+
+
+def _work_history_markdown(data: _WorkHistoryBase) -> list[str]:
+    out = ["# 職務経歴書", "", _md(data.date), "", _md(data.name), ""]
+    if data.summary:
+        out += ["## ■職務要約", "", _md_text(data.summary), ""]
+    if data.highlights:
+        out += ["## ■活かせる経験・知識・技術", "", *(f"- {_md(h)}" for h in data.highlights), ""]
+    if data.experience:
+        out += ["## ■職務経歴", ""]
+        for company in data.experience:
+            out += [f"### {_md(company.period)}　{_md(company.company)}", ""]
+            info = _company_info(company)
+            if info:
+                out += ["  \n".join(_md(i) for i in info), ""]
+            if company.employment_type:
+                out += [_md(company.employment_type), ""]
+            for project in company.projects:
+                out += _md_project(project.period, _project_title(project), project)
+            if company.other_activities:
+                out += ["**その他取り組み内容**", "", *(f"- {_md(a)}" for a in company.other_activities), ""]
+    if data.side_experience:
+        out += ["## ■副業・その他経歴", ""]
+        for side in data.side_experience:
+            header = f"{_md(side.period)}　{_md(side.company)}"
+            if side.employment_type:
+                header += f"（{_md(side.employment_type)}）"
+            out += [f"### {header}", ""]
+            for project in side.projects:
+                out += _md_project(project.period, project.name, project)
+    if data.technical_skills:
+        out += ["## ■テクニカルスキル", "", "| 種類 | 名称 | 使用期間 | レベル |", "|---|---|---|---|"]
+        for cat in data.technical_skills:
+            for i, item in enumerate(cat.items):
+                category = _md_cell(cat.category) if i == 0 else ""
+                out.append(
+                    f"| {category} | {_md_cell(item.name)} | {_md_cell(item.period)} | {_md_cell(item.level)} |"
+                )
+        out.append("")
+    if data.qualifications:
+        out += ["## ■資格", "", "| 資格 | 取得 |", "|---|---|"]
+        out += [f"| {_md_cell(q.name)} | {_md_cell(q.date)} |" for q in data.qualifications]
+        out.append("")
+    if data.self_pr:
+        out += ["## ■自己PR", ""]
+        for pr in data.self_pr:
+            out += [f"### ＜{_md(pr.title)}＞", "", _md_text(pr.content), ""]
+    out += ["以上"]
+    return out
+
+
+# ── 履歴書 ──
+
+
+def _history_html(title: str, entries: list[HistoryEntry]) -> str:
+    rows = "".join(
+        f"<tr><td>{escape(e.year)}</td><td>{escape(e.month)}</td><td>{escape(e.value)}</td></tr>"
+        for e in entries
+    )
+    return (
+        '<table><tr><th style="width:11%">年</th><th style="width:7%">月</th>'
+        f"<th>{title}</th></tr>{rows}</table>"
+    )
+
+
+def _resume_entries(data: Resume) -> list[HistoryEntry]:
+    # Same merge as resume.builder._draw_page1
+    return [
+        HistoryEntry(value="学　歴"), *data.education,
+        HistoryEntry(value="職　歴"), *data.experience,
+    ]
+
+
+def _resume_html(data: Resume) -> str:
+    out = ["<h1>履　歴　書</h1>", f'<p class="right">{escape(data.date)}</p>']
+    if data.photo:
+        out.append(f'<img src="{escape(data.photo)}" alt="写真" style="float:right;width:30mm;height:40mm">')
+    personal = [
+        ("ふりがな", data.name_kana),
+        ("氏　　名", data.name),
+        ("生年月日", data.birth_day),
+        ("性別", data.gender),
+        ("携帯電話番号", data.cell_phone),
+        ("E-MAIL", data.email),
+        ("ふりがな", data.address_kana),
+        ("現住所 〒", f"{data.address_zip} {data.address}".strip()),
+        ("電話 / FAX", " / ".join(p for p in (data.tel, data.fax) if p)),
+        ("ふりがな", data.address_kana2),
+        ("連絡先 〒", f"{data.address_zip2} {data.address2}".strip()),
+        ("電話 / FAX", " / ".join(p for p in (data.tel2, data.fax2) if p)),
+    ]
+    out.append("<table>")
+    out += [f'<tr><th style="width:18%">{k}</th><td>{escape(v)}</td></tr>' for k, v in personal]
+    out.append("</table><br>")
+    out += [_history_html("学歴・職歴（各項目ごとにまとめて書く）", _resume_entries(data)), "<br>"]
+    out += [_history_html("免許・資格", data.licences), "<br>"]
+    out.append(
+        "<table><tr><th>通勤時間</th><th>扶養家族（配偶者を除く）</th><th>配偶者</th><th>配偶者の扶養義務</th></tr>"
+        f"<tr><td>{escape(data.commuting_time)}</td><td>{escape(data.dependents)}</td>"
+        f"<td>{escape(data.spouse)}</td><td>{escape(data.supporting_spouse)}</td></tr></table><br>"
+    )
+    for label, text in (("趣味・特技", data.hobby), ("志望動機", data.motivation), ("本人希望記入欄", data.request)):
+        out.append(f'<div class="box"><b>{label}</b>\n{escape(text.strip())}</div>')
+    return "\n".join(out)
+
+
+def _md_history(title: str, entries: list[HistoryEntry]) -> list[str]:
+    out = [f"| 年 | 月 | {title} |", "|---|---|---|"]
+    out += [f"| {_md_cell(e.year)} | {_md_cell(e.month)} | {_md_cell(e.value)} |" for e in entries]
+    return out + [""]
+
+
+def _resume_markdown(data: Resume) -> list[str]:
+    out = ["# 履歴書", "", _md(data.date), ""]
+    fields = [
+        ("ふりがな", data.name_kana), ("氏名", data.name), ("生年月日", data.birth_day),
+        ("性別", data.gender), ("携帯電話番号", data.cell_phone), ("E-MAIL", data.email),
+        ("現住所", f"〒{data.address_zip} {data.address}（{data.address_kana}）" if data.address else ""),
+        ("電話 / FAX", " / ".join(p for p in (data.tel, data.fax) if p)),
+        ("連絡先", f"〒{data.address_zip2} {data.address2}（{data.address_kana2}）" if data.address2 else ""),
+        ("連絡先 電話 / FAX", " / ".join(p for p in (data.tel2, data.fax2) if p)),
+    ]
+    out += [f"- {k}：{_md(v)}" for k, v in fields if v] + [""]
+    out += ["## 学歴・職歴", "", *_md_history("学歴・職歴", _resume_entries(data))]
+    out += ["## 免許・資格", "", *_md_history("免許・資格", data.licences)]
+    out += [
+        f"- 通勤時間：{_md(data.commuting_time)}",
+        f"- 扶養家族（配偶者を除く）：{_md(data.dependents)}",
+        f"- 配偶者：{_md(data.spouse)}",
+        f"- 配偶者の扶養義務：{_md(data.supporting_spouse)}",
+        "",
+    ]
+    for label, text in (("趣味・特技", data.hobby), ("志望動機", data.motivation), ("本人希望記入欄", data.request)):
+        out += [f"## {label}", "", _md_text(text), ""]
+    return out
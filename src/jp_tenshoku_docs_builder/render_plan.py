@@ -0,0 +1,369 @@
+"""Render plans: a laid-out document as replayable drawing calls.
+
+Producing a PDF fuses two costs: laying the document out (Platypus
+wrapping and splitting for the 職務経歴書, text fitting for the 履歴書) and
+writing the drawing operations as PDF. A RenderPlan keeps what layout
+decided: for each page, the positioned drawing calls (text runs, lines,
+rects, images and the graphics state around them) in the order they were
+made. paint_pdf writes a plan to PDF without laying anything out, so a
+document whose PDF options change (compression, metadata) can be
+re-emitted cheaply, and replay() drives any object with the canvas
+drawing methods, so a plan can be painted to another backend.
+
+PlanRecorder is the canvas that records a plan. It records the calls that
+reach the ReportLab Canvas itself: placed below a canvas subclass that
+rewrites calls (StateTrackingCanvas eliding redundant state, the resume's
+fallback-font canvas splitting strings into runs), it sees the calls as
+they are finally drawn. A plan recorded under a StateTrackingCanvas is
+painted with one, since that canvas also shortens the text objects it
+creates itself; painting then writes the same content as the original
+render. Plans serialise to JSON (images embedded as base64); the fonts
+they use must be registered (register_fonts) before painting.
+"""
+
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import json
+from dataclasses import dataclass, field
+from io import BytesIO
+
+from reportlab.lib.colors import CMYKColor, Color
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen.canvas import Canvas
+
+from jp_tenshoku_docs_builder.resume.canvas import StateTrackingCanvas
+
+PLAN_VERSION = 1
+
+# Canvas methods that draw or change drawing state. Everything else
+# (measuring, page callbacks, saving) is not part of a plan.
+_CANVAS_METHODS = (
+    "saveState", "restoreState", "translate", "scale", "rotate", "skew", "transform",
+    "setFont", "setFontSize", "setLineWidth", "setLineCap", "setLineJoin", "setMiterLimit", "setDash",
+    "setFillColor", "setStrokeColor", "setFillColorRGB", "setStrokeColorRGB", "setFillGray", "setStrokeGray",
+    "setFillAlpha", "setStrokeAlpha",
+    "line", "lines", "rect", "roundRect", "circle", "ellipse", "wedge", "arc", "grid",
+    "drawString", "drawRightString", "drawCentredString", "drawAlignedString",
+    "beginText", "drawText", "beginPath", "drawPath", "clipPath",
+    "setPageSize", "setPageRotation", "bookmarkPage", "addOutlineEntry", "linkURL", "linkRect",
+)
+
+# Canvas classes a plan is painted with, by RenderPlan.canvas
+_PAINTERS: dict[str, type[Canvas]] = {"pdf": Canvas, "state_tracking": StateTrackingCanvas}
+
+# Document information set through Canvas.setTitle etc.
+_METADATA = ("title", "author", "subject", "creator", "producer", "keywords")
+
+# An op is [target, method, args, kwargs, result]: target is None for the
+# canvas or the id of a text/path object; result is the id given to the
+# object a beginText/beginPath call returned.
+Op = list
+
+
+@dataclass
+class RenderPlan:
+    """Drawing calls per page, plus what is needed to paint them."""
+
+    pagesize: tuple[float, float]
+    initial_font: tuple[str, float, float]  # name, size, leading
+    canvas: str = "pdf"  # key of _PAINTERS
+    pages: list[list[Op]] = field(default_factory=list)
+    images: dict[str, bytes] = field(default_factory=dict)  # digest -> encoded image
+    fonts: list[str] = field(default_factory=list)
+    metadata: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": PLAN_VERSION,
+            "pagesize": list(self.pagesize),
+            "initial_font": list(self.initial_font),
+            "canvas": self.canvas,
+            "pages": self.pages,
+            "images": {k: base64.b64encode(v).decode("ascii") for k, v in self.images.items()},
+            "fonts": self.fonts,
+            "metadata": self.metadata,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_dict(cls, d: dict) -> RenderPlan:
+        if d.get("version") != PLAN_VERSION:
+            raise ValueError(f"unsupported render plan version: {d.get('version')}")
+        return cls(
+            pagesize=tuple(d["pagesize"]),
+            initial_font=tuple(d["initial_font"]),
+            canvas=d["canvas"],
+            pages=d["pages"],
+            images={k: base64.b64decode(v) for k, v in d["images"].items()},
+            fonts=d["fonts"],
+            metadata=d["metadata"],
+        )
+
+    @classmethod
+    def from_json(cls, text: str | bytes) -> RenderPlan:
+        return cls.from_dict(json.loads(text))
+
+
+def _encode(value):
+    """JSON form of a drawing-call argument; TypeError if it has none."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, _Recorded):
+        return {"ref": value._ref}
+    if type(value) is Color:
+        return {"rgb": [value.red, value.green, value.blue, value.alpha]}
+    if type(value) is CMYKColor:
+        return {"cmyk": [value.cyan, value.magenta, value.yellow, value.black, value.alpha]}
+    raise TypeError(f"cannot record {type(value).__name__} in a render plan: {value!r}")
+
+
+def _encode_kwargs(kwargs: dict) -> dict:
+    return {k: _encode(v) for k, v in kwargs.items()}
+
+
+def _decode(value, objects: dict):
+    if isinstance(value, list):
+        return [_decode(v, objects) for v in value]
+    if isinstance(value, dict):
+        if "ref" in value:
+            return objects[value["ref"]]
+        if "rgb" in value:
+            return Color(*value["rgb"])
+        return CMYKColor(*value["cmyk"])
+    return value
+
+
+def _unwrap(value):
+    return value._target if isinstance(value, _Recorded) else value
+
+
+class _Recorded:
+    """Proxy for a text or path object that records the calls made on it.
+
+    Calls the object makes on itself are not seen, so only the calls the
+    caller made are replayed. Attributes set by the caller are recorded
+    when they have a JSON form; others (Paragraph's bookkeeping such as
+    XtraState) only matter to the code that set them.
+    """
+
+    __slots__ = ("_target", "_recorder", "_ref")
+
+    def __init__(self, target, recorder: PlanRecorder, ref: int):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_recorder", recorder)
+        object.__setattr__(self, "_ref", ref)
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        method = getattr(type(self._target), name, None)
+        if not callable(method) or name.startswith("get"):
+            return value  # plain attributes, getters and functions set on the instance
+
+        def call(*args, **kwargs):
+            self._recorder._record(self._ref, name, args, kwargs)
+            return value(*args, **kwargs)
+
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+        try:
+            encoded = _encode(value)
+        except TypeError:
+            return
+        self._recorder._plan_ops.append([self._ref, "__setattr__", [name, encoded], {}, None])
+
+    def __delattr__(self, name):
+        delattr(self._target, name)
+        self._recorder._plan_ops.append([self._ref, "__delattr__", [name], {}, None])
+
+
+class PlanRecorder(Canvas):
+    """Canvas that records a RenderPlan instead of writing a PDF.
+
+    save() finishes the plan (self.plan) and writes nothing. Use
+    recording(canvas_class) to record below a Canvas subclass.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._plan_depth = 0
+        self._plan_ops: list[Op] = []
+        self._plan_refs = 0
+        self._plan_fonts: set[str] = set()
+        kwargs["pageCompression"] = 0  # the page streams are never written
+        super().__init__(*args, **kwargs)
+        self.plan = RenderPlan(
+            pagesize=tuple(self._pagesize),
+            initial_font=(self._initialFontName, self._initialFontSize, self._initialLeading),
+            canvas="state_tracking" if isinstance(self, StateTrackingCanvas) else "pdf",
+        )
+
+    def _record(self, target, name: str, args, kwargs, result=None) -> None:
+        if name in ("setFont", "_setFont"):
+            self._plan_fonts.add(args[0] if args else kwargs["psfontname"])
+        self._plan_ops.append([target, name, _encode(args), _encode_kwargs(kwargs), result])
+
+    def drawImage(self, image, *args, **kwargs):
+        if self._plan_depth:
+            return super().drawImage(image, *args, **kwargs)
+        if isinstance(image, ImageReader):
+            if image.fp is None:
+                raise TypeError("cannot record an ImageReader without its encoded data")
+            position = image.fp.tell()
+            image.fp.seek(0)
+            data = image.fp.read()
+            image.fp.seek(position)
+        else:
+            with open(image, "rb") as f:
+                data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        self.plan.images[digest] = data
+        self._plan_ops.append([None, "drawImage", [{"image": digest}, *_encode(args)], _encode_kwargs(kwargs), None])
+        self._plan_depth += 1
+        try:
+            return super().drawImage(image, *args, **kwargs)
+        finally:
+            self._plan_depth -= 1
+
+    def _set_metadata(self, key: str, value) -> None:
+        if not self._plan_depth:
+            self.plan.metadata[key] = _encode(value)
+
+    def setTitle(self, title):
+        self._set_metadata("title", title)
+        super().setTitle(title)
+
+    def setAuthor(self, author):
+        self._set_metadata("author", author)
+        super().setAuthor(author)
+
+    def setSubject(self, subject):
+        self._set_metadata("subject", subject)
+        super().setSubject(subject)
+
+    def setCreator(self, creator):
+        self._set_metadata("creator", creator)
+        super().setCreator(creator)
+
+    def setProducer(self, producer):
+        self._set_metadata("producer", producer)
+        super().setProducer(producer)
+
+    def setKeywords(self, keywords):
+        self._set_metadata("keywords", keywords)
+        super().setKeywords(keywords)
+
+    def showPage(self):
+        if not self._plan_depth:
+            self.plan.pages.append(self._plan_ops)
+            self._plan_ops = []
+        self._plan_depth += 1
+        try:
+            super().showPage()
+        finally:
+            self._plan_depth -= 1
+
+    def save(self):
+        if len(self._code):
+            self.showPage()
+        self.plan.fonts = sorted(self._plan_fonts)
+
+
+def _recorded_method(name: str):
+    def method(self, *args, **kwargs):
+        base = getattr(super(PlanRecorder, self), name)
+        if self._plan_depth:
+            return base(*args, **kwargs)
+        result = None
+        if name in ("beginText", "beginPath"):
+            result = self._plan_refs = self._plan_refs + 1
+        self._record(None, name, args, kwargs, result)
+        self._plan_depth += 1
+        try:
+            value = base(*map(_unwrap, args), **{k: _unwrap(v) for k, v in kwargs.items()})
+        finally:
+            self._plan_depth -= 1
+        return _Recorded(value, self, result) if result is not None else value
+
+    method.__name__ = name
+    return method
+
+
+for _name in _CANVAS_METHODS:
+    setattr(PlanRecorder, _name, _recorded_method(_name))
+
+
+@functools.cache
+def recording(canvas_class: type[Canvas]) -> type[PlanRecorder]:
+    """canvas_class recording a plan of the calls it makes on Canvas."""
+    if canvas_class is Canvas:
+        return PlanRecorder
+    return type(f"Recording{canvas_class.__name__}", (canvas_class, PlanRecorder), {})
+
+
+def replay(plan: RenderPlan, canvas) -> None:
+    """Issue the plan's drawing calls on canvas, calling showPage after each page.
+
+    canvas may be any object with the Canvas drawing methods the plan uses;
+    images are passed to drawImage as ImageReader objects.
+    """
+    objects: dict[int, object] = {}
+    for page in plan.pages:
+        for target, name, args, kwargs, result in page:
+            if name == "drawImage":
+                image = ImageReader(BytesIO(plan.images[args[0]["image"]]))
+                args = [image, *_decode(args[1:], objects)]
+            else:
+                args = _decode(args, objects)
+            kwargs = {k: _decode(v, objects) for k, v in kwargs.items()}
+            value = getattr(canvas if target is None else objects[target], name)(*args, **kwargs)
+            if result is not None:
+                objects[result] = value
+        canvas.showPage()
+        objects.clear()
+
+
+def paint_pdf(plan: RenderPlan, compression: bool | None = None, metadata: dict | None = None) -> bytes:
+    """Write a plan as PDF bytes without laying anything out.
+
+    compression: compress page streams (None: the ReportLab default).
+    metadata: document information overriding the recorded values, with
+        keys title, author, subject, creator, producer and keywords.
+    """
+    missing = []
+    for name in plan.fonts:
+        try:
+            pdfmetrics.getFont(name)
+        except KeyError:
+            missing.append(name)
+    if missing:
+        raise ValueError(f"fonts used by the plan are not registered: {', '.join(missing)}")
+    info = {**plan.metadata, **(metadata or {})}
+    unknown = set(info) - set(_METADATA)
+    if unknown:
+        raise ValueError(f"unknown metadata keys: {', '.join(sorted(unknown))}")
+
+    buffer = BytesIO()
+    font, size, leading = plan.initial_font
+    canvas = _PAINTERS[plan.canvas](
+        buffer,
+        pagesize=plan.pagesize,
+        pageCompression=compression,
+        initialFontName=font,
+        initialFontSize=size,
+        initialLeading=leading,
+    )
+    for key in _METADATA:
+        if key in info:
+            getattr(canvas, f"set{key.capitalize()}")(info[key])
+    replay(plan, canvas)
+    canvas.save()
+    return buffer.getvalue()
@@ -6,14 +6,23 @@ A4 page, coordinate system: origin at bottom-left, units in mm.
 
 from __future__ import annotations
 
+from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas as canvas_module
 
+from jp_tenshoku_docs_builder.coverage import split_runs
 from jp_tenshoku_docs_builder.fonts import FontConfig, register_fonts
+from jp_tenshoku_docs_builder.memprofile import note, phase
+from jp_tenshoku_docs_builder.metrics import glyph_widths
+from jp_tenshoku_docs_builder.render_plan import RenderPlan, recording
+from jp_tenshoku_docs_builder.resume.canvas import RenderStats, StateTrackingCanvas
 from jp_tenshoku_docs_builder.resume.models import HistoryEntry, Resume
+from jp_tenshoku_docs_builder.resume.photo import DEFAULT_DPI, prepare_photo
 
 # A4 dimensions in mm
 _PW = 210  # page width
@@ -30,9 +39,116 @@ _FS_LARGE = 12
 _FS_NORMAL = 9
 _FS_SMALL = 8
 
+# Note right-aligned on the 連絡先 〒 row, after address_zip2
+_CONTACT_NOTE = "（現住所以外に連絡を希望する場合のみ記入）"
+_CONTACT_NOTE_RIGHT = 137
+
+# Photo box (bottom-left at x=145, y=204)
+_PHOTO_W = 30
+_PHOTO_H = 40
+
 # Row height for history tables
 _ROW_H = 7
 
+# Table rows including the column header row
+_HISTORY_TABLE_ROWS = 16  # 学歴・職歴 (page 1)
+_LICENCE_TABLE_ROWS = 6   # 免許・資格 (page 2)
+
+# Free-text boxes on page 2 (趣味・特技 / 志望動機 / 本人希望記入欄)
+_TEXTBOX_W = 173
+_TEXTBOX_H = 28
+_TEXTBOX_LEADING = 1.5  # line height as a multiple of the font size
+
+# Single-line fields: field -> (x, baseline y, right edge of the cell, font
+# size). _draw_cell draws them here and check.py measures them against the
+# same cells.
+_CELLS: dict[str, tuple[float, float, float, float]] = {
+    # Page 1
+    "date": (110, 245, _CW, _FS_NORMAL),
+    "name_kana": (30, 235, 139, _FS_NORMAL),
+    "name": (30, 224, 139, _FS_TITLE),
+    "birth_day": (30, 210, 110, _FS_LARGE),
+    "gender": (121, 210, 139, _FS_LARGE),
+    "cell_phone": (25, 201, 56, _FS_NORMAL),
+    "email": (75, 201, 139, _FS_NORMAL),
+    "address_kana": (20, 194, 139, _FS_NORMAL),
+    "address_zip": (16, 188, 139, _FS_NORMAL),
+    "address_kana2": (20, 168, 139, _FS_NORMAL),
+    # Ends where the right-aligned contact note starts (all its glyphs are
+    # full-width, one em each)
+    "address_zip2": (16, 162, _CONTACT_NOTE_RIGHT - len(_CONTACT_NOTE) * _FS_SMALL / mm, _FS_NORMAL),
+    "tel": (143, 190, _CW, _FS_NORMAL),
+    "fax": (143, 177, _CW, _FS_NORMAL),
+    "tel2": (143, 164, _CW, _FS_NORMAL),
+    "fax2": (143, 151, _CW, _FS_NORMAL),
+    # Page 2
+    "commuting_time": (5, 171, 57, _FS_LARGE),
+    "dependents": (85, 171, 97, _FS_LARGE),
+    "spouse": (116, 171, 137, _FS_LARGE),
+    "supporting_spouse": (155, 171, _CW, _FS_LARGE),
+}
+
+# Address fields wrapped onto up to two lines: field -> (x, baseline y of
+# the first line, max width), drawn at _FS_LARGE
+_ADDRESSES: dict[str, tuple[float, float, float]] = {
+    "address": (15, 182, 122),
+    "address2": (15, 156, 122),
+}
+
+# History table columns: year and month centres, start of the value column
+# (which runs to the table edge at _CW)
+_HISTORY_YEAR_X = 9.5
+_HISTORY_MONTH_X = 25
+_HISTORY_VALUE_X = 35
+
+
+class _FallbackCanvas(StateTrackingCanvas):
+    """Canvas that draws characters missing from the current font with a fallback font."""
+
+    def __init__(self, *args, fallback: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fallback = fallback
+
+    def _runs(self, text: str) -> list[tuple[str, str]]:
+        return split_runs(text, self._fontname, self._fallback)
+
+    def _runs_width(self, runs: list[tuple[str, str]], charSpace: float = 0, wordSpace: float | None = None) -> float:
+        """Advance of the runs, with the spacing drawString adds after every glyph / space."""
+        width = 0.0
+        for font, run in runs:
+            width += self.stringWidth(run, font, self._fontsize) + len(run) * charSpace
+            if wordSpace:
+                width += (run.count(" ") + run.count("\xa0")) * wordSpace
+        return width
+
+    def drawString(self, x, y, text, mode=None, charSpace=0, direction=None, wordSpace=None, shaping=False):
+        runs = self._runs(text)
+        if len(runs) <= 1 and (not runs or runs[0][0] == self._fontname):
+            return super().drawString(x, y, text, mode, charSpace, direction, wordSpace, shaping)
+        font, size, leading = self._fontname, self._fontsize, self._leading
+        for run_font, run in runs:
+            self.setFont(run_font, size, leading)
+            super().drawString(x, y, run, mode, charSpace, direction, wordSpace, shaping)
+            x += self._runs_width([(run_font, run)], charSpace, wordSpace)
+        self.setFont(font, size, leading)
+
+    def _aligned_width(self, text: str, charSpace: float, wordSpace: float | None) -> float:
+        """Width reportlab aligns on: no spacing after the last glyph / space."""
+        width = self._runs_width(self._runs(text), charSpace, wordSpace)
+        if charSpace and text:
+            width -= charSpace
+        if wordSpace and (" " in text or "\xa0" in text):
+            width -= wordSpace
+        return width
+
+    def drawRightString(self, x, y, text, mode=None, charSpace=0, direction=None, wordSpace=None, shaping=False):
+        x -= self._aligned_width(text, charSpace, wordSpace)
+        self.drawString(x, y, text, mode, charSpace, direction, wordSpace, shaping)
+
+    def drawCentredString(self, x, y, text, mode=None, charSpace=0, direction=None, wordSpace=None, shaping=False):
+        x -= self._aligned_width(text, charSpace, wordSpace) / 2
+        self.drawString(x, y, text, mode, charSpace, direction, wordSpace, shaping)
+
 
 def _x(v: float) -> float:
     """Convert content-relative x (mm) to absolute page x (points)."""
@@ -54,6 +170,19 @@ def _draw_string(c: canvas_module.Canvas, x_mm: float, y_mm: float, text: str,
     c.drawString(_x(x_mm), _y(y_mm), text)
 
 
+def _draw_cell(c: canvas_module.Canvas, data: Resume, field: str, font_name: str) -> None:
+    """Draw a single-line field at its _CELLS position."""
+    x, y, _, font_size = _CELLS[field]
+    _draw_string(c, x, y, getattr(data, field), font_size, font_name)
+
+
+def _draw_address(c: canvas_module.Canvas, data: Resume, field: str, font_name: str) -> None:
+    """Draw an address field at its _ADDRESSES position."""
+    x, y, max_width = _ADDRESSES[field]
+    _draw_wrapped_string(c, x, y, getattr(data, field), max_width_mm=max_width,
+                         font_size=_FS_LARGE, font_name=font_name)
+
+
 def _draw_line(c: canvas_module.Canvas, x1: float, y1: float, x2: float, y2: float,
                dashed: bool = False, line_width: float = 0.5) -> None:
     """Draw a line at content-relative coordinates."""
@@ -82,48 +211,47 @@ def _draw_wrapped_string(c: canvas_module.Canvas, x_mm: float, y_mm: float,
         c.setFont(font_name, font_size)
     else:
         c.setFontSize(font_size)
-    max_width_pt = max_width_mm * mm
-    text_width = c.stringWidth(text, c._fontname, c._fontsize)
-    if text_width <= max_width_pt:
+    first_line, second_line = glyph_widths(c._fontname).split(
+        text, c._fontsize, max_width_mm * mm)
+    if not second_line:
         c.drawString(_x(x_mm), _y(y_mm), text)
         return
-    # Find the last space that fits within max_width
-    last_space = -1
-    for i, ch in enumerate(text):
-        partial = text[:i + 1]
-        if c.stringWidth(partial, c._fontname, c._fontsize) > max_width_pt:
-            break
-        if ch in (" ", "\u3000"):  # half-width or full-width space
-            last_space = i
-    if last_space > 0:
-        first_line = text[:last_space]
-        second_line = text[last_space + 1:]
-    else:
-        # No space found; hard-break at the overflow point
-        for i in range(len(text), 0, -1):
-            if c.stringWidth(text[:i], c._fontname, c._fontsize) <= max_width_pt:
-                first_line = text[:i]
-                second_line = text[i:]
-                break
     leading_mm = font_size * 1.4 / (72 / 25.4)  # points to mm
     c.drawString(_x(x_mm), _y(y_mm), first_line)
     c.drawString(_x(x_mm), _y(y_mm - leading_mm), second_line)
 
 
+def _textbox_lines(text: str, font_name: str, font_size: float, w: float) -> list[str]:
+    """Split text into the lines _draw_textbox draws (explicit breaks, then wrapping)."""
+    widths = glyph_widths(font_name)
+    return [
+        wrapped
+        for line in text.strip().split("\n")
+        for wrapped in widths.wrap(line.strip(), font_size, w * mm)
+    ]
+
+
+def _textbox_capacity(h: float, font_size: float) -> int:
+    """Number of lines that fit in a textbox of height h (mm)."""
+    return int(h / (font_size * _TEXTBOX_LEADING / mm)) + 1
+
+
 def _draw_textbox(c: canvas_module.Canvas, x: float, y: float, w: float, h: float,
                   text: str, font_size: float = _FS_LARGE, font_name: str | None = None) -> None:
-    """Draw multi-line text within a box area (top-down)."""
+    """Draw multi-line text within a box area (top-down).
+
+    Lines wider than the box are wrapped; text below the box is dropped
+    (see resume.check for detecting that up front).
+    """
     if font_name:
         c.setFont(font_name, font_size)
     else:
         c.setFontSize(font_size)
-    leading = font_size * 1.5
-    lines = text.strip().split("\n")
+    leading = font_size * _TEXTBOX_LEADING
+    lines = _textbox_lines(text, c._fontname, c._fontsize, w)
     cur_y = y
-    for line in lines:
-        if cur_y < (y - h):
-            break
-        c.drawString(_x(x), _y(cur_y), line.strip())
+    for line in lines[:_textbox_capacity(h, font_size)]:
+        c.drawString(_x(x), _y(cur_y), line)
         cur_y -= leading / mm
 
 
@@ -149,19 +277,32 @@ def _draw_history_rows(c: canvas_module.Canvas, entries: list[HistoryEntry],
         c.drawString(_x(value_x), _y(y), entry.value)
 
 
-def _draw_page1(c: canvas_module.Canvas, data: Resume, fonts: FontConfig) -> None:
-    """Draw page 1: header, personal info, address, education/experience table."""
+def _history_entries(data: Resume) -> list[HistoryEntry]:
+    """Merge education + experience with 「学歴」「職歴」 header rows."""
+    entries: list[HistoryEntry] = []
+    entries.append(HistoryEntry(value="学　歴"))
+    entries.extend(data.education)
+    entries.append(HistoryEntry(value="職　歴"))
+    entries.extend(data.experience)
+    return entries
+
+
+def _draw_page1(c: canvas_module.Canvas, data: Resume, fonts: FontConfig,
+                photo: str | ImageReader | None = None) -> None:
+    """Draw page 1: header, personal info, address, education/experience table.
+
+    photo is the prepared image (see resume.photo), or None for no photo.
+    """
 
     # ── ヘッダー ──
     c.setFont(fonts.gothic, _FS_TITLE)
     c.drawString(_x(5), _y(247), "履　歴　書")
-    c.setFont(fonts.mincho, _FS_NORMAL)
-    c.drawString(_x(110), _y(245), data.date)
+    _draw_cell(c, data, "date", fonts.mincho)
 
     # ── 写真エリア ──
     c.setDash(3, 3)
     c.setLineWidth(0.5)
-    c.rect(_x(145), _y(204), 30 * mm, 40 * mm)
+    c.rect(_x(145), _y(204), _PHOTO_W * mm, _PHOTO_H * mm)
     c.setDash()
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(148), _y(240), "写真を貼る位置")
@@ -173,11 +314,9 @@ def _draw_page1(c: canvas_module.Canvas, data: Resume, fonts: FontConfig) -> Non
     c.drawString(_x(147), _y(221), "4. 裏面に氏名記入")
 
     # Insert photo if specified
-    if data.photo:
-        photo_path = Path(data.photo)
-        if photo_path.exists():
-            c.drawImage(str(photo_path), _x(145), _y(204), 30 * mm, 40 * mm,
-                        preserveAspectRatio=True)
+    if photo is not None:
+        c.drawImage(photo, _x(145), _y(204), _PHOTO_W * mm, _PHOTO_H * mm,
+                    preserveAspectRatio=True)
 
     # ── 外枠 (L字型フレーム) ──
     # 氏名エリア(139mm幅) + 住所エリア(177mm幅) を一体の枠で描画
@@ -223,64 +362,60 @@ def _draw_page1(c: canvas_module.Canvas, data: Resume, fonts: FontConfig) -> Non
     # ふりがな row: y=240〜233 (7mm), vertically centered
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(2), _y(235), "ふりがな")
-    c.drawString(_x(30), _y(235), data.name_kana)
+    _draw_cell(c, data, "name_kana", fonts.mincho)
     c.drawString(_x(2), _y(228), "氏　　名")
     # 氏名データ: 行 y=233〜218 (15mm), 14ptフォントで垂直中央
-    c.setFont(fonts.mincho, _FS_TITLE)
-    c.drawString(_x(30), _y(224), data.name)
+    _draw_cell(c, data, "name", fonts.mincho)
 
     # ── テキスト: 生年月日・性別 ──
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(1.5), _y(210), "生年月日")
-    c.setFont(fonts.mincho, _FS_LARGE)
-    c.drawString(_x(30), _y(210), data.birth_day)
-    c.drawString(_x(121), _y(210), data.gender)
+    _draw_cell(c, data, "birth_day", fonts.mincho)
+    _draw_cell(c, data, "gender", fonts.mincho)
 
     # ── テキスト: 携帯電話・E-MAIL ──
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawCentredString(_x(11.5), _y(201), "携帯電話番号")
-    c.drawString(_x(25), _y(201), data.cell_phone)
+    _draw_cell(c, data, "cell_phone", fonts.mincho)
     c.drawCentredString(_x(63.5), _y(201), "E-MAIL")
-    c.drawString(_x(75), _y(201), data.email)
+    _draw_cell(c, data, "email", fonts.mincho)
 
     # ── テキスト: 現住所 ──
     # ふりがな row: y=199〜192 (7mm), vertically centered
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(2), _y(194), "ふりがな")
-    c.drawString(_x(20), _y(194), data.address_kana)
+    _draw_cell(c, data, "address_kana", fonts.mincho)
     c.drawString(_x(2), _y(188), "現住所 〒")
-    c.drawString(_x(16), _y(188), data.address_zip)
-    _draw_wrapped_string(c, 15, 182, data.address, max_width_mm=122,
-                         font_size=_FS_LARGE, font_name=fonts.mincho)
+    _draw_cell(c, data, "address_zip", fonts.mincho)
+    _draw_address(c, data, "address", fonts.mincho)
 
     # ── テキスト: 連絡先 ──
     # ふりがな row: y=173〜166 (7mm), vertically centered
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(2), _y(168), "ふりがな")
-    c.drawString(_x(20), _y(168), data.address_kana2)
+    _draw_cell(c, data, "address_kana2", fonts.mincho)
     c.drawString(_x(2), _y(162), "連絡先 〒")
-    c.drawString(_x(16), _y(162), data.address_zip2)
+    _draw_cell(c, data, "address_zip2", fonts.mincho)
     c.setFont(fonts.mincho, _FS_SMALL)
-    c.drawRightString(_x(137), _y(162), "（現住所以外に連絡を希望する場合のみ記入）")
-    _draw_wrapped_string(c, 15, 156, data.address2, max_width_mm=122,
-                         font_size=_FS_LARGE, font_name=fonts.mincho)
+    c.drawRightString(_x(_CONTACT_NOTE_RIGHT), _y(162), _CONTACT_NOTE)
+    _draw_address(c, data, "address2", fonts.mincho)
 
     # ── テキスト: 電話・FAX（右側） ──
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(141), _y(195), "電話")
-    c.drawString(_x(143), _y(190), data.tel)
+    _draw_cell(c, data, "tel", fonts.mincho)
     c.drawString(_x(141), _y(182), "FAX")
-    c.drawString(_x(143), _y(177), data.fax)
+    _draw_cell(c, data, "fax", fonts.mincho)
     c.drawString(_x(141), _y(169), "電話")
-    c.drawString(_x(143), _y(164), data.tel2)
+    _draw_cell(c, data, "tel2", fonts.mincho)
     c.drawString(_x(141), _y(156), "FAX")
-    c.drawString(_x(143), _y(151), data.fax2)
+    _draw_cell(c, data, "fax2", fonts.mincho)
 
     # ── 学歴・職歴テーブル ──
     table_top = 136
     table_bottom = 17
     table_h = table_top - table_bottom  # 119mm
-    num_rows = 16
+    num_rows = _HISTORY_TABLE_ROWS
 
     _draw_box(c, 0, table_bottom, _CW, table_h, line_width=2.0)
 
@@ -297,22 +432,15 @@ def _draw_page1(c: canvas_module.Canvas, data: Resume, fonts: FontConfig) -> Non
 
     # Column headers (center-aligned, vertically centered in 7mm row)
     c.setFont(fonts.mincho, _FS_NORMAL)
-    c.drawCentredString(_x(9.5), _y(table_top - 5), "年")
-    c.drawCentredString(_x(25), _y(table_top - 5), "月")
+    c.drawCentredString(_x(_HISTORY_YEAR_X), _y(table_top - 5), "年")
+    c.drawCentredString(_x(_HISTORY_MONTH_X), _y(table_top - 5), "月")
     c.drawString(_x(77), _y(table_top - 5), "学歴・職歴（各項目ごとにまとめて書く）")
 
-    # Merge education + experience with section headers
-    entries: list[HistoryEntry] = []
-    # 「学歴」header
-    entries.append(HistoryEntry(value="学　歴"))
-    entries.extend(data.education)
-    # 「職歴」header
-    entries.append(HistoryEntry(value="職　歴"))
-    entries.extend(data.experience)
+    entries = _history_entries(data)
 
     row_start_y = table_top - _ROW_H - 5  # first data row (font_size=12: ascent ~3.5mm)
     _draw_history_rows(c, entries, row_start_y, num_rows - 1,
-                       _ROW_H, 9.5, 25, 35,
+                       _ROW_H, _HISTORY_YEAR_X, _HISTORY_MONTH_X, _HISTORY_VALUE_X,
                        font_size=_FS_LARGE, font_name=fonts.mincho)
 
     # Footer note (テーブル下端 y=17 から少しマージンを空ける)
@@ -328,7 +456,7 @@ def _draw_page2(c: canvas_module.Canvas, data: Resume, fonts: FontConfig) -> Non
     table_top = 239
     table_bottom = 190
     table_h = table_top - table_bottom  # 49mm
-    num_rows = 6
+    num_rows = _LICENCE_TABLE_ROWS
 
     _draw_box(c, 0, table_bottom, _CW, table_h, line_width=2.0)
 
@@ -345,14 +473,14 @@ def _draw_page2(c: canvas_module.Canvas, data: Resume, fonts: FontConfig) -> Non
 
     # Headers (center-aligned, vertically centered in 7mm row)
     c.setFont(fonts.mincho, _FS_NORMAL)
-    c.drawCentredString(_x(9.5), _y(table_top - 5), "年")
-    c.drawCentredString(_x(25), _y(table_top - 5), "月")
+    c.drawCentredString(_x(_HISTORY_YEAR_X), _y(table_top - 5), "年")
+    c.drawCentredString(_x(_HISTORY_MONTH_X), _y(table_top - 5), "月")
     c.drawString(_x(90), _y(table_top - 5), "免許・資格")
 
     # Licence entries
     row_start_y = table_top - _ROW_H - 5
     _draw_history_rows(c, data.licences, row_start_y, num_rows - 1,
-                       _ROW_H, 9.5, 25, 35,
+                       _ROW_H, _HISTORY_YEAR_X, _HISTORY_MONTH_X, _HISTORY_VALUE_X,
                        font_size=_FS_LARGE, font_name=fonts.mincho)
 
     # ── 通勤時間・扶養家族・配偶者 ──
@@ -367,51 +495,97 @@ def _draw_page2(c: canvas_module.Canvas, data: Resume, fonts: FontConfig) -> Non
 
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(2), _y(178), "通勤時間")
-    c.setFont(fonts.mincho, _FS_LARGE)
-    c.drawString(_x(5), _y(171), data.commuting_time)
+    _draw_cell(c, data, "commuting_time", fonts.mincho)
 
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(59), _y(178), "扶養家族")
     c.drawString(_x(59), _y(171), "(配偶者を除く)")
-    c.setFont(fonts.mincho, _FS_LARGE)
-    c.drawString(_x(85), _y(171), data.dependents)
+    _draw_cell(c, data, "dependents", fonts.mincho)
 
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(99), _y(178), "配偶者")
-    c.setFont(fonts.mincho, _FS_LARGE)
-    c.drawString(_x(116), _y(171), data.spouse)
+    _draw_cell(c, data, "spouse", fonts.mincho)
 
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(139), _y(178), "配偶者の扶養義務")
-    c.setFont(fonts.mincho, _FS_LARGE)
-    c.drawString(_x(155), _y(171), data.supporting_spouse)
+    _draw_cell(c, data, "supporting_spouse", fonts.mincho)
 
     # ── 趣味・特技 ── (box: y=120 to 160)
     _draw_box(c, 0, 120, _CW, 40, line_width=2.0)
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(2), _y(156), "趣味・特技")
-    _draw_textbox(c, 2, 150, 173, 28, data.hobby,
+    _draw_textbox(c, 2, 150, _TEXTBOX_W, _TEXTBOX_H, data.hobby,
                   font_size=_FS_LARGE, font_name=fonts.mincho)
 
     # ── 志望動機 ── (box: y=73 to 113)
     _draw_box(c, 0, 73, _CW, 40, line_width=2.0)
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(2), _y(109), "志望動機")
-    _draw_textbox(c, 2, 103, 173, 28, data.motivation,
+    _draw_textbox(c, 2, 103, _TEXTBOX_W, _TEXTBOX_H, data.motivation,
                   font_size=_FS_LARGE, font_name=fonts.mincho)
 
     # ── 本人希望記入欄 ── (box: y=26 to 66)
     _draw_box(c, 0, 26, _CW, 40, line_width=2.0)
     c.setFont(fonts.mincho, _FS_NORMAL)
     c.drawString(_x(2), _y(62), "本人希望記入欄")
-    _draw_textbox(c, 2, 56, 173, 28, data.request,
+    _draw_textbox(c, 2, 56, _TEXTBOX_W, _TEXTBOX_H, data.request,
                   font_size=_FS_LARGE, font_name=fonts.mincho)
 
 
+def _prepare_photo(data: Resume, photo_dpi: int, cache_dir: str | Path | None) -> str | ImageReader | None:
+    """The photo sized for its box, or None when the resume has none."""
+    if data.photo and Path(data.photo).exists():
+        return prepare_photo(data.photo, _PHOTO_W, _PHOTO_H, photo_dpi, cache_dir)
+    return None
+
+
+def _render(
+    data: Resume,
+    target: str | BinaryIO,
+    fonts: FontConfig,
+    photo_dpi: int,
+    cache_dir: str | Path | None,
+    stats: RenderStats | None = None,
+    plan: bool = False,
+) -> StateTrackingCanvas:
+    """Render the PDF into target (a file name or a binary file object).
+
+    plan: record a RenderPlan (the returned canvas's .plan) instead of
+    writing the PDF. Returns the canvas the document was drawn on.
+    """
+    canvas_class = _FallbackCanvas if fonts.fallback else StateTrackingCanvas
+    if plan:
+        canvas_class = recording(canvas_class)
+    if fonts.fallback:
+        c = canvas_class(target, pagesize=A4, fallback=fonts.fallback, stats=stats)
+    else:
+        c = canvas_class(target, pagesize=A4, stats=stats)
+
+    with phase("photo"):
+        photo = _prepare_photo(data, photo_dpi, cache_dir)
+
+    note(pages=2)
+    with phase("write"):
+        # Page 1
+        _draw_page1(c, data, fonts, photo)
+        c.showPage()
+
+        # Page 2
+        _draw_page2(c, data, fonts)
+        c.showPage()
+
+        c.save()
+    return c
+
+
 def build_resume_pdf(
     data: Resume,
     output: str | Path,
     font_dir: str | Path | None = None,
+    fallback_font: str | Path | None = None,
+    photo_dpi: int = DEFAULT_DPI,
+    cache_dir: str | Path | None = None,
+    stats: RenderStats | None = None,
 ) -> Path:
     """Generate the 履歴書 PDF.
 
@@ -419,22 +593,51 @@ def build_resume_pdf(
         data: Validated Resume data.
         output: Output PDF file path.
         font_dir: Optional directory containing Japanese fonts.
+        fallback_font: Optional font file for characters the Japanese fonts lack.
+        photo_dpi: Resolution the photo is downscaled to within its 30x40mm box.
+        cache_dir: Optional directory to keep prepared photos and font snapshots across runs.
+        stats: Optional RenderStats that receives the graphics-state operator counts.
 
     Returns:
         Path to the generated PDF.
     """
     output = Path(output)
-    fonts = register_fonts(font_dir)
+    with phase("fonts"):
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    _render(data, str(output), fonts, photo_dpi, cache_dir, stats)
+    return output
 
-    c = canvas_module.Canvas(str(output), pagesize=A4)
 
-    # Page 1
-    _draw_page1(c, data, fonts)
-    c.showPage()
+def render_resume_pdf(
+    data: Resume,
+    font_dir: str | Path | None = None,
+    fallback_font: str | Path | None = None,
+    photo_dpi: int = DEFAULT_DPI,
+    cache_dir: str | Path | None = None,
+    stats: RenderStats | None = None,
+) -> bytes:
+    """Generate the 履歴書 PDF in memory and return its bytes.
+
+    Takes the same options as build_resume_pdf.
+    """
+    buffer = BytesIO()
+    with phase("fonts"):
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    _render(data, buffer, fonts, photo_dpi, cache_dir, stats)
+    return buffer.getvalue()
 
-    # Page 2
-    _draw_page2(c, data, fonts)
-    c.showPage()
 
-    c.save()
-    return output
+def plan_resume_pdf(
+    data: Resume,
+    font_dir: str | Path | None = None,
+    fallback_font: str | Path | None = None,
+    photo_dpi: int = DEFAULT_DPI,
+    cache_dir: str | Path | None = None,
+) -> RenderPlan:
+    """Draw the 履歴書 into a RenderPlan (see render_plan.paint_pdf).
+
+    Takes the same options as render_resume_pdf; painting the plan gives the same PDF.
+    """
+    with phase("fonts"):
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    return _render(data, BytesIO(), fonts, photo_dpi, cache_dir, plan=True).plan
@@ -0,0 +1,140 @@
+"""Canvas that drops graphics-state changes which change nothing.
+
+The 履歴書 drawing code sets the line width and dash before every line and
+the font before nearly every string, and ReportLab writes an operator into
+the content stream for each call; every drawString also starts a text
+object that selects its font again. StateTrackingCanvas remembers the
+font, size, line width, dash and colours in effect (saved and restored
+together with the canvas' own state by saveState / restoreState) and
+skips a setter, or a text object's font selection, whose value is already
+current.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas as canvas_module
+
+_SOLID = ((), 0)
+
+
+@dataclass
+class RenderStats:
+    """Graphics-state operator counts of a render."""
+
+    pages: int = 0
+    content_bytes: int = 0  # uncompressed content streams
+    operators: Counter = field(default_factory=Counter)  # state changes written, by kind
+    elided: Counter = field(default_factory=Counter)  # no-op state changes dropped, by kind
+
+    def to_text(self) -> str:
+        lines = [f"pages: {self.pages}", f"content stream: {self.content_bytes} bytes"]
+        for kind in sorted(self.operators.keys() | self.elided.keys()):
+            lines.append(f"{kind:<13} written {self.operators[kind]:4}  elided {self.elided[kind]:4}")
+        return "\n".join(lines)
+
+
+class StateTrackingCanvas(canvas_module.Canvas):
+    """Canvas that elides font / line width / dash / colour changes to the current value.
+
+    stats (a RenderStats, created when not given) receives the operator
+    counts as pages are finished.
+    """
+
+    # _textFont: (font name, TrueType subset or -1, size, leading) of the
+    # Tf / TL in effect, or None when unknown
+    STATE_ATTRIBUTES = canvas_module.Canvas.STATE_ATTRIBUTES + ["_dashState", "_textFont"]
+
+    def __init__(self, *args, stats: RenderStats | None = None, **kwargs):
+        self.stats = stats if stats is not None else RenderStats()
+        super().__init__(*args, **kwargs)
+
+    def init_graphics_state(self):
+        super().init_graphics_state()
+        self._dashState = _SOLID
+        # The page preamble selects the initial font
+        if pdfmetrics.getFont(self._fontname)._dynamicFont:
+            self._textFont = None
+        else:
+            self._textFont = (self._fontname, -1, self._fontsize, self._leading)
+
+    def _track(self, kind: str, setter, *args) -> int:
+        """Call setter and count the operators it wrote."""
+        n = len(self._code)
+        setter(*args)
+        written = len(self._code) - n
+        self.stats.operators[kind] += written
+        return written
+
+    def setFont(self, psfontname, size, leading=None):
+        if leading is None:
+            leading = size * 1.2
+        if (psfontname, size, leading) == (self._fontname, self._fontsize, self._leading) and (
+            # A TrueType font is selected by each text object, not here
+            self._textFont == (psfontname, -1, size, leading)
+            or pdfmetrics.getFont(psfontname)._dynamicFont
+        ):
+            self.stats.elided["font"] += 1
+            return
+        if self._track("font", super().setFont, psfontname, size, leading):
+            self._textFont = (psfontname, -1, size, leading)
+
+    def beginText(self, x=0, y=0, direction=None):
+        t = super().beginText(x, y, direction)
+        current = self._textFont
+        if current is not None and current[1] >= 0 and current == (t._fontname, current[1], t._fontsize, t._leading):
+            # The subset is already selected; the text object then only
+            # writes Tf when its text needs another subset
+            t._curSubset = current[1]
+            self.stats.elided["font"] += 1
+        return t
+
+    def drawText(self, aTextObject):
+        t = aTextObject
+        super().drawText(t)
+        if t._curSubset >= 0 and pdfmetrics.getFont(t._fontname)._dynamicFont:
+            # Tf set inside a text object stays in effect after ET
+            self._textFont = (t._fontname, t._curSubset, t._fontsize, t._leading)
+        elif (t._fontname, t._fontsize, t._leading) != (self._fontname, self._fontsize, self._leading):
+            self._textFont = None
+
+    def setLineWidth(self, width):
+        if width == self._lineWidth:
+            self.stats.elided["line_width"] += 1
+            return
+        self._track("line_width", super().setLineWidth, width)
+
+    def setDash(self, array=(), phase=0):
+        if isinstance(array, (int, float)):
+            dash = ((array, phase), 0)
+        else:
+            dash = (tuple(array), phase)
+        if dash == self._dashState:
+            self.stats.elided["dash"] += 1
+            return
+        self._track("dash", super().setDash, array, phase)
+        self._dashState = dash
+
+    def _same_colour(self, colour, current, alpha) -> bool:
+        # Only exact repeats: no alpha change, no colour-space enforcement
+        return alpha is None and not self._enforceColorSpace and type(colour) is type(current) and colour == current
+
+    def setFillColor(self, aColor, alpha=None):
+        if self._same_colour(aColor, self._fillColorObj, alpha):
+            self.stats.elided["fill_color"] += 1
+            return
+        self._track("fill_color", super().setFillColor, aColor, alpha)
+
+    def setStrokeColor(self, aColor, alpha=None):
+        if self._same_colour(aColor, self._strokeColorObj, alpha):
+            self.stats.elided["stroke_color"] += 1
+            return
+        self._track("stroke_color", super().setStrokeColor, aColor, alpha)
+
+    def showPage(self):
+        self.stats.pages += 1
+        self.stats.content_bytes += len(self._preamble) + sum(len(op) + 1 for op in self._code)
+        super().showPage()
@@ -0,0 +1,114 @@
+"""Overflow check for 履歴書 fields, without rendering.
+
+The builder draws every field at a fixed position and silently clips what
+does not fit: history rows past the table, textbox lines below the box,
+text running past its cell. check_resume measures each field against the
+geometry the builder draws with (its _CELLS, _ADDRESSES and table
+constants), using the cached glyph-width tables instead.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from reportlab.lib.units import mm
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.metrics import glyph_widths
+from jp_tenshoku_docs_builder.resume.builder import (
+    _ADDRESSES,
+    _CELLS,
+    _CW,
+    _FS_LARGE,
+    _HISTORY_TABLE_ROWS,
+    _HISTORY_VALUE_X,
+    _LICENCE_TABLE_ROWS,
+    _TEXTBOX_H,
+    _TEXTBOX_W,
+    _history_entries,
+    _textbox_capacity,
+    _textbox_lines,
+)
+from jp_tenshoku_docs_builder.resume.models import HistoryEntry, Resume
+
+# Page 2 free-text boxes
+_TEXTBOXES = ["hobby", "motivation", "request"]
+
+
+@dataclass
+class Overflow:
+    """A field that does not fit its box."""
+
+    field: str
+    kind: str  # "width", "lines" or "rows"
+    limit: float  # mm for "width", count for "lines" / "rows"
+    actual: float
+
+    def __str__(self) -> str:
+        if self.kind == "width":
+            return f"{self.field}: {self.actual:.1f}mm wide, box is {self.limit:.1f}mm"
+        unit = "lines" if self.kind == "lines" else "rows"
+        return f"{self.field}: {self.actual:g} {unit}, only {self.limit:g} fit"
+
+
+def _width_mm(text: str, font_name: str, font_size: float) -> float:
+    return glyph_widths(font_name).string_width(text, font_size) / mm
+
+
+def _check_rows(
+    field: str, rows: list[tuple[str, HistoryEntry]], max_rows: int, font_name: str,
+) -> list[Overflow]:
+    """Check a history table: row count, then the value width of each drawn row."""
+    overflows = []
+    if len(rows) > max_rows:
+        overflows.append(Overflow(field, "rows", max_rows, len(rows)))
+    limit = _CW - _HISTORY_VALUE_X
+    for path, entry in rows[:max_rows]:
+        width = _width_mm(entry.value, font_name, _FS_LARGE)
+        if width > limit:
+            overflows.append(Overflow(f"{path}.value", "width", limit, width))
+    return overflows
+
+
+def check_resume(
+    data: Resume, font_dir: str | Path | None = None, cache_dir: str | Path | None = None,
+) -> list[Overflow]:
+    """Measure every 履歴書 field against its box and return the overflows.
+
+    Uses the same fonts as build_resume_pdf; no PDF is produced. An empty
+    list means the resume renders without clipping.
+    """
+    font_name = register_fonts(font_dir, cache_dir=cache_dir).mincho
+    overflows: list[Overflow] = []
+
+    for field, (x, _, right, size) in _CELLS.items():
+        width = _width_mm(getattr(data, field), font_name, size)
+        if width > right - x:
+            overflows.append(Overflow(field, "width", right - x, width))
+
+    for field, (_, _, max_width) in _ADDRESSES.items():
+        lines = len(glyph_widths(font_name).wrap(getattr(data, field), _FS_LARGE, max_width * mm))
+        if lines > 2:
+            overflows.append(Overflow(field, "lines", 2, lines))
+
+    # 学歴・職歴 share one table, with a header row before each
+    paths = (
+        ["education"] + [f"education[{i}]" for i in range(len(data.education))]
+        + ["experience"] + [f"experience[{i}]" for i in range(len(data.experience))]
+    )
+    history = list(zip(paths, _history_entries(data)))
+    overflows += _check_rows("education/experience", history, _HISTORY_TABLE_ROWS - 1, font_name)
+    licences = [(f"licences[{i}]", entry) for i, entry in enumerate(data.licences)]
+    overflows += _check_rows("licences", licences, _LICENCE_TABLE_ROWS - 1, font_name)
+
+    capacity = _textbox_capacity(_TEXTBOX_H, _FS_LARGE)
+    for field in _TEXTBOXES:
+        text = getattr(data, field)
+        if not text:
+            continue
+        lines = len(_textbox_lines(text, font_name, _FS_LARGE, _TEXTBOX_W))
+        if lines > capacity:
+            overflows.append(Overflow(field, "lines", capacity, lines))
+
+    return overflows
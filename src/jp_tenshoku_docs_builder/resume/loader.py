@@ -4,34 +4,34 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import yaml
-
+from jp_tenshoku_docs_builder.memprofile import phase
 from jp_tenshoku_docs_builder.resume.models import Resume
+from jp_tenshoku_docs_builder.yaml_include import load_yaml_file
 
 
 def load_resume_yaml(
     path: str | Path,
     credential_path: str | Path,
+    include_root: str | Path | None = None,
 ) -> Resume:
     """Load and validate a YAML file into a Resume model.
 
     Args:
-        path: Path to the YAML file.
+        path: Path to the YAML file (may use !include, see yaml_include).
         credential_path: Path to a credential YAML file.
             Its fields are merged into the resume data
             (credential values take priority).
+        include_root: Directory the !include fragments of path must lie in
+            (default: the directory of path).
 
     Returns:
         Validated Resume model instance.
     """
-    path = Path(path)
-    with path.open(encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-
-    credential_path = Path(credential_path)
-    with credential_path.open(encoding="utf-8") as f:
-        credential_data = yaml.safe_load(f)
-    if credential_data:
-        data.update(credential_data)
-
-    return Resume.model_validate(data)
+    with phase("load"):
+        data = load_yaml_file(path, include_root)
+        credential_data = load_yaml_file(credential_path)
+        if credential_data:
+            data.update(credential_data)
+
+    with phase("validate"):
+        return Resume.model_validate(data)
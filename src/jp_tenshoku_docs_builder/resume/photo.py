@@ -0,0 +1,113 @@
+"""Photo preparation for the 履歴書: downscale to the photo box and cache.
+
+A phone photo (often 12 megapixels) would otherwise be embedded at full
+resolution into a 30x40 mm box. prepare_photo resamples it to the box at
+the requested DPI and re-encodes it as JPEG; the result is cached by
+(file hash, target size in pixels, dpi), in memory and optionally on disk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageOps
+from reportlab.lib.utils import ImageReader
+
+from jp_tenshoku_docs_builder.fonts import write_atomic
+
+DEFAULT_DPI = 300
+JPEG_QUALITY = 90
+
+# Prepared images kept in memory (most recently used last)
+_MEMORY_CACHE_SIZE = 32
+_MEMORY_CACHE: OrderedDict[tuple[str, tuple[int, int], int], bytes] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+_EXIF_ORIENTATION = 0x0112
+
+
+def target_size(width_mm: float, height_mm: float, dpi: int) -> tuple[int, int]:
+    """Pixel size of a width_mm x height_mm box at dpi."""
+    return round(width_mm / 25.4 * dpi), round(height_mm / 25.4 * dpi)
+
+
+def _needs_preparation(image: Image.Image, size: tuple[int, int]) -> bool:
+    """False for JPEGs that already fit the box upright (embedded as-is)."""
+    if image.format != "JPEG":
+        return True
+    if image.getexif().get(_EXIF_ORIENTATION, 1) != 1:
+        return True
+    return image.width > size[0] or image.height > size[1]
+
+
+def _resample(image: Image.Image, size: tuple[int, int]) -> bytes:
+    """Rotate per EXIF, fit within size (keeping the aspect ratio) and encode as JPEG."""
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+    out = BytesIO()
+    image.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    return out.getvalue()
+
+
+def _remember(key: tuple[str, tuple[int, int], int], data: bytes) -> None:
+    with _CACHE_LOCK:
+        _MEMORY_CACHE[key] = data
+        _MEMORY_CACHE.move_to_end(key)
+        while len(_MEMORY_CACHE) > _MEMORY_CACHE_SIZE:
+            _MEMORY_CACHE.popitem(last=False)
+
+
+def prepare_photo(
+    path: str | Path,
+    width_mm: float,
+    height_mm: float,
+    dpi: int = DEFAULT_DPI,
+    cache_dir: str | Path | None = None,
+) -> str | ImageReader:
+    """Return an image for canvas.drawImage sized for a width_mm x height_mm box.
+
+    JPEGs no larger than the box at dpi are passed through untouched (the
+    file name is returned). Anything else is resampled, re-encoded and
+    cached; with cache_dir the prepared JPEG is also stored on disk so that
+    later processes reuse it.
+    """
+    if dpi <= 0:
+        raise ValueError(f"dpi must be positive: {dpi}")
+    path = Path(path)
+    raw = path.read_bytes()
+    size = target_size(width_mm, height_mm, dpi)
+
+    with Image.open(BytesIO(raw)) as image:
+        if not _needs_preparation(image, size):
+            return str(path)
+
+        key = (hashlib.sha256(raw).hexdigest(), size, dpi)
+        with _CACHE_LOCK:
+            data = _MEMORY_CACHE.get(key)
+        cache_file = None
+        if data is None and cache_dir is not None:
+            cache_file = Path(cache_dir) / f"photo-{key[0][:16]}-{size[0]}x{size[1]}-{dpi}.jpg"
+            if cache_file.is_file():
+                data = cache_file.read_bytes()
+        if data is None:
+            data = _resample(image, size)
+            if cache_file is not None:
+                try:
+                    write_atomic(cache_file, data)
+                except OSError as e:  # read-only or full cache directory: resample next time
+                    print(f"WARNING: Could not write photo cache {cache_file}: {e}", file=sys.stderr)
+        _remember(key, data)
+
+    return ImageReader(BytesIO(data))
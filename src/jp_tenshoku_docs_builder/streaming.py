@@ -0,0 +1,160 @@
+"""Page-streaming PDF output.
+
+ReportLab keeps every page's content stream in memory until the canvas is
+saved, then formats the whole file at once, so peak memory grows with the
+page count. StreamingCanvas instead compresses each page's content stream
+and writes it to the output file as soon as the page is finished; only the
+small page dictionaries, the fonts, the page tree and the catalog are
+written at save time, followed by the cross-reference table and trailer.
+
+The flowables themselves are the other cost that grows with the document:
+Platypus takes the complete list up front. A DeferredFlowables placeholder
+builds its flowables only when a DeferringDocTemplate reaches it, so just
+the part of the document being laid out is held in memory.
+
+The object numbering differs from a regular render (each content stream
+is numbered right after its page), but the pages draw identically.
+Encrypted output is not supported.
+"""
+
+from __future__ import annotations
+
+from reportlab import rl_config
+from reportlab.pdfbase.pdfdoc import (
+    PDFBase85Encode,
+    PDFCrossReferenceTable,
+    PDFDocument,
+    PDFFile,
+    PDFIndirectObject,
+    PDFObjectReference,
+    PDFStream,
+    PDFTrailer,
+    PDFZCompress,
+)
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import BaseDocTemplate, Flowable
+
+
+class DeferredFlowables(Flowable):
+    """Placeholder for flowables built on demand by factory() (returns a list)."""
+
+    def __init__(self, factory):
+        super().__init__()
+        self._factory = factory
+
+    def expand(self) -> list:
+        return self._factory()
+
+
+class DeferringDocTemplate(BaseDocTemplate):
+    """BaseDocTemplate that expands DeferredFlowables right before layout."""
+
+    def filterFlowables(self, flowables):
+        # keepWithNext chains look ahead, so placeholders are expanded up
+        # to the first flowable that does not keep with the next one
+        i = 0
+        while i < len(flowables):
+            f = flowables[i]
+            if isinstance(f, DeferredFlowables):
+                # None is skipped by handle_flowable, and keeps the list non-empty
+                flowables[i:i + 1] = f.expand() or [None]
+                continue
+            if f is None or not f.getKeepWithNext():
+                break
+            i += 1
+
+
+class _StreamingDocument(PDFDocument):
+    """PDFDocument that writes objects to its file as they become final."""
+
+    @classmethod
+    def adopt(cls, doc: PDFDocument, target) -> _StreamingDocument:
+        """Take over the state of the canvas' freshly created document."""
+        streaming = cls.__new__(cls)
+        streaming.__dict__.update(doc.__dict__)
+        if hasattr(getattr(target, "write", None), "__call__"):
+            streaming._file, streaming._owns_file = target, False
+        else:
+            streaming._file, streaming._owns_file = open(target, "wb"), True
+        streaming._offset = None  # header not written yet
+        return streaming
+
+    def _write(self, data: bytes) -> int:
+        if self._offset is None:
+            # Written with the first page, after any ensureMinPdfVersion()
+            # made while drawing it
+            if self.encrypt.info():
+                raise ValueError("streaming PDF output does not support encryption")
+            self._offset = 0
+            self._write(PDFFile(self._pdfVersion).format(self))
+        offset = self._offset
+        self._file.write(data)
+        self._offset += len(data)
+        return offset
+
+    def _write_object(self, oid: str, obj) -> None:
+        self.idToOffset[oid] = self._write(PDFIndirectObject(oid, obj).format(self))
+
+    def addPage(self, page):
+        super().addPage(page)
+        if page.Override_default_compilation or page.Contents or not page.stream:
+            return
+        # Same stream PDFPage.check_format would build at save time
+        stream = PDFStream(content=page.stream)
+        if page.compression:
+            stream.filters = [PDFBase85Encode, PDFZCompress] if rl_config.useA85 else [PDFZCompress]
+        oid = self.Reference(stream).name
+        self._write_object(oid, stream)
+        page.Contents = PDFObjectReference(oid)
+        page.stream = None
+        self.idToObject[oid] = None  # release the page content
+
+    def SaveToFile(self, filename, canvas):
+        try:
+            self.GetPDFData(canvas)
+        finally:
+            if self._owns_file:
+                self._file.close()
+
+    def format(self):
+        """Write the remaining objects, the xref table and the trailer."""
+        cat = self.Catalog
+        info = self.info
+        self.Reference(cat)
+        self.Reference(info)
+        # Objects may be registered while others are formatted, so the
+        # numbers are walked until none is left (as PDFDocument.format does)
+        number = 0
+        while number + 1 in self.numberToId:
+            number += 1
+            oid = self.numberToId[number]
+            if oid not in self.idToOffset:
+                self._write_object(oid, self.idToObject[oid])
+
+        xref = PDFCrossReferenceTable()
+        xref.addsection(0, [self.numberToId[n] for n in range(1, number + 1)])
+        xref_offset = self._write(xref.format(self))
+        trailer = PDFTrailer(
+            startxref=xref_offset,
+            Size=number + 1,
+            Root=self.Reference(cat),
+            Info=self.Reference(info),
+            ID=self.ID(),
+        )
+        self._write(trailer.format(self))
+
+
+class StreamingCanvas(Canvas):
+    """Canvas that writes each finished page to the output immediately.
+
+    Drop-in canvasmaker for doc.build(); the file (name or binary file
+    object) is opened when the canvas is created and completed by save().
+    getpdfdata() raises TypeError: the pages are not kept in memory.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        self._doc = _StreamingDocument.adopt(self._doc, filename)
+
+    def getpdfdata(self):
+        raise TypeError("StreamingCanvas writes straight to its file; use save()")
@@ -0,0 +1,210 @@
+"""Validation-only entry point (``jp_tenshoku_docs_builder validate``).
+
+Imports nothing but yaml, pydantic and the model modules, so editor
+linting and pre-commit hooks can check many YAML files in one process
+without loading reportlab. Errors carry the YAML line and column of the
+offending value.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import yaml
+from pydantic import BaseModel, ValidationError
+
+from jp_tenshoku_docs_builder.resume.models import Resume
+from jp_tenshoku_docs_builder.work_history.models import StandardWorkHistory, StarWorkHistory
+from jp_tenshoku_docs_builder.yaml_include import IncludeLoader
+
+_MODELS: dict[tuple[str, str], type[BaseModel]] = {
+    ("work-history", "standard"): StandardWorkHistory,
+    ("work-history", "star"): StarWorkHistory,
+    ("resume", "standard"): Resume,
+    ("resume", "star"): Resume,
+}
+
+
+@dataclass
+class ValidationIssue:
+    """One validation error, located in a YAML file."""
+
+    file: str
+    line: int | None  # 1-based; None when the file could not be read
+    column: int | None
+    field: str  # e.g. "experience[0].projects[1].period" ("" for the whole document)
+    message: str
+    type: str  # pydantic error type, "yaml" or "io"
+
+    def __str__(self) -> str:
+        where = self.file if self.line is None else f"{self.file}:{self.line}:{self.column}"
+        field = f"{self.field}: " if self.field else ""
+        return f"{where}: {field}{self.message}"
+
+
+def _load(path: Path, include_root: Path | None = None) -> tuple[object, yaml.Node | None]:
+    """Parse a YAML file into (data, node tree); the nodes keep source marks.
+
+    Included fragments appear in the node tree as their !include scalar,
+    so errors inside them point at the line that includes them.
+    """
+    with path.open(encoding="utf-8") as f:
+        loader = IncludeLoader(f, path.resolve(), root=include_root.resolve() if include_root is not None else None)
+        try:
+            node = loader.get_single_node()
+            data = loader.construct_document(node) if node is not None else None
+        finally:
+            loader.dispose()
+    return data, node
+
+
+def _field_path(loc: tuple) -> str:
+    path = ""
+    for part in loc:
+        if isinstance(part, int):
+            path += f"[{part}]"
+        else:
+            path += f".{part}" if path else str(part)
+    return path
+
+
+def _locate(node: yaml.Node | None, loc: tuple) -> yaml.Node | None:
+    """Follow loc into the node tree; stop at the deepest node that exists.
+
+    For a missing field this is the mapping that should contain it.
+    """
+    for part in loc:
+        child = None
+        if isinstance(node, yaml.MappingNode) and isinstance(part, str):
+            child = next((v for k, v in node.value if k.value == part), None)
+        elif isinstance(node, yaml.SequenceNode) and isinstance(part, int) and part < len(node.value):
+            child = node.value[part]
+        if child is None:
+            break
+        node = child
+    return node
+
+
+def _issue(path: Path, node: yaml.Node | None, field: str, message: str, kind: str) -> ValidationIssue:
+    if node is None:
+        return ValidationIssue(str(path), None, None, field, message, kind)
+    mark = node.start_mark
+    return ValidationIssue(str(path), mark.line + 1, mark.column + 1, field, message, kind)
+
+
+def validate_file(
+    path: str | Path,
+    doc_type: str = "work-history",
+    content_format: str = "standard",
+    credential: str | Path | None = None,
+    include_root: str | Path | None = None,
+) -> list[ValidationIssue]:
+    """Validate one YAML file against its model and return the errors (empty when valid).
+
+    With credential, its fields are merged in as the builders do (credential
+    values take priority) and errors in them point into the credential file.
+    Without it, missing top-level fields are not reported, since the
+    credential normally supplies them. include_root is the directory the
+    !include fragments of path must lie in (default: the directory of path).
+    """
+    model = _MODELS[(doc_type, content_format)]
+    sources: list[tuple[Path, object, yaml.Node | None]] = []
+    for source, root in ((path, include_root), (credential, None)):
+        if source is None:
+            continue
+        source = Path(source)
+        try:
+            data, node = _load(source, Path(root) if root is not None else None)
+        except OSError as e:
+            return [ValidationIssue(str(source), None, None, "", e.strerror or str(e), "io")]
+        except yaml.MarkedYAMLError as e:
+            mark = e.problem_mark or e.context_mark
+            line, column = (mark.line + 1, mark.column + 1) if mark else (None, None)
+            # Syntax errors in an included fragment are marked in that file
+            where = mark.name if mark and Path(mark.name).is_file() else str(source)
+            return [ValidationIssue(where, line, column, "", str(e.problem or e), "yaml")]
+        if data is not None and not isinstance(data, dict):
+            return [_issue(source, node, "", "top level must be a mapping", "yaml")]
+        sources.append((source, data or {}, node))
+
+    merged: dict = {}
+    for _, data, _ in sources:
+        merged.update(data)
+    try:
+        model.model_validate(merged)
+    except ValidationError as e:
+        errors = e.errors()
+    else:
+        return []
+
+    issues = []
+    for error in errors:
+        loc = error["loc"]
+        if credential is None and error["type"] == "missing" and len(loc) == 1:
+            continue
+        # The last source defining the top-level key won the merge
+        source, _, node = sources[0]
+        for candidate in reversed(sources):
+            if loc and loc[0] in candidate[1]:
+                source, _, node = candidate
+                break
+        issues.append(_issue(source, _locate(node, loc), _field_path(loc), error["msg"], error["type"]))
+    return issues
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="jp_tenshoku_docs_builder validate",
+        description="YAMLをデータモデルで検証のみ行う（PDF生成・reportlabの読み込みなし）",
+    )
+    parser.add_argument("inputs", type=Path, nargs="+", help="Input YAML file paths")
+    parser.add_argument(
+        "--type",
+        choices=["work-history", "resume"],
+        default="work-history",
+        dest="doc_type",
+        help="Document type: work-history (職務経歴書) or resume (履歴書) (default: work-history)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["standard", "star"],
+        default="standard",
+        dest="content_format",
+        help="プロジェクト内容の表示形式 (default: standard, work-history only)",
+    )
+    parser.add_argument(
+        "-c", "--credential",
+        type=Path,
+        default=None,
+        help="個人情報YAML（指定時はマージして検証、未指定時は最上位の必須項目の欠落を無視）",
+    )
+    parser.add_argument(
+        "--include-root",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="!include で読み込めるファイルの範囲とするディレクトリ (default: 各入力YAMLのディレクトリ)",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["text", "json"],
+        default="text",
+        help="エラーの出力形式: text (file:line:column: field: message) / json (default: text)",
+    )
+    args = parser.parse_args(argv)
+
+    issues: list[ValidationIssue] = []
+    for path in args.inputs:
+        issues += validate_file(path, args.doc_type, args.content_format, args.credential, args.include_root)
+
+    if args.output_format == "json":
+        print(json.dumps([asdict(issue) for issue in issues], ensure_ascii=False))
+    else:
+        for issue in issues:
+            print(issue)
+    if issues:
+        sys.exit(1)
@@ -0,0 +1,152 @@
+"""Renders in a supervised subprocess with time and memory limits.
+
+Some inputs make Platypus layout slow (thousands of lines in one cell are
+split again on every page) or fail only after a long time (a row taller
+than a page with splitInRow=0). RenderWatchdog runs each render in a
+child process whose address space is capped with RLIMIT_AS, and kills it
+when the wall-clock limit passes, so one such document cannot hold a
+worker or exhaust the host. Failures are raised as RenderError carrying a
+RenderFailure.
+
+The memory limit needs the ``resource`` module (Unix); elsewhere only
+the time limit applies.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import time
+from dataclasses import asdict, dataclass
+
+from pydantic import BaseModel
+
+
+@dataclass
+class RenderFailure:
+    """Why a supervised render produced no PDF."""
+
+    kind: str  # "timeout", "memory", "layout" (LayoutError), "error" or "crashed"
+    message: str
+    elapsed: float  # seconds until the failure was detected
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class RenderError(RuntimeError):
+    """A supervised render failed; .failure describes how."""
+
+    def __init__(self, failure: RenderFailure):
+        super().__init__(f"{failure.kind}: {failure.message}")
+        self.failure = failure
+
+
+def _limit_memory(max_memory: int | None) -> None:
+    if max_memory is None:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        max_memory = min(max_memory, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (max_memory, hard))
+
+
+def renderer(kind: str):
+    """render_pdf ("work_history") or render_resume_pdf ("resume"), imported on demand."""
+    if kind == "work_history":
+        from jp_tenshoku_docs_builder.work_history.builder import render_pdf
+
+        return render_pdf
+    from jp_tenshoku_docs_builder.resume.builder import render_resume_pdf
+
+    return render_resume_pdf
+
+
+def _child(conn, kind: str, data: BaseModel, options: dict, max_memory: int | None) -> None:
+    """Subprocess entry point: send ("ok", pdf) or (failure kind, message)."""
+    from reportlab.platypus.doctemplate import LayoutError
+
+    # Imported before the limit is set, so it bounds the render itself
+    render = renderer(kind)
+    try:
+        _limit_memory(max_memory)
+        pdf = render(data, **options)
+    except MemoryError:
+        conn.send(("memory", f"render exceeded the memory limit of {max_memory} bytes"))
+    except LayoutError as e:
+        conn.send(("layout", f"LayoutError: {e}"))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    else:
+        conn.send(("ok", pdf))
+    finally:
+        conn.close()
+
+
+def process_context():
+    """multiprocessing context for render processes (forkserver, or spawn where unavailable).
+
+    fork would copy the parent's threads' locks (held font registry lock,
+    logging handlers) into the child.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class RenderWatchdog:
+    """Runs renders in a subprocess under wall-clock and memory limits.
+
+    timeout: seconds before the render process is killed (including the
+        process start-up and font loading).
+    max_memory: address-space limit of the render process in bytes, or None.
+    """
+
+    def __init__(self, timeout: float = 60.0, max_memory: int | None = 1024 * 1024 * 1024):
+        if timeout <= 0:
+            raise ValueError(f"timeout must be positive: {timeout}")
+        if max_memory is not None and max_memory <= 0:
+            raise ValueError(f"max_memory must be positive: {max_memory}")
+        self.timeout = timeout
+        self.max_memory = max_memory
+
+    def render_work_history(self, data: BaseModel, **options) -> bytes:
+        """Supervised work_history.builder.render_pdf (same keyword options)."""
+        return self._run("work_history", data, options)
+
+    def render_resume(self, data: BaseModel, **options) -> bytes:
+        """Supervised resume.builder.render_resume_pdf (same keyword options)."""
+        return self._run("resume", data, options)
+
+    def _run(self, kind: str, data: BaseModel, options: dict) -> bytes:
+        ctx = process_context()
+        receiver, sender = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=_child, args=(sender, kind, data, options, self.max_memory), name=f"render-{kind}", daemon=True,
+        )
+        start = time.monotonic()
+        process.start()
+        sender.close()  # the child holds the only write end: EOF once it exits
+        try:
+            if not receiver.poll(self.timeout):
+                raise RenderError(RenderFailure(
+                    "timeout", f"render did not finish within {self.timeout:g}s", time.monotonic() - start,
+                ))
+            try:
+                status, payload = receiver.recv()
+            except EOFError:
+                process.join()
+                raise RenderError(RenderFailure(
+                    "crashed", f"render process exited with code {process.exitcode}", time.monotonic() - start,
+                )) from None
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            process.join()
+            process.close()
+        if status != "ok":
+            raise RenderError(RenderFailure(status, payload, time.monotonic() - start))
+        return payload
@@ -2,23 +2,31 @@
 
 from __future__ import annotations
 
+from functools import partial
+from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.fonts import ps2tt, tt2ps
 from reportlab.lib.units import mm
+from reportlab.pdfgen.canvas import Canvas
 from reportlab.platypus import (
     BaseDocTemplate,
     Frame,
     PageTemplate,
-    Paragraph,
     Spacer,
     Table,
     TableStyle,
 )
+from reportlab.platypus.paraparser import ParaFrag
 
-from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.fonts import FontConfig, register_fonts
+from jp_tenshoku_docs_builder.memprofile import note, phase
+from jp_tenshoku_docs_builder.render_plan import PlanRecorder, RenderPlan
+from jp_tenshoku_docs_builder.streaming import DeferredFlowables, DeferringDocTemplate, StreamingCanvas
 from jp_tenshoku_docs_builder.work_history.models import (
     SideCompany,
     SideProject,
@@ -30,11 +38,21 @@ from jp_tenshoku_docs_builder.work_history.models import (
     _ProjectBase,
     _WorkHistoryBase,
 )
+from jp_tenshoku_docs_builder.work_history.layout import (
+    ANCHOR_ATTR,
+    LayoutDocTemplate,
+    LayoutReport,
+    NullCanvas,
+)
+from jp_tenshoku_docs_builder.work_history.linebreak import JapaneseParagraph
 from jp_tenshoku_docs_builder.work_history.styles import (
     MARGIN_BOTTOM,
     MARGIN_LEFT,
     MARGIN_RIGHT,
     MARGIN_TOP,
+    SPACE_COMPANY,
+    SPACE_SECTION,
+    StyleScale,
     build_styles,
 )
 
@@ -77,12 +95,50 @@ def _escape(text: str) -> str:
     return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 
+def _plain_paragraph(lines: list[str], style: ParagraphStyle) -> JapaneseParagraph:
+    """Build a Paragraph from plain text lines, bypassing the XML markup parser.
+
+    Equivalent to ``Paragraph("<br/>".join(_escape(l) for l in lines), style)``
+    (including the parser's whitespace collapsing), but the fragments are
+    constructed directly. Use only for cells without rich markup.
+    """
+    base = ParaFrag()
+    base.rise = 0
+    base.greek = 0
+    base.link = []
+    family, base.bold, base.italic = ps2tt(style.fontName)
+    base.fontName = tt2ps(family, base.bold, base.italic)
+    base.fontSize = style.fontSize
+    base.textColor = style.textColor
+    base.us_lines = []
+
+    frags = []
+    for i, line in enumerate(lines):
+        if i:
+            frags.append(base.clone(text="", lineBreak=True, __tag__="br"))
+        text = " ".join(line.split())
+        if text:
+            frags.append(base.clone(text=text, __tag__="para"))
+    return JapaneseParagraph("\n".join(lines), style, frags=frags)
+
+
+def _anchor(flowable, kind: str, label: str):
+    """Tag a flowable so the layout pass reports where it starts."""
+    setattr(flowable, ANCHOR_ATTR, (kind, label))
+    return flowable
+
+
+def _section_header(title: str, styles: dict[str, ParagraphStyle]) -> JapaneseParagraph:
+    """Build a ■-prefixed section heading."""
+    return _anchor(JapaneseParagraph(f"■{title}", styles["section_header"]), "section", title)
+
+
 def _build_header(data: _WorkHistoryBase, styles: dict[str, ParagraphStyle]) -> list:
     """Build the header section: title, date, name."""
     elements = []
-    elements.append(Paragraph("職 務 経 歴 書", styles["title"]))
-    elements.append(Paragraph(_escape(data.date), styles["date"]))
-    elements.append(Paragraph(_escape(data.name), styles["name"]))
+    elements.append(_anchor(JapaneseParagraph("職 務 経 歴 書", styles["title"]), "section", "職務経歴書"))
+    elements.append(_plain_paragraph([data.date], styles["date"]))
+    elements.append(_plain_paragraph([data.name], styles["name"]))
     return elements
 
 
@@ -91,60 +147,51 @@ def _build_summary(data: _WorkHistoryBase, styles: dict[str, ParagraphStyle]) ->
     if not data.summary:
         return []
     elements = []
-    elements.append(Paragraph("■職務要約", styles["section_header"]))
-    text = _escape(data.summary.strip()).replace("\n", "<br/>")
-    elements.append(Paragraph(text, styles["body"]))
+    elements.append(_section_header("職務要約", styles))
+    elements.append(_plain_paragraph(data.summary.strip().split("\n"), styles["body"]))
     return elements
 
 
-def _build_highlights(data: _WorkHistoryBase, styles: dict[str, ParagraphStyle]) -> list:
+def _build_highlights(
+    data: _WorkHistoryBase,
+    styles: dict[str, ParagraphStyle],
+    spacing: float = 1.0,
+) -> list:
     """Build 活かせる経験・知識・技術 section."""
     if not data.highlights:
         return []
     elements = []
-    elements.append(Paragraph("■活かせる経験・知識・技術", styles["section_header"]))
+    elements.append(_section_header("活かせる経験・知識・技術", styles))
     for h in data.highlights:
-        elements.append(Paragraph(f"・{_escape(h)}", styles["bullet"]))
-    elements.append(Spacer(1, 2 * mm))
+        elements.append(_plain_paragraph([f"・{h}"], styles["bullet"]))
+    elements.append(Spacer(1, SPACE_SECTION * spacing))
     return elements
 
 
-def _build_env_cell(project: _ProjectBase | SideProject, styles: dict[str, ParagraphStyle]) -> Paragraph:
+def _build_env_cell(project: _ProjectBase | SideProject, styles: dict[str, ParagraphStyle]) -> JapaneseParagraph:
     """Build the environment column content for a project row."""
     if project.abbreviate_env:
-        return Paragraph("同環境のため省略", styles["cell"])
-    parts = []
-    env = project.environment
-    categories = [
-        ("言語", env.languages),
-        ("OS", env.os),
-        ("DB", env.db),
-        ("FW", env.frameworks),
-        ("AWS", env.aws),
-        ("Azure", env.azure),
-        ("GCP", env.gcp),
-        ("ツール", env.tools),
-        ("その他", env.other),
-    ]
-    for label, items in categories:
+        return _plain_paragraph(["同環境のため省略"], styles["cell"])
+    lines = []
+    for label, items in project.environment.categories():
         if items:
-            parts.append(f"◆ {label}<br/>" + "<br/>".join(_escape(i) for i in items))
-    return Paragraph("<br/>".join(parts), styles["cell"])
+            lines.append(f"◆ {label}")
+            lines.extend(items)
+    return _plain_paragraph(lines, styles["cell"])
 
 
-def _build_period_cell(project: _ProjectBase, styles: dict[str, ParagraphStyle]) -> Paragraph:
+def _build_period_cell(project: _ProjectBase, styles: dict[str, ParagraphStyle]) -> JapaneseParagraph:
     """Build the period column for a project row.
 
     Splits on ～ into three lines: start / ～ / end.
     """
-    text = _escape(project.period)
-    if "～" in text:
-        start, end = text.split("～", 1)
-        text = f"{start}<br/>～<br/>{end}"
-    return Paragraph(text, styles["cell"])
+    if "～" in project.period:
+        start, end = project.period.split("～", 1)
+        return _plain_paragraph([start, "～", end], styles["cell"])
+    return _plain_paragraph([project.period], styles["cell"])
 
 
-def _build_project_content(project: StandardProject, styles: dict[str, ParagraphStyle]) -> Paragraph:
+def _build_project_content(project: StandardProject, styles: dict[str, ParagraphStyle]) -> JapaneseParagraph:
     """Build the main content column for a standard project row."""
     parts = []
 
@@ -170,10 +217,10 @@ def _build_project_content(project: StandardProject, styles: dict[str, Paragraph
         items = "<br/>".join(f"・{_escape(a)}" for a in project.achievements)
         parts.append(f"◆ 実績・取り組み<br/>{items}")
 
-    return Paragraph("<br/><br/>".join(parts), styles["cell"])
+    return JapaneseParagraph("<br/><br/>".join(parts), styles["cell"])
 
 
-def _build_project_content_star(project: StarProject, styles: dict[str, ParagraphStyle]) -> Paragraph:
+def _build_project_content_star(project: StarProject, styles: dict[str, ParagraphStyle]) -> JapaneseParagraph:
     """Build the main content column for a STAR project row."""
     parts = []
 
@@ -201,17 +248,13 @@ def _build_project_content_star(project: StarProject, styles: dict[str, Paragrap
         items = "<br/>".join(f"・{_escape(r)}" for r in project.result)
         parts.append(f"◆ 結果（Result）<br/>{items}")
 
-    return Paragraph("<br/><br/>".join(parts), styles["cell"])
+    return JapaneseParagraph("<br/><br/>".join(parts), styles["cell"])
 
 
-def _build_team_cell(project: _ProjectBase, styles: dict[str, ParagraphStyle]) -> Paragraph:
+def _build_team_cell(project: _ProjectBase, styles: dict[str, ParagraphStyle]) -> JapaneseParagraph:
     """Build the team size / role column."""
-    parts = []
-    if project.team_size:
-        parts.append(_escape(project.team_size))
-    if project.role:
-        parts.append(_escape(project.role))
-    return Paragraph("<br/>".join(parts), styles["cell"])
+    parts = [p for p in (project.team_size, project.role) if p]
+    return _plain_paragraph(parts, styles["cell"])
 
 
 def _build_experience(
@@ -219,16 +262,29 @@ def _build_experience(
     styles: dict[str, ParagraphStyle],
     content_format: str = "standard",
     split_in_row: int = 1,
+    spacing: float = 1.0,
+    deferred: bool = False,
+    table_layout: str = "project",
 ) -> list:
-    """Build 職務経歴 section with company and project tables."""
+    """Build 職務経歴 section with company and project tables.
+
+    With deferred, each company's tables are DeferredFlowables built only
+    when the layout reaches them.
+    """
     if not data.experience:
         return []
     elements = []
-    elements.append(Paragraph("■職務経歴", styles["section_header"]))
+    elements.append(_section_header("職務経歴", styles))
 
     for company in data.experience:
-        elements.extend(_build_company_table(company, styles, content_format, split_in_row))
-        elements.append(Spacer(1, 3 * mm))
+        build = partial(
+            _build_company_table, company, styles, content_format, split_in_row, deferred, table_layout,
+        )
+        if deferred:
+            elements.append(DeferredFlowables(build))
+        else:
+            elements.extend(build())
+        elements.append(Spacer(1, SPACE_COMPANY * spacing))
 
     return elements
 
@@ -238,13 +294,19 @@ def _build_company_table(
     styles: dict[str, ParagraphStyle],
     content_format: str = "standard",
     split_in_row: int = 1,
+    deferred: bool = False,
+    table_layout: str = "project",
 ) -> list:
-    """Build a single company's table (header + info + projects)."""
+    """Build a single company's table (header + info + projects).
+
+    table_layout "project" gives each project its own table (with deferred,
+    each one is a DeferredFlowables); "company" puts all projects into one
+    table whose column headers repeat at the top of each page.
+    """
     elements = []
 
     # Company header row: period + company name (full width)
-    header_text = f"{_escape(company.period)}　{_escape(company.company)}"
-    header_para = Paragraph(header_text, styles["company_header"])
+    header_para = _plain_paragraph([f"{company.period}　{company.company}"], styles["company_header"])
 
     header_table = Table(
         [[header_para]],
@@ -258,30 +320,29 @@ def _build_company_table(
         ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
         ("LEFTPADDING", (0, 0), (-1, -1), 4),
     ]))
-    elements.append(header_table)
+    elements.append(_anchor(header_table, "company", company.company))
 
     # Company info row: details | employment type
     info_parts = []
     if company.business:
-        info_parts.append(f"事業内容：{_escape(company.business)}")
+        info_parts.append(f"事業内容：{company.business}")
     finance_parts = []
     if company.capital:
-        finance_parts.append(f"資本金：{_escape(company.capital)}")
+        finance_parts.append(f"資本金：{company.capital}")
     if company.revenue:
-        finance_parts.append(f"売上高：{_escape(company.revenue)}")
+        finance_parts.append(f"売上高：{company.revenue}")
     if finance_parts:
         info_parts.append("　".join(finance_parts))
     size_parts = []
     if company.employees:
-        size_parts.append(f"従業員数：{_escape(company.employees)}")
+        size_parts.append(f"従業員数：{company.employees}")
     if company.listing:
-        size_parts.append(f"上場：{_escape(company.listing)}")
+        size_parts.append(f"上場：{company.listing}")
     if size_parts:
         info_parts.append("　".join(size_parts))
 
-    info_text = "<br/>".join(info_parts)
-    info_para = Paragraph(info_text, styles["cell"])
-    emp_para = Paragraph(_escape(company.employment_type), styles["cell"])
+    info_para = _plain_paragraph(info_parts, styles["cell"])
+    emp_para = _plain_paragraph([company.employment_type], styles["cell"])
 
     info_table = Table(
         [[info_para, emp_para]],
@@ -292,15 +353,16 @@ def _build_company_table(
     ]))
     elements.append(info_table)
 
-    # Project rows — each project as a separate table for better page splitting
+    # Project rows — each project as a separate table for better page splitting,
+    # or one table per company (table_layout="company")
     # splitInRow=1: プロジェクト行をページ途中で分割し余白を最小化
     # splitInRow=0: プロジェクトをページ跨ぎせず丸ごと次ページへ送る
     if company.projects:
         col_headers = [
-            Paragraph("<b>期間</b>", styles["cell_gothic"]),
-            Paragraph("<b>内容</b>", styles["cell_gothic"]),
-            Paragraph("<b>開発環境</b>", styles["cell_gothic"]),
-            Paragraph("<b>規模</b>", styles["cell_gothic"]),
+            JapaneseParagraph("<b>期間</b>", styles["cell_gothic"]),
+            JapaneseParagraph("<b>内容</b>", styles["cell_gothic"]),
+            JapaneseParagraph("<b>開発環境</b>", styles["cell_gothic"]),
+            JapaneseParagraph("<b>規模</b>", styles["cell_gothic"]),
         ]
         project_style = TableStyle([
             *_GRID_STYLE,
@@ -308,29 +370,32 @@ def _build_company_table(
             ("ALIGN", (0, 0), (-1, 0), "CENTER"),
         ])
 
-        for project in company.projects:
-            period_cell = _build_period_cell(project, styles)
-            if content_format == "star":
-                content_cell = _build_project_content_star(project, styles)
-            else:
-                content_cell = _build_project_content(project, styles)
-            env_cell = _build_env_cell(project, styles)
-            team_cell = _build_team_cell(project, styles)
-
-            project_table = Table(
-                [col_headers, [period_cell, content_cell, env_cell, team_cell]],
+        if table_layout == "company":
+            projects_table = Table(
+                [col_headers, *(_build_project_row(p, styles, content_format) for p in company.projects)],
                 colWidths=[COL_PERIOD, COL_CONTENT, COL_ENV, COL_TEAM],
                 repeatRows=1,
+                # splitByRow first splits between rows and leaves the rest of
+                # the frame to a remainder that repeats the header mid-page
+                splitByRow=0 if split_in_row else 1,
                 splitInRow=split_in_row,
             )
-            project_table.setStyle(project_style)
-            elements.append(project_table)
+            projects_table.setStyle(project_style)
+            elements.append(projects_table)
+        else:
+            for project in company.projects:
+                build = partial(
+                    _build_project_table, project, styles, content_format, split_in_row, col_headers, project_style,
+                )
+                if deferred:
+                    elements.append(DeferredFlowables(build))
+                else:
+                    elements.extend(build())
 
     # Other activities section
     if company.other_activities:
-        header_para = Paragraph("<b>その他取り組み内容</b>", styles["cell_gothic"])
-        items_text = "<br/>".join(f"・{_escape(a)}" for a in company.other_activities)
-        items_para = Paragraph(items_text, styles["cell"])
+        header_para = JapaneseParagraph("<b>その他取り組み内容</b>", styles["cell_gothic"])
+        items_para = _plain_paragraph([f"・{a}" for a in company.other_activities], styles["cell"])
         activities_table = Table(
             [[header_para], [items_para]],
             colWidths=[CONTENT_WIDTH],
@@ -345,35 +410,69 @@ def _build_company_table(
     return elements
 
 
+def _build_project_row(
+    project: _ProjectBase,
+    styles: dict[str, ParagraphStyle],
+    content_format: str,
+) -> list:
+    """Build one project's row: period | content | environment | team."""
+    period_cell = _build_period_cell(project, styles)
+    if content_format == "star":
+        content_cell = _build_project_content_star(project, styles)
+    else:
+        content_cell = _build_project_content(project, styles)
+    return [period_cell, content_cell, _build_env_cell(project, styles), _build_team_cell(project, styles)]
+
+
+def _build_project_table(
+    project: _ProjectBase,
+    styles: dict[str, ParagraphStyle],
+    content_format: str,
+    split_in_row: int,
+    col_headers: list,
+    project_style: TableStyle,
+) -> list:
+    """Build one project's table (column headers + project row)."""
+    project_table = Table(
+        [col_headers, _build_project_row(project, styles, content_format)],
+        colWidths=[COL_PERIOD, COL_CONTENT, COL_ENV, COL_TEAM],
+        repeatRows=1,
+        splitInRow=split_in_row,
+    )
+    project_table.setStyle(project_style)
+    return [project_table]
+
+
 def _build_side_project_content(
     project: SideProject,
     styles: dict[str, ParagraphStyle],
-) -> Paragraph:
+) -> JapaneseParagraph:
     """Build the content column for a side project row."""
     parts = []
     parts.append(f"<b>{_escape(project.name)}</b>")
     if project.description:
         text = _escape(project.description.strip()).replace(chr(10), "<br/>")
         parts.append(text)
-    return Paragraph("<br/>".join(parts), styles["cell"])
+    return JapaneseParagraph("<br/>".join(parts), styles["cell"])
 
 
 def _build_side_experience(
     data: _WorkHistoryBase,
     styles: dict[str, ParagraphStyle],
+    spacing: float = 1.0,
 ) -> list:
     """Build 副業・その他経歴 section."""
     if not data.side_experience:
         return []
     elements = []
-    elements.append(Paragraph("■副業・その他経歴", styles["section_header"]))
+    elements.append(_section_header("副業・その他経歴", styles))
 
     for company in data.side_experience:
         # Company header row: period + company name (grey background)
-        header_text = f"{_escape(company.period)}　{_escape(company.company)}"
+        header_text = f"{company.period}　{company.company}"
         if company.employment_type:
-            header_text += f"（{_escape(company.employment_type)}）"
-        header_para = Paragraph(header_text, styles["company_header"])
+            header_text += f"（{company.employment_type}）"
+        header_para = _plain_paragraph([header_text], styles["company_header"])
 
         header_table = Table(
             [[header_para]],
@@ -387,21 +486,21 @@ def _build_side_experience(
             ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
             ("LEFTPADDING", (0, 0), (-1, -1), 4),
         ]))
-        elements.append(header_table)
+        elements.append(_anchor(header_table, "company", company.company))
 
         # Project rows
         if company.projects:
             col_headers = [
-                Paragraph("<b>期間</b>", styles["cell_gothic"]),
-                Paragraph("<b>内容</b>", styles["cell_gothic"]),
-                Paragraph("<b>開発環境</b>", styles["cell_gothic"]),
-                Paragraph("<b>規模</b>", styles["cell_gothic"]),
+                JapaneseParagraph("<b>期間</b>", styles["cell_gothic"]),
+                JapaneseParagraph("<b>内容</b>", styles["cell_gothic"]),
+                JapaneseParagraph("<b>開発環境</b>", styles["cell_gothic"]),
+                JapaneseParagraph("<b>規模</b>", styles["cell_gothic"]),
             ]
             table_data = [col_headers]
 
             for project in company.projects:
-                period_cell = Paragraph(
-                    _escape(project.period).replace("～", "<br/>～<br/>"),
+                period_cell = _plain_paragraph(
+                    project.period.replace("～", "\n～\n").split("\n"),
                     styles["cell"],
                 )
                 content_cell = _build_side_project_content(project, styles)
@@ -420,24 +519,28 @@ def _build_side_experience(
             ]))
             elements.append(project_table)
 
-        elements.append(Spacer(1, 3 * mm))
+        elements.append(Spacer(1, SPACE_COMPANY * spacing))
 
     return elements
 
 
-def _build_technical_skills(data: _WorkHistoryBase, styles: dict[str, ParagraphStyle]) -> list:
+def _build_technical_skills(
+    data: _WorkHistoryBase,
+    styles: dict[str, ParagraphStyle],
+    spacing: float = 1.0,
+) -> list:
     """Build テクニカルスキル section."""
     if not data.technical_skills:
         return []
     elements = []
-    elements.append(Paragraph("■テクニカルスキル", styles["section_header"]))
+    elements.append(_section_header("テクニカルスキル", styles))
 
     # Header row
     table_data = [[
-        Paragraph("<b>種類</b>", styles["cell_gothic"]),
-        Paragraph("<b>名称</b>", styles["cell_gothic"]),
-        Paragraph("<b>使用期間</b>", styles["cell_gothic"]),
-        Paragraph("<b>レベル</b>", styles["cell_gothic"]),
+        JapaneseParagraph("<b>種類</b>", styles["cell_gothic"]),
+        JapaneseParagraph("<b>名称</b>", styles["cell_gothic"]),
+        JapaneseParagraph("<b>使用期間</b>", styles["cell_gothic"]),
+        JapaneseParagraph("<b>レベル</b>", styles["cell_gothic"]),
     ]]
 
     span_commands = []
@@ -447,10 +550,10 @@ def _build_technical_skills(data: _WorkHistoryBase, styles: dict[str, ParagraphS
         cat_start = row_idx
         for item in cat.items:
             table_data.append([
-                Paragraph(_escape(cat.category), styles["cell_gothic"]),
-                Paragraph(_escape(item.name), styles["cell"]),
-                Paragraph(_escape(item.period), styles["cell"]),
-                Paragraph(_escape(item.level), styles["cell"]),
+                _plain_paragraph([cat.category], styles["cell_gothic"]),
+                _plain_paragraph([item.name], styles["cell"]),
+                _plain_paragraph([item.period], styles["cell"]),
+                _plain_paragraph([item.level], styles["cell"]),
             ])
             row_idx += 1
 
@@ -469,23 +572,27 @@ def _build_technical_skills(data: _WorkHistoryBase, styles: dict[str, ParagraphS
     ])
     skill_table.setStyle(skill_style)
     elements.append(skill_table)
-    elements.append(Spacer(1, 2 * mm))
+    elements.append(Spacer(1, SPACE_SECTION * spacing))
 
     return elements
 
 
-def _build_qualifications(data: _WorkHistoryBase, styles: dict[str, ParagraphStyle]) -> list:
+def _build_qualifications(
+    data: _WorkHistoryBase,
+    styles: dict[str, ParagraphStyle],
+    spacing: float = 1.0,
+) -> list:
     """Build 資格 section."""
     if not data.qualifications:
         return []
     elements = []
-    elements.append(Paragraph("■資格", styles["section_header"]))
+    elements.append(_section_header("資格", styles))
 
     table_data = []
     for q in data.qualifications:
         table_data.append([
-            Paragraph(_escape(q.name), styles["cell"]),
-            Paragraph(_escape(q.date), styles["cell"]),
+            _plain_paragraph([q.name], styles["cell"]),
+            _plain_paragraph([q.date], styles["cell"]),
         ])
 
     qual_table = Table(
@@ -494,7 +601,7 @@ def _build_qualifications(data: _WorkHistoryBase, styles: dict[str, ParagraphSty
     )
     qual_table.setStyle(TableStyle(_GRID_STYLE))
     elements.append(qual_table)
-    elements.append(Spacer(1, 2 * mm))
+    elements.append(Spacer(1, SPACE_SECTION * spacing))
 
     return elements
 
@@ -504,13 +611,11 @@ def _build_self_pr(data: _WorkHistoryBase, styles: dict[str, ParagraphStyle]) ->
     if not data.self_pr:
         return []
     elements = []
-    elements.append(Paragraph("■自己PR", styles["section_header"]))
+    elements.append(_section_header("自己PR", styles))
 
     for pr in data.self_pr:
-        title_text = f"＜{_escape(pr.title)}＞"
-        elements.append(Paragraph(title_text, styles["section_header"]))
-        content = _escape(pr.content.strip()).replace("\n", "<br/>")
-        elements.append(Paragraph(content, styles["body"]))
+        elements.append(_plain_paragraph([f"＜{pr.title}＞"], styles["section_header"]))
+        elements.append(_plain_paragraph(pr.content.strip().split("\n"), styles["body"]))
 
     return elements
 
@@ -553,27 +658,172 @@ def _build_elements(
     styles: dict[str, ParagraphStyle],
     content_format: str = "standard",
     split_in_row: int = 1,
+    spacing: float = 1.0,
+    deferred: bool = False,
+    table_layout: str = "project",
 ) -> list:
-    """Build all flowable elements for the PDF."""
+    """Build all flowable elements for the PDF.
+
+    deferred: build the 職務経歴 tables lazily (see DeferredFlowables); the
+    document template must then be a DeferringDocTemplate.
+    """
     elements = []
     elements.extend(_build_header(data, styles))
     elements.extend(_build_summary(data, styles))
-    elements.extend(_build_highlights(data, styles))
-    elements.extend(_build_experience(data, styles, content_format, split_in_row))
-    elements.extend(_build_side_experience(data, styles))
-    elements.extend(_build_technical_skills(data, styles))
-    elements.extend(_build_qualifications(data, styles))
+    elements.extend(_build_highlights(data, styles, spacing))
+    elements.extend(_build_experience(data, styles, content_format, split_in_row, spacing, deferred, table_layout))
+    elements.extend(_build_side_experience(data, styles, spacing))
+    elements.extend(_build_technical_skills(data, styles, spacing))
+    elements.extend(_build_qualifications(data, styles, spacing))
     elements.extend(_build_self_pr(data, styles))
-    elements.append(Paragraph("以上", styles["right"]))
+    elements.append(JapaneseParagraph("以上", styles["right"]))
     return elements
 
 
+def _page_number_drawer(font_name: str, total_pages: int, offset: int = 0):
+    """onPage callback drawing "n / total", numbering from the page after offset."""
+
+    def on_page_with_total(canvas, doc):
+        canvas.saveState()
+        canvas.setFont(font_name, 8)
+        page_num = canvas.getPageNumber() - offset
+        text = f"{page_num} / {total_pages}"
+        canvas.drawRightString(
+            A4[0] - MARGIN_RIGHT,
+            MARGIN_BOTTOM - 5 * mm,
+            text,
+        )
+        canvas.restoreState()
+
+    return on_page_with_total
+
+
+def _make_doc(output, on_page, doc_class=BaseDocTemplate, leading_templates=()) -> BaseDocTemplate:
+    """Create the A4 single-frame document template.
+
+    leading_templates are page templates placed before "main" (the first
+    one is used for page 1).
+    """
+    doc = doc_class(
+        output,
+        pagesize=A4,
+        leftMargin=MARGIN_LEFT,
+        rightMargin=MARGIN_RIGHT,
+        topMargin=MARGIN_TOP,
+        bottomMargin=MARGIN_BOTTOM,
+    )
+    frame = Frame(
+        MARGIN_LEFT,
+        MARGIN_BOTTOM,
+        A4[0] - MARGIN_LEFT - MARGIN_RIGHT,
+        A4[1] - MARGIN_TOP - MARGIN_BOTTOM,
+        id="main",
+    )
+    doc.addPageTemplates([*leading_templates, PageTemplate(id="main", frames=[frame], onPage=on_page)])
+    return doc
+
+
+def _layout(
+    data: _WorkHistoryBase,
+    styles: dict[str, ParagraphStyle],
+    content_format: str = "standard",
+    split_in_row: int = 1,
+    spacing: float = 1.0,
+    deferred: bool = False,
+    table_layout: str = "project",
+) -> LayoutReport:
+    """Run Platypus layout against a NullCanvas (nothing is written)."""
+    page_num_handler = _PageNumCanvas(styles["page_number"].fontName)
+    doc = _make_doc("", page_num_handler.on_page, doc_class=LayoutDocTemplate)
+    with phase("build"):
+        elements = _build_elements(data, styles, content_format, split_in_row, spacing, deferred, table_layout)
+    with phase("layout"):
+        doc.build(elements, canvasmaker=NullCanvas)
+    return LayoutReport(pages=doc.page, anchors=doc.anchors)
+
+
+def layout_pdf(
+    data: _WorkHistoryBase,
+    font_dir: str | Path | None = None,
+    content_format: str = "standard",
+    split_in_row: int = 1,
+    scale: StyleScale | None = None,
+    fallback_font: str | Path | None = None,
+    cache_dir: str | Path | None = None,
+    table_layout: str = "project",
+) -> LayoutReport:
+    """Lay out the 職務経歴書 without producing a PDF.
+
+    Args:
+        data: Validated WorkHistory data.
+        font_dir: Optional directory containing Japanese fonts.
+        content_format: Project content format ("standard" or "star").
+        split_in_row: 1=行途中でページ分割, 0=プロジェクト丸ごと次ページ.
+        scale: Optional style scale factors (see fit_to_pages).
+        fallback_font: Optional font file for characters the Japanese fonts lack.
+        cache_dir: Optional directory to keep parsed font snapshots across runs.
+        table_layout: "project" (one table per project) or "company" (one
+            table per company, column headers repeated on each page).
+
+    Returns:
+        LayoutReport with the total page count and the page / vertical
+        position where each section and company starts.
+    """
+    scale = scale or StyleScale()
+    with phase("fonts"):
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    styles = build_styles(fonts, scale)
+    return _layout(data, styles, content_format, split_in_row, scale.spacing, table_layout=table_layout)
+
+
+def _render(
+    data: _WorkHistoryBase,
+    target: str | BinaryIO,
+    fonts: FontConfig,
+    content_format: str,
+    split_in_row: int,
+    scale: StyleScale,
+    streaming: bool = False,
+    table_layout: str = "project",
+    canvasmaker: type[Canvas] = Canvas,
+) -> Canvas:
+    """Render the PDF into target (a file name or a binary file object).
+
+    streaming: write each page as soon as it is finished and build the
+    flowables lazily, so memory use does not grow with the page count.
+    Returns the canvas the document was drawn on.
+    """
+    styles = build_styles(fonts, scale)
+
+    # First pass: layout only, to get total pages
+    total_pages = _layout(data, styles, content_format, split_in_row, scale.spacing, streaming, table_layout).pages
+
+    # Second pass: real render with correct page numbers
+    # (Platypus consumes the flowables, so they are rebuilt)
+    if streaming:
+        doc = _make_doc(target, _page_number_drawer(fonts.mincho, total_pages), doc_class=DeferringDocTemplate)
+    else:
+        doc = _make_doc(target, _page_number_drawer(fonts.mincho, total_pages))
+    note(pages=total_pages, projects=sum(len(company.projects) for company in data.experience))
+    with phase("build"):
+        elements = _build_elements(data, styles, content_format, split_in_row, scale.spacing, streaming, table_layout)
+    # Platypus lays the document out again while drawing it
+    with phase("write"):
+        doc.build(elements, canvasmaker=StreamingCanvas if streaming else canvasmaker)
+    return doc.canv
+
+
 def build_pdf(
     data: _WorkHistoryBase,
     output: str | Path,
     font_dir: str | Path | None = None,
     content_format: str = "standard",
     split_in_row: int = 1,
+    scale: StyleScale | None = None,
+    fallback_font: str | Path | None = None,
+    cache_dir: str | Path | None = None,
+    streaming: bool = False,
+    table_layout: str = "project",
 ) -> Path:
     """Generate the 職務経歴書 PDF.
 
@@ -583,87 +833,63 @@ def build_pdf(
         font_dir: Optional directory containing Japanese fonts.
         content_format: Project content format ("standard" or "star").
         split_in_row: 1=行途中でページ分割, 0=プロジェクト丸ごと次ページ.
+        scale: Optional style scale factors (see fit_to_pages).
+        fallback_font: Optional font file for characters the Japanese fonts lack.
+        cache_dir: Optional directory to keep parsed font snapshots across runs.
+        streaming: Write each page to the file as soon as it is finished, so
+            memory use stays flat however many pages the document has.
+        table_layout: "project" (one table per project) or "company" (one
+            table per company, column headers repeated on each page).
 
     Returns:
         Path to the generated PDF.
     """
     output = Path(output)
-    fonts = register_fonts(font_dir)
-    styles = build_styles(fonts)
-
-    # Collect all flowable elements
-    elements = _build_elements(data, styles, content_format, split_in_row)
-
-    # Build the document with page numbers
-    page_num_handler = _PageNumCanvas(fonts.mincho)
-
-    frame = Frame(
-        MARGIN_LEFT,
-        MARGIN_BOTTOM,
-        A4[0] - MARGIN_LEFT - MARGIN_RIGHT,
-        A4[1] - MARGIN_TOP - MARGIN_BOTTOM,
-        id="main",
-    )
-
-    doc = BaseDocTemplate(
-        str(output),
-        pagesize=A4,
-        leftMargin=MARGIN_LEFT,
-        rightMargin=MARGIN_RIGHT,
-        topMargin=MARGIN_TOP,
-        bottomMargin=MARGIN_BOTTOM,
-    )
-
-    page_template = PageTemplate(
-        id="main",
-        frames=[frame],
-        onPage=page_num_handler.on_page,
-    )
-    doc.addPageTemplates([page_template])
-
-    # First pass: build to get total pages
-    doc.build(elements)
+    with phase("fonts"):
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    _render(data, str(output), fonts, content_format, split_in_row, scale or StyleScale(), streaming, table_layout)
+    return output
 
-    # Now we know total pages, rebuild with correct page numbers
-    total_pages = doc.page
 
-    def on_page_with_total(canvas, doc):
-        canvas.saveState()
-        canvas.setFont(fonts.mincho, 8)
-        page_num = canvas.getPageNumber()
-        text = f"{page_num} / {total_pages}"
-        canvas.drawRightString(
-            A4[0] - MARGIN_RIGHT,
-            MARGIN_BOTTOM - 5 * mm,
-            text,
-        )
-        canvas.restoreState()
+def render_pdf(
+    data: _WorkHistoryBase,
+    font_dir: str | Path | None = None,
+    content_format: str = "standard",
+    split_in_row: int = 1,
+    scale: StyleScale | None = None,
+    fallback_font: str | Path | None = None,
+    cache_dir: str | Path | None = None,
+    table_layout: str = "project",
+) -> bytes:
+    """Generate the 職務経歴書 PDF in memory and return its bytes.
+
+    Takes the same options as build_pdf.
+    """
+    buffer = BytesIO()
+    with phase("fonts"):
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    _render(data, buffer, fonts, content_format, split_in_row, scale or StyleScale(), table_layout=table_layout)
+    return buffer.getvalue()
 
-    doc2 = BaseDocTemplate(
-        str(output),
-        pagesize=A4,
-        leftMargin=MARGIN_LEFT,
-        rightMargin=MARGIN_RIGHT,
-        topMargin=MARGIN_TOP,
-        bottomMargin=MARGIN_BOTTOM,
-    )
 
-    page_template2 = PageTemplate(
-        id="main",
-        frames=[Frame(
-            MARGIN_LEFT,
-            MARGIN_BOTTOM,
-            A4[0] - MARGIN_LEFT - MARGIN_RIGHT,
-            A4[1] - MARGIN_TOP - MARGIN_BOTTOM,
-            id="main",
-        )],
-        onPage=on_page_with_total,
+def plan_pdf(
+    data: _WorkHistoryBase,
+    font_dir: str | Path | None = None,
+    content_format: str = "standard",
+    split_in_row: int = 1,
+    scale: StyleScale | None = None,
+    fallback_font: str | Path | None = None,
+    cache_dir: str | Path | None = None,
+    table_layout: str = "project",
+) -> RenderPlan:
+    """Lay out the 職務経歴書 into a RenderPlan (see render_plan.paint_pdf).
+
+    Takes the same options as render_pdf; painting the plan gives the same PDF.
+    """
+    with phase("fonts"):
+        fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    canvas = _render(
+        data, BytesIO(), fonts, content_format, split_in_row, scale or StyleScale(),
+        table_layout=table_layout, canvasmaker=PlanRecorder,
     )
-    doc2.addPageTemplates([page_template2])
-
-    # Rebuild elements (Platypus consumes them)
-    elements2 = _build_elements(data, styles, content_format, split_in_row)
-
-    doc2.build(elements2)
-
-    return output
+    return canvas.plan
@@ -0,0 +1,77 @@
+"""Fit a 職務経歴書 into a maximum page count by shrinking the styles."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.work_history.builder import _layout
+from jp_tenshoku_docs_builder.work_history.models import _WorkHistoryBase
+from jp_tenshoku_docs_builder.work_history.styles import StyleScale, build_styles
+
+
+@dataclass
+class FitResult:
+    """Outcome of fit_to_pages."""
+
+    scale: StyleScale
+    pages: int
+    passes: int  # number of layout-only passes that were run
+
+
+def fit_to_pages(
+    data: _WorkHistoryBase,
+    max_pages: int,
+    font_dir: str | Path | None = None,
+    content_format: str = "standard",
+    split_in_row: int = 1,
+    tolerance: float = 0.01,
+    fallback_font: str | Path | None = None,
+    cache_dir: str | Path | None = None,
+    table_layout: str = "project",
+) -> FitResult:
+    """Find the largest uniform style scale that fits into max_pages.
+
+    Binary search over StyleScale.uniform(factor) between the readability
+    floor and 1.0, using layout-only passes (no PDF is written). Converges
+    in about log2(0.2 / tolerance) + 2 passes.
+
+    Raises:
+        ValueError: if even the readability floor needs more than max_pages.
+    """
+    if max_pages < 1:
+        raise ValueError(f"max_pages must be >= 1: {max_pages}")
+
+    fonts = register_fonts(font_dir, fallback_font, cache_dir)
+    passes = 0
+
+    def pages_at(factor: float) -> int:
+        nonlocal passes
+        passes += 1
+        scale = StyleScale.uniform(factor)
+        styles = build_styles(fonts, scale)
+        return _layout(data, styles, content_format, split_in_row, scale.spacing, table_layout=table_layout).pages
+
+    pages = pages_at(1.0)
+    if pages <= max_pages:
+        return FitResult(StyleScale(), pages, passes)
+
+    floor = StyleScale.readability_floor()
+    floor_pages = pages_at(floor)
+    if floor_pages > max_pages:
+        raise ValueError(
+            f"Cannot fit into {max_pages} page(s): still {floor_pages} pages "
+            f"at the readability floor (scale {floor:.2f})"
+        )
+
+    # Invariant: lo fits, hi does not
+    lo, hi, best_pages = floor, 1.0, floor_pages
+    while hi - lo > tolerance:
+        mid = (lo + hi) / 2
+        pages = pages_at(mid)
+        if pages <= max_pages:
+            lo, best_pages = mid, pages
+        else:
+            hi = mid
+    return FitResult(StyleScale.uniform(lo), best_pages, passes)
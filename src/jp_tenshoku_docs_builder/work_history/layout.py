@@ -0,0 +1,85 @@
+"""Layout-only Platypus pass (no PDF output) for 職務経歴書.
+
+Flowables are laid out exactly as in a real render, but against a canvas
+that discards finished pages and never saves, so font subsetting,
+stream compression and file I/O are skipped entirely.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+
+from reportlab.lib.units import mm
+from reportlab.pdfgen.canvas import Canvas
+
+from jp_tenshoku_docs_builder.streaming import DeferringDocTemplate
+
+# Attribute name used by the builder to tag flowables whose position should
+# be reported (value: (kind, label) tuple).
+ANCHOR_ATTR = "_layout_anchor"
+
+
+class NullCanvas(Canvas):
+    """Canvas that throws away each finished page and never writes a file."""
+
+    def showPage(self):
+        if self._onPage:
+            self._onPage(self._pageNumber)
+        self._startPage()
+
+    def save(self):
+        pass
+
+
+@dataclass
+class LayoutAnchor:
+    """Position where a tagged flowable (section / company) starts."""
+
+    kind: str  # "section" or "company"
+    label: str
+    page: int
+    y_mm: float  # distance from the top edge of the page
+
+
+@dataclass
+class LayoutReport:
+    """Result of a layout-only pass."""
+
+    pages: int
+    anchors: list[LayoutAnchor] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"pages": self.pages, "anchors": [asdict(a) for a in self.anchors]}
+
+    def to_text(self) -> str:
+        lines = [f"pages: {self.pages}"]
+        for a in self.anchors:
+            lines.append(f"p{a.page:<3} {a.y_mm:6.1f}mm  {a.kind:<8} {a.label}")
+        return "\n".join(lines)
+
+
+class LayoutDocTemplate(DeferringDocTemplate):
+    """DeferringDocTemplate that records where tagged flowables are placed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.anchors: list[LayoutAnchor] = []
+        self._slot_top: float = 0.0
+
+    def handle_flowable(self, flowables):
+        # Remember the frame cursor before placement; afterFlowable is only
+        # called when the flowable was drawn into this same frame.
+        frame = getattr(self, "frame", None)
+        if frame is not None:
+            self._slot_top = frame._y
+            if not frame._atTop and flowables and flowables[0] is not None:
+                self._slot_top -= flowables[0].getSpaceBefore()
+        super().handle_flowable(flowables)
+
+    def afterFlowable(self, flowable):
+        anchor = getattr(flowable, ANCHOR_ATTR, None)
+        if anchor is None:
+            return
+        kind, label = anchor
+        y_mm = (self.pagesize[1] - self._slot_top) / mm
+        self.anchors.append(LayoutAnchor(kind, label, self.page, round(y_mm, 1)))
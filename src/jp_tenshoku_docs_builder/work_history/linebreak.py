@@ -0,0 +1,217 @@
+"""Japanese line breaking (禁則処理) for Platypus paragraphs.
+
+ReportLab's ``wordWrap="CJK"`` mode only hangs a single character that may
+not start a line and measures every glyph with ``stringWidth``. Here a
+paragraph's text is measured once through the cached glyph-width tables
+and broken with the usual rules:
+
+- 行頭禁則: closing brackets, small kana, ー etc. never start a line.
+  、。 hang into the right margin (ぶら下げ); the rest push the previous
+  character down (追い出し).
+- 行末禁則: opening brackets and prefix symbols never end a line.
+- Latin words and numbers are not split unless a single word is wider
+  than the line.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from reportlab.lib.textsplit import ALL_CANNOT_END, ALL_CANNOT_START
+from reportlab.pdfbase.pdfmetrics import getAscentDescent
+from reportlab.platypus import Paragraph
+from reportlab.platypus.paragraph import FragLine, ParaLines
+from reportlab.rl_config import _FUZZ
+
+from jp_tenshoku_docs_builder.coverage import split_runs
+from jp_tenshoku_docs_builder.metrics import glyph_widths
+
+# Characters that may not start a line (ReportLab's table plus common
+# full-width punctuation it lacks)
+CANNOT_START = ALL_CANNOT_START + "）〕］｝〉》」』】〙〗〟｠»・：；！？，．～"
+
+# Characters that may not end a line
+CANNOT_END = ALL_CANNOT_END + "（〔［｛〈《「『【〘〖〝｟«"
+
+# Line-start prohibited characters that hang in the margin instead of
+# pushing the previous character to the next line
+HANGING = "、。，．,."
+
+_SPACES = " 　"
+_LINE_BREAK = "\n"  # placeholder for a <br/> fragment
+
+
+def _is_word_char(ch: str) -> bool:
+    """Latin letters, digits and ASCII symbols that belong to one word."""
+    return ord(ch) < 0x3000 and ch not in _SPACES and ch != _LINE_BREAK
+
+
+def _break_point(text: str, start: int, overflow: int) -> int:
+    """Return the end of a line that starts at start and overflows at overflow."""
+    end = max(overflow, start + 1)
+    if end >= len(text):
+        return end
+    # Don't split inside a Latin word when the line has an earlier break
+    if _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+        word_start = end - 1
+        while word_start > start and _is_word_char(text[word_start - 1]):
+            word_start -= 1
+        if word_start > start:
+            end = word_start
+    # Only a single character hangs: with a closing bracket after it (。」)
+    # the pair moves to the next line like any other prohibited start
+    if text[end] in HANGING and (end + 1 == len(text) or text[end + 1] not in CANNOT_START):
+        return end + 1
+    while end > start + 1 and text[end] in CANNOT_START:
+        end -= 1
+    while end > start + 1 and text[end - 1] in CANNOT_END:
+        end -= 1
+    return end
+
+
+def kinsoku_split(frags: list, max_widths: list[float]) -> ParaLines:
+    """Break paragraph fragments into lines using Japanese line-breaking rules.
+
+    Returns ParaLines of kind 1 (lines of FragLine), the same structure
+    Paragraph.breakLinesCJK produces, so drawing and splitting across
+    frames/table rows work unchanged.
+    """
+    # Flatten the fragments into one string with per-character widths.
+    parts: list[str] = []
+    widths: list[float] = []
+    starts: list[int] = []  # start offset of each fragment in text
+    pos = 0
+    for f in frags:
+        starts.append(pos)
+        if getattr(f, "lineBreak", False):
+            chunk = _LINE_BREAK
+            widths.append(0.0)
+        else:
+            chunk = f.text
+            scale = f.fontSize / 1000
+            widths.extend(w * scale for w in glyph_widths(f.fontName).advances(chunk))
+        parts.append(chunk)
+        pos += len(chunk)
+    text = "".join(parts)
+    cumulative = [0.0, *accumulate(widths)]  # cumulative[i] = width of text[:i]
+    forced = [i for i, ch in enumerate(text) if ch == _LINE_BREAK]
+
+    lines = []
+    start = 0
+    n = len(text)
+    while start < n:
+        max_width = max_widths[min(len(lines), len(max_widths) - 1)]
+        overflow = bisect_right(cumulative, cumulative[start] + max_width + _FUZZ) - 1
+        k = bisect_left(forced, start)
+        line_break = k < len(forced) and forced[k] <= overflow
+        if line_break:
+            end = next_start = forced[k]
+            next_start += 1
+        else:
+            end = next_start = _break_point(text, start, overflow)
+            while next_start < n and text[next_start] in _SPACES:
+                next_start += 1
+        stop = end
+        while stop > start and text[stop - 1] in _SPACES:
+            stop -= 1
+        used = cumulative[stop] - cumulative[start]
+        lines.append(_make_line(frags, starts, text, start, stop, max_width, used, line_break))
+        start = next_start
+
+    return ParaLines(kind=1, lines=lines)
+
+
+def _make_line(frags: list, starts: list[int], text: str, start: int, stop: int,
+               max_width: float, used: float, line_break: bool) -> FragLine:
+    """Build a FragLine from text[start:stop], one word per fragment run."""
+    words = []
+    font_size = ascent = descent = 0
+    i = max(bisect_right(starts, start) - 1, 0)
+    while i < len(frags) and starts[i] < stop:
+        f = frags[i]
+        seg_end = starts[i + 1] if i + 1 < len(frags) else len(text)
+        piece = text[max(start, starts[i]):min(stop, seg_end)]
+        if piece and not getattr(f, "lineBreak", False):
+            words.append(f.clone(text=piece))
+            a, d = getAscentDescent(f.fontName, f.fontSize)
+            font_size = max(font_size, f.fontSize)
+            ascent = max(ascent, a)
+            descent = min(descent, d)
+        i += 1
+    if not words:  # empty line between two <br/>
+        f = frags[min(max(bisect_right(starts, start) - 1, 0), len(frags) - 1)]
+        words.append(f.clone(text=""))
+        font_size = f.fontSize
+        ascent, descent = getAscentDescent(f.fontName, f.fontSize)
+    return FragLine(
+        kind=1, extraSpace=max_width - used, wordCount=1, words=words,
+        fontSize=font_size, ascent=ascent, descent=descent,
+        maxWidth=max_width, currentWidth=used, lineBreak=line_break,
+    )
+
+
+def _split_lines(blPara: ParaLines, start: int, stop: int) -> list:
+    """Fragments for lines[start:stop] when a paragraph is split across frames.
+
+    Unlike ReportLab's splitter this adds no space at line ends (which would
+    show up mid-line once the remainder is re-wrapped) and keeps <br/>.
+    """
+    frags = []
+    for line in blPara.lines[start:stop]:
+        frags.extend(w for w in line.words if w.text)
+        if line.lineBreak:
+            frags.append(line.words[-1].clone(text="", lineBreak=True))
+    return frags
+
+
+def _route_fallback(frags: list, fallback: str) -> list:
+    """Move runs of characters a fragment's font lacks into fallback-font fragments."""
+    routed = []
+    for f in frags:
+        text = getattr(f, "text", "")
+        if not text or f.fontName == fallback or hasattr(f, "cbDefn"):
+            routed.append(f)
+            continue
+        runs = split_runs(text, f.fontName, fallback)
+        if len(runs) == 1 and runs[0][0] == f.fontName:
+            routed.append(f)
+        else:
+            routed.extend(f.clone(text=run, fontName=font) for font, run in runs)
+    return routed
+
+
+class JapaneseParagraph(Paragraph):
+    """Paragraph that wraps with kinsoku_split when style.wordWrap is "CJK".
+
+    If the style has a fallbackFontName, characters missing from a
+    fragment's font are drawn with that font instead.
+    """
+
+    def __init__(self, text, style=None, *args, **kwargs):
+        super().__init__(text, style, *args, **kwargs)
+        fallback = getattr(self.style, "fallbackFontName", None)
+        if fallback:
+            self.frags = _route_fallback(self.frags, fallback)
+
+    def _kinsoku(self) -> bool:
+        return (
+            self.style.wordWrap == "CJK"
+            and not self.bulletText
+            and not any(hasattr(f, "cbDefn") for f in self.frags)
+        )
+
+    def breakLinesCJK(self, maxWidths):
+        if not isinstance(maxWidths, (list, tuple)):
+            maxWidths = [maxWidths]
+        if hasattr(self, "blPara") and getattr(self, "_splitpara", 0):
+            return self.blPara
+        if not self._kinsoku():
+            return super().breakLinesCJK(maxWidths)
+        self.height = 0
+        return kinsoku_split(self.frags, maxWidths)
+
+    def _get_split_blParaFunc(self):
+        if self.blPara.kind == 1 and self._kinsoku():
+            return _split_lines
+        return super()._get_split_blParaFunc()
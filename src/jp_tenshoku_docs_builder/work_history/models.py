@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from pydantic import BaseModel, ConfigDict
 
+from jp_tenshoku_docs_builder.work_history.period import Period, parse_period
+
 
 class Environment(BaseModel):
     """開発環境."""
@@ -18,8 +20,31 @@ class Environment(BaseModel):
     tools: list[str] = []
     other: list[str] = []
 
+    def categories(self) -> list[tuple[str, list[str]]]:
+        """Return (display label, items) pairs in display order."""
+        return [
+            ("言語", self.languages),
+            ("OS", self.os),
+            ("DB", self.db),
+            ("FW", self.frameworks),
+            ("AWS", self.aws),
+            ("Azure", self.azure),
+            ("GCP", self.gcp),
+            ("ツール", self.tools),
+            ("その他", self.other),
+        ]
+
+
+class _Dated:
+    """Mixin for models with a free-form ``period``."""
+
+    @property
+    def span(self) -> Period | None:
+        """period parsed into start/end months, None if it names no month."""
+        return parse_period(self.period)
+
 
-class _ProjectBase(BaseModel):
+class _ProjectBase(_Dated, BaseModel):
     """プロジェクト共通フィールド."""
 
     model_config = ConfigDict(extra="forbid")
@@ -55,7 +80,7 @@ class StarProject(_ProjectBase):
 Project = StandardProject
 
 
-class _CompanyBase(BaseModel):
+class _CompanyBase(_Dated, BaseModel):
     """会社経歴の共通フィールド."""
 
     company: str
@@ -85,7 +110,7 @@ class StarCompany(_CompanyBase):
 Company = StandardCompany
 
 
-class SideProject(BaseModel):
+class SideProject(_Dated, BaseModel):
     """副業・その他経歴のプロジェクト."""
 
     model_config = ConfigDict(extra="forbid")
@@ -99,7 +124,7 @@ class SideProject(BaseModel):
     role: str = ""
 
 
-class SideCompany(BaseModel):
+class SideCompany(_Dated, BaseModel):
     """副業・その他経歴の会社."""
 
     company: str
@@ -0,0 +1,90 @@
+"""Structured start/end months of the free-form ``period`` strings.
+
+Periods are written as in the sample data ("2020年4月～現在",
+"2018年4月～2020年3月") and in common variants: "2020/04 - 2021/03",
+"2020.4～", full-width digits, Japanese eras ("令和2年4月", "平成元年"),
+a year without a month, or a single month. Anything else (including the
+"20xx年xx月" placeholders of the samples) parses to None.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+
+_ERAS = {"令和": 2018, "平成": 1988, "昭和": 1925}
+
+# era year or four-digit year, then 年 [n月] or a "/", ".", "-" separated month
+_DATE = re.compile(
+    r"(?:(令和|平成|昭和)\s*(元|\d{1,2})|(?<!\d)(\d{4}))\s*"
+    r"(?:年\s*(?:(\d{1,2})\s*月)?|[/.\-]\s*(\d{1,2})(?!\d)\s*月?)"
+)
+_RANGE = re.compile(r"\s*[~〜\-–—]")
+_CURRENT = re.compile(r"現在|在職中|継続中|present", re.IGNORECASE)
+_YEAR_MONTH = re.compile(r"(\d{4})-(\d{1,2})")
+
+
+@dataclass(frozen=True, order=True)
+class YearMonth:
+    """A calendar month."""
+
+    year: int
+    month: int
+
+    def __post_init__(self):
+        if not 1 <= self.month <= 12:
+            raise ValueError(f"month must be between 1 and 12: {self.month}")
+
+    @classmethod
+    def parse(cls, text: str) -> YearMonth:
+        """Parse "YYYY-MM" (as given on the command line)."""
+        match = _YEAR_MONTH.fullmatch(text.strip())
+        if not match:
+            raise ValueError(f"expected YYYY-MM: {text!r}")
+        return cls(int(match[1]), int(match[2]))
+
+    def __str__(self) -> str:
+        return f"{self.year:04d}-{self.month:02d}"
+
+
+@dataclass(frozen=True)
+class Period:
+    """Parsed period; an ongoing one ("～現在") has end None and current True."""
+
+    start: YearMonth
+    end: YearMonth | None
+    current: bool = False
+
+    def reaches(self, month: YearMonth) -> bool:
+        """Whether the period lasts until month or later."""
+        return self.current or (self.end or self.start) >= month
+
+
+def _year_month(match: re.Match, end: bool) -> YearMonth | None:
+    era, era_year, year, month, numeric_month = match.groups()
+    if era:
+        year = _ERAS[era] + (1 if era_year == "元" else int(era_year))
+    month = month or numeric_month
+    try:
+        # A bare year covers the whole year
+        return YearMonth(int(year), int(month) if month else 12 if end else 1)
+    except ValueError:
+        return None
+
+
+def parse_period(text: str) -> Period | None:
+    """Parse a period string, or None when it names no month."""
+    text = unicodedata.normalize("NFKC", text)
+    matches = list(_DATE.finditer(text))[:2]
+    if not matches:
+        return None
+    start = _year_month(matches[0], end=False)
+    if start is None:
+        return None
+    if len(matches) == 2:
+        end = _year_month(matches[1], end=True)
+        return Period(start, end) if end is not None and end >= start else None
+    if _CURRENT.search(text, matches[0].end()) or _RANGE.match(text, matches[0].end()):
+        return Period(start, None, current=True)
+    return Period(start, _year_month(matches[0], end=True))
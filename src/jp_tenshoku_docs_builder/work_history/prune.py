@@ -0,0 +1,75 @@
+"""Partial rendering: prune a 職務経歴書 to some sections and recent projects.
+
+The pruned copy is rendered like any other model, so the builders and the
+preview only build what is shown. The header (date, name) is always kept.
+
+    data = prune(load_yaml(path, credential_path), sections=["experience"], since=YearMonth(2020, 4))
+    pdf = render_pdf(data)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TypeVar
+
+from jp_tenshoku_docs_builder.work_history.models import _Dated, _WorkHistoryBase
+from jp_tenshoku_docs_builder.work_history.period import YearMonth
+
+# Sections in document order, named after the model fields
+SECTIONS = (
+    "summary",
+    "highlights",
+    "experience",
+    "side_experience",
+    "technical_skills",
+    "qualifications",
+    "self_pr",
+)
+
+_W = TypeVar("_W", bound=_WorkHistoryBase)
+
+
+def _recent(item: _Dated, since: YearMonth) -> bool:
+    # A period that cannot be parsed is kept: it may well be recent
+    return item.span is None or item.span.reaches(since)
+
+
+def _prune_companies(companies: list, since: YearMonth) -> list:
+    """Companies with only the projects since the month; companies left without any are dropped."""
+    kept = []
+    for company in companies:
+        if not company.projects:
+            if _recent(company, since):
+                kept.append(company)
+            continue
+        projects = [project for project in company.projects if _recent(project, since)]
+        if projects:
+            kept.append(company.model_copy(update={"projects": projects}))
+    return kept
+
+
+def prune(data: _W, sections: Iterable[str] | None = None, since: YearMonth | None = None) -> _W:
+    """Copy of data with only the given sections and the projects since a month.
+
+    sections: names from SECTIONS to keep (None keeps all); the others are
+        emptied, so their builders skip them.
+    since: drop 職務経歴 / 副業 projects that ended before this month. A
+        company whose projects were all dropped is dropped too; periods
+        that cannot be parsed (see period.parse_period) are kept.
+
+    Raises:
+        ValueError: for a name not in SECTIONS.
+    """
+    update = {}
+    if sections is not None:
+        sections = set(sections)
+        unknown = sorted(sections - set(SECTIONS))
+        if unknown:
+            raise ValueError(f"unknown section: {', '.join(unknown)} (choose from {', '.join(SECTIONS)})")
+        fields = type(data).model_fields
+        update = {name: fields[name].get_default(call_default_factory=True) for name in SECTIONS if name not in sections}
+    if since is not None:
+        for name in ("experience", "side_experience"):
+            if name not in update:
+                update[name] = _prune_companies(getattr(data, name), since)
+    return data.model_copy(update=update)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import mm
@@ -23,124 +25,173 @@ BODY_SIZE = 9
 SMALL_SIZE = 8
 TABLE_SIZE = 8
 
+# Spacer heights between blocks (scaled by StyleScale.spacing)
+SPACE_SECTION = 2 * mm
+SPACE_COMPANY = 3 * mm
+
+# Readability floor for --max-pages: no font may shrink below this size,
+# and line spacing never drops below this multiple of the font size.
+MIN_FONT_SIZE = 6.5
+MIN_LEADING_RATIO = 1.2
+
+
+@dataclass(frozen=True)
+class StyleScale:
+    """Scale factors applied on top of the base style constants."""
+
+    font: float = 1.0     # font sizes (TITLE_SIZE ... TABLE_SIZE)
+    leading: float = 1.0  # leading multipliers (e.g. 1.6 → 1.6 * leading)
+    spacing: float = 1.0  # spaceBefore / spaceAfter and spacer heights
+
+    @classmethod
+    def uniform(cls, factor: float) -> StyleScale:
+        return cls(font=factor, leading=factor, spacing=factor)
+
+    @staticmethod
+    def readability_floor() -> float:
+        """Smallest uniform factor that keeps every font at MIN_FONT_SIZE or above."""
+        return MIN_FONT_SIZE / min(BODY_SIZE, SMALL_SIZE, TABLE_SIZE)
+
+
+def build_styles(fonts: FontConfig, scale: StyleScale | None = None) -> dict[str, ParagraphStyle]:
+    """Build all paragraph styles using the given font configuration.
+
+    ``scale`` shrinks or grows font sizes, leading and paragraph spacing
+    (used by the fit-to-N-pages search); None means the base sizes.
+    """
+    scale = scale or StyleScale()
+    # Every style wraps Japanese text per character with 禁則処理
+    # (see linebreak.JapaneseParagraph) instead of at spaces, and draws
+    # characters its font lacks with the fallback font, if any.
+    normal = ParagraphStyle(
+        "CVNormal",
+        parent=getSampleStyleSheet()["Normal"],
+        wordWrap="CJK",
+        fallbackFontName=fonts.fallback,
+    )
+
+    def size(pt: float) -> float:
+        return pt * scale.font
+
+    def leading(pt: float, ratio: float) -> float:
+        return size(pt) * max(ratio * scale.leading, MIN_LEADING_RATIO)
 
-def build_styles(fonts: FontConfig) -> dict[str, ParagraphStyle]:
-    """Build all paragraph styles using the given font configuration."""
-    base = getSampleStyleSheet()
+    def space(length: float) -> float:
+        return length * scale.spacing
 
     styles: dict[str, ParagraphStyle] = {}
 
     styles["title"] = ParagraphStyle(
         "CVTitle",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.gothic,
-        fontSize=TITLE_SIZE,
+        fontSize=size(TITLE_SIZE),
         alignment=TA_CENTER,
-        spaceAfter=2 * mm,
-        leading=TITLE_SIZE * 1.4,
+        spaceAfter=space(2 * mm),
+        leading=leading(TITLE_SIZE, 1.4),
     )
 
     styles["date"] = ParagraphStyle(
         "CVDate",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.mincho,
-        fontSize=BODY_SIZE,
+        fontSize=size(BODY_SIZE),
         alignment=TA_RIGHT,
-        spaceAfter=1 * mm,
+        spaceAfter=space(1 * mm),
     )
 
     styles["name"] = ParagraphStyle(
         "CVName",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.mincho,
-        fontSize=BODY_SIZE,
+        fontSize=size(BODY_SIZE),
         alignment=TA_RIGHT,
-        spaceAfter=3 * mm,
+        spaceAfter=space(3 * mm),
     )
 
     styles["section_header"] = ParagraphStyle(
         "SectionHeader",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.gothic,
-        fontSize=SECTION_HEADER_SIZE,
-        spaceBefore=4 * mm,
-        spaceAfter=2 * mm,
-        leading=SECTION_HEADER_SIZE * 1.4,
+        fontSize=size(SECTION_HEADER_SIZE),
+        spaceBefore=space(4 * mm),
+        spaceAfter=space(2 * mm),
+        leading=leading(SECTION_HEADER_SIZE, 1.4),
     )
 
     styles["body"] = ParagraphStyle(
         "CVBody",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.mincho,
-        fontSize=BODY_SIZE,
-        leading=BODY_SIZE * 1.8,
-        spaceAfter=2 * mm,
+        fontSize=size(BODY_SIZE),
+        leading=leading(BODY_SIZE, 1.8),
+        spaceAfter=space(2 * mm),
     )
 
     styles["bullet"] = ParagraphStyle(
         "CVBullet",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.mincho,
-        fontSize=BODY_SIZE,
-        leading=BODY_SIZE * 1.8,
+        fontSize=size(BODY_SIZE),
+        leading=leading(BODY_SIZE, 1.8),
         leftIndent=4 * mm,
     )
 
     styles["cell"] = ParagraphStyle(
         "CVCell",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.mincho,
-        fontSize=TABLE_SIZE,
-        leading=TABLE_SIZE * 1.6,
+        fontSize=size(TABLE_SIZE),
+        leading=leading(TABLE_SIZE, 1.6),
     )
 
     styles["cell_gothic"] = ParagraphStyle(
         "CVCellGothic",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.gothic,
-        fontSize=TABLE_SIZE,
-        leading=TABLE_SIZE * 1.6,
+        fontSize=size(TABLE_SIZE),
+        leading=leading(TABLE_SIZE, 1.6),
     )
 
     styles["cell_small"] = ParagraphStyle(
         "CVCellSmall",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.mincho,
-        fontSize=SMALL_SIZE,
-        leading=SMALL_SIZE * 1.5,
+        fontSize=size(SMALL_SIZE),
+        leading=leading(SMALL_SIZE, 1.5),
     )
 
     styles["right"] = ParagraphStyle(
         "CVRight",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.mincho,
-        fontSize=BODY_SIZE,
+        fontSize=size(BODY_SIZE),
         alignment=TA_RIGHT,
-        spaceBefore=4 * mm,
+        spaceBefore=space(4 * mm),
     )
 
     styles["page_number"] = ParagraphStyle(
         "PageNumber",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.mincho,
-        fontSize=SMALL_SIZE,
+        fontSize=size(SMALL_SIZE),
         alignment=TA_RIGHT,
     )
 
     styles["company_header"] = ParagraphStyle(
         "CompanyHeader",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.gothic,
-        fontSize=BODY_SIZE,
-        leading=BODY_SIZE * 1.6,
+        fontSize=size(BODY_SIZE),
+        leading=leading(BODY_SIZE, 1.6),
     )
 
     styles["cell_label"] = ParagraphStyle(
         "CVCellLabel",
-        parent=base["Normal"],
+        parent=normal,
         fontName=fonts.gothic,
-        fontSize=TABLE_SIZE,
-        leading=TABLE_SIZE * 1.6,
+        fontSize=size(TABLE_SIZE),
+        leading=leading(TABLE_SIZE, 1.6),
         textColor="black",
     )
 
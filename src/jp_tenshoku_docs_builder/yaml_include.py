@@ -0,0 +1,140 @@
+"""YAML loading with ``!include`` fragments.
+
+A scalar tagged ``!include`` is replaced by the parsed content of the file
+it names, resolved relative to the including file::
+
+    experience:
+      - !include companies/techno.yaml
+    technical_skills: !include shared/skills.yaml
+
+Fragments are parsed with yaml.SafeLoader rules (no Python object tags)
+and may include further fragments. Every fragment must lie inside the
+include root: the directory of the top-level document unless the caller
+passes a wider one (e.g. the directory holding several CV variants and
+the ``shared/`` fragments they use). Absolute paths and ``../`` leading
+out of the root are refused. A missing fragment, a fragment outside the
+root or an include cycle raises a yaml ConstructorError pointing at the
+offending ``!include``.
+
+Recently used parsed fragments are kept in the process, keyed by path and
+checked against the modification time and size of every file they were
+built from, so batch runs over many variants sharing the same fragments
+parse each fragment once. Each include returns its own copy, so callers
+may modify the loaded data.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import yaml
+from yaml.constructor import ConstructorError
+
+INCLUDE_TAG = "!include"
+
+# (path, st_mtime_ns, st_size) of a file as it was read
+_FileStamp = tuple[Path, int, int]
+
+# fragment path -> (stamps of every file it was built from, parsed content),
+# most recently used last
+_MAX_FRAGMENTS = 256
+_fragments: OrderedDict[Path, tuple[tuple[_FileStamp, ...], object]] = OrderedDict()
+_FRAGMENTS_LOCK = threading.Lock()
+
+
+def _stamp(path: Path) -> _FileStamp | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+class IncludeLoader(yaml.SafeLoader):
+    """SafeLoader that resolves !include relative to the file being loaded.
+
+    path should be resolved (it is compared against the include chain).
+    Included files must lie under root, which defaults to the directory
+    of path. After loading, stamps lists the fragments the document
+    included.
+    """
+
+    def __init__(self, stream, path: Path, chain: tuple[Path, ...] = (), root: Path | None = None):
+        super().__init__(stream)
+        self.path = path
+        self.root = root if root is not None else path.parent
+        self.chain = (*chain, path)  # files being loaded, outermost first
+        self.stamps: list[_FileStamp] = []
+
+
+def _construct_include(loader: IncludeLoader, node: yaml.Node) -> object:
+    name = loader.construct_scalar(node) if isinstance(node, yaml.ScalarNode) else None
+    if not name:
+        raise ConstructorError(None, None, "!include needs a file path", node.start_mark)
+    target = (loader.path.parent / name).resolve()
+    if not target.is_relative_to(loader.root):
+        raise ConstructorError(
+            None, None, f"!include target outside {loader.root}: {name}", node.start_mark,
+        )
+    if target in loader.chain:
+        cycle = " -> ".join(str(p) for p in (*loader.chain[loader.chain.index(target):], target))
+        raise ConstructorError(None, None, f"!include cycle: {cycle}", node.start_mark)
+    try:
+        data, stamps = _load_fragment(target, loader.chain, loader.root)
+    except OSError as e:
+        raise ConstructorError(
+            None, None, f"cannot include {name}: {e.strerror or e}", node.start_mark,
+        ) from e
+    loader.stamps.extend(stamps)
+    return data
+
+
+IncludeLoader.add_constructor(INCLUDE_TAG, _construct_include)
+
+
+def _parse(
+    path: Path, chain: tuple[Path, ...] = (), root: Path | None = None,
+) -> tuple[object, list[_FileStamp]]:
+    with path.open(encoding="utf-8") as f:
+        loader = IncludeLoader(f, path, chain, root)
+        try:
+            data = loader.get_single_data()
+        finally:
+            loader.dispose()
+    return data, loader.stamps
+
+
+def _load_fragment(path: Path, chain: tuple[Path, ...], root: Path) -> tuple[object, list[_FileStamp]]:
+    """Parsed content of a fragment (a fresh copy) and the stamps it depends on."""
+    with _FRAGMENTS_LOCK:
+        cached = _fragments.get(path)
+        if cached is not None:
+            _fragments.move_to_end(path)
+    if cached is not None:
+        stamps, data = cached
+        # A fragment that includes a file now being loaded is a cycle, and
+        # one cached under a wider root may include files outside this one:
+        # parse it again so the error names the chain or the include
+        if all(_stamp(s[0]) == s and s[0] not in chain and s[0].is_relative_to(root) for s in stamps):
+            return copy.deepcopy(data), list(stamps)
+
+    st = path.stat()  # taken before reading: an edit during the read is seen next time
+    data, included = _parse(path, chain, root)
+    stamps = ((path, st.st_mtime_ns, st.st_size), *included)
+    with _FRAGMENTS_LOCK:
+        _fragments[path] = (stamps, data)
+        _fragments.move_to_end(path)
+        while len(_fragments) > _MAX_FRAGMENTS:
+            _fragments.popitem(last=False)
+    return copy.deepcopy(data), list(stamps)
+
+
+def load_yaml_file(path: str | Path, root: str | Path | None = None) -> object:
+    """Parse a YAML file, expanding !include fragments (see module docstring).
+
+    Fragments must lie under root (default: the directory of path).
+    """
+    return _parse(Path(path).resolve(), root=Path(root).resolve() if root is not None else None)[0]
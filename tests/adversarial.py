@@ -0,0 +1,260 @@
+"""Adversarial inputs for the render watchdog.
+
+stress_cases() returns hand-picked documents that are slow, fail late or
+use a lot of memory when rendered; fuzz_cases() generates random
+documents from a seed, mixing text that is known to be awkward for the
+line breaker and the Paragraph parser (long unbreakable runs, kinsoku
+characters, markup-like text, emoji, control characters).
+
+Each case names the outcome expected under the benchmarks.stress_watchdog
+defaults (30 s, 256 MiB): "ok" or a RenderFailure kind.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from pydantic import BaseModel
+
+from jp_tenshoku_docs_builder.resume.models import HistoryEntry, Resume
+from jp_tenshoku_docs_builder.work_history.models import (
+    Environment,
+    SelfPRSection,
+    StandardCompany,
+    StandardProject,
+    StandardWorkHistory,
+    StarCompany,
+    StarProject,
+    StarWorkHistory,
+)
+
+# Outcomes a fuzz case may end in: anything but "error" or "crashed"
+SUPERVISED = ("ok", "layout", "timeout", "memory")
+
+
+@dataclass
+class StressCase:
+    """One watchdog input: build(workdir) returns the model to render."""
+
+    name: str
+    kind: str  # "work_history" or "resume"
+    build: Callable[[Path], BaseModel]
+    options: dict = field(default_factory=dict)
+    expect: tuple[str, ...] = ("ok",)
+
+
+def _project(**fields) -> StandardProject:
+    return StandardProject(**{
+        "period": "2020年4月～2021年3月",
+        "industry": "金融業界",
+        "name": "基幹システム刷新",
+        "overview": "既存システムの刷新。",
+        "responsibilities": ["設計・実装"],
+        "environment": Environment(languages=["Python"], os=["Linux"]),
+        "team_size": "全8名",
+        "role": "リーダー",
+        **fields,
+    })
+
+
+def _work_history(projects: list[StandardProject], companies: int = 1, **fields) -> StandardWorkHistory:
+    return StandardWorkHistory(**{
+        "date": "2024年1月1日現在",
+        "name": "山田　太郎",
+        "summary": "業務システムの開発に従事。",
+        "experience": [
+            StandardCompany(company=f"株式会社サンプル{c}", period="2010年4月～現在", projects=projects)
+            for c in range(companies)
+        ],
+        "self_pr": [SelfPRSection(title="自己PR", content="設計から運用まで担当。")],
+        **fields,
+    })
+
+
+def _star_work_history(project: StarProject) -> StarWorkHistory:
+    return StarWorkHistory(
+        date="2024年1月1日現在",
+        name="山田　太郎",
+        experience=[StarCompany(company="株式会社サンプル", period="2010年4月～現在", projects=[project])],
+    )
+
+
+def _star_project(**fields) -> StarProject:
+    return StarProject(**{
+        "period": "2020年4月～2021年3月",
+        "name": "基幹システム刷新",
+        "situation": "老朽化したシステム。",
+        "task": "移行計画の策定。",
+        "action": ["段階移行"],
+        "result": ["障害ゼロで移行"],
+        **fields,
+    })
+
+
+def _resume(**fields) -> Resume:
+    return Resume(**{
+        "date": "2024年1月1日現在",
+        "name_kana": "やまだ　たろう",
+        "name": "山田　太郎",
+        "birth_day": "1990年1月1日生",
+        "education": [HistoryEntry(year="2012", month="3", value="サンプル大学 卒業")],
+        "experience": [HistoryEntry(year="2012", month="4", value="株式会社サンプル 入社")],
+        **fields,
+    })
+
+
+def _large_photo(workdir: Path) -> str:
+    # A few hundred KiB as PNG, 243 MB once decoded
+    from PIL import Image
+
+    path = workdir / "large_photo.png"
+    if not path.exists():
+        Image.new("RGB", (9000, 9000), "white").save(path)
+    return str(path)
+
+
+def stress_cases() -> list[StressCase]:
+    """Hand-picked inputs that exercise each watchdog limit."""
+    return [
+        StressCase(
+            "tall_row_no_split", "work_history",
+            lambda _: _work_history([_project(overview="\n".join(["概要"] * 300))]),
+            {"split_in_row": 0}, ("layout",),
+        ),
+        StressCase(
+            "many_responsibilities", "work_history",
+            lambda _: _work_history([_project(responsibilities=["担当業務"] * 10000)]), expect=("timeout",),
+        ),
+        StressCase(
+            "star_many_actions", "work_history",
+            lambda _: _star_work_history(_star_project(action=["段階移行"] * 10000)),
+            {"content_format": "star"}, ("timeout",),
+        ),
+        StressCase(
+            "unbreakable_latin", "work_history",
+            lambda _: _work_history([_project(overview="x" * 50000)]),
+        ),
+        StressCase(
+            "unbreakable_env_token", "work_history",
+            lambda _: _work_history([_project(environment=Environment(languages=["x" * 5000]))]),
+        ),
+        StressCase(
+            "many_companies", "work_history",
+            lambda _: _work_history([_project()] * 3, companies=300),
+        ),
+        StressCase(
+            "markup_like_text", "work_history",
+            lambda _: _work_history(
+                [_project(overview="<b>太字</b> &amp; <br/> <font size=100>" * 200)],
+                summary="R&D <para> ]]> &#0; " * 200,
+            ),
+        ),
+        StressCase(
+            "resume_huge_motivation", "resume",
+            lambda _: _resume(motivation="志望" * 100000), expect=("timeout",),
+        ),
+        StressCase(
+            "resume_many_lines", "resume",
+            lambda _: _resume(hobby="\n".join(["読書"] * 100000)),
+        ),
+        StressCase(
+            "resume_many_entries", "resume",
+            lambda _: _resume(education=[HistoryEntry(year="2012", month="3", value="卒業")] * 5000),
+        ),
+        StressCase(
+            "resume_large_photo", "resume",
+            lambda workdir: _resume(photo=_large_photo(workdir)), expect=("memory",),
+        ),
+    ]
+
+
+_POOLS = [
+    "職務経歴書の作成を自動化する",
+    "ーっゃ。、」）』！？",  # characters that may not start a line
+    "「（『",  # characters that may not end a line
+    "Python TypeScript PostgreSQL Kubernetes ",
+    "abcdefghijklmnopqrstuvwxyz0123456789",
+    "<b></b><br/>&amp;&lt;&#12354;<font>",
+    "😀🇯🇵👨‍👩‍👧",
+    "é゙​ ﻿",
+    "\t\r\x0b\x0c\x00",
+    "\n",
+    "　 ",
+]
+
+
+def _text(rng: random.Random, max_length: int) -> str:
+    length = min(int(rng.expovariate(1 / 200)), max_length)
+    pools = rng.sample(_POOLS, rng.randint(1, 4))
+    if rng.random() < 0.2:  # one long run without break opportunities
+        return rng.choice(pools)[0] * length
+    return "".join(rng.choice(rng.choice(pools)) for _ in range(length))
+
+
+def _texts(rng: random.Random, max_items: int, max_length: int) -> list[str]:
+    return [_text(rng, max_length) for _ in range(rng.randint(0, max_items))]
+
+
+def _fuzz_work_history(rng: random.Random) -> tuple[BaseModel, dict]:
+    environment = Environment(languages=_texts(rng, 5, 100), tools=_texts(rng, 5, 100))
+    if rng.random() < 0.5:
+        projects = [
+            _project(
+                name=_text(rng, 200) or "P",
+                overview=_text(rng, 3000),
+                responsibilities=_texts(rng, 20, 500),
+                achievements=_texts(rng, 10, 500),
+                environment=environment,
+                role=_text(rng, 50),
+            )
+            for _ in range(rng.randint(1, 5))
+        ]
+        data = _work_history(projects, summary=_text(rng, 3000))
+        data.self_pr[0].content = _text(rng, 5000)
+        return data, {"split_in_row": rng.choice([0, 1])}
+    project = _star_project(
+        situation=_text(rng, 3000),
+        task=_text(rng, 1000),
+        action=_texts(rng, 20, 500),
+        result=_texts(rng, 10, 500),
+        environment=environment,
+    )
+    return _star_work_history(project), {"content_format": "star", "split_in_row": rng.choice([0, 1])}
+
+
+def _fuzz_resume(rng: random.Random) -> Resume:
+    def entries() -> list[HistoryEntry]:
+        return [
+            HistoryEntry(year=_text(rng, 10), month=_text(rng, 5), value=_text(rng, 300))
+            for _ in range(rng.randint(0, 30))
+        ]
+
+    return _resume(
+        name=_text(rng, 100),
+        name_kana=_text(rng, 100),
+        address=_text(rng, 500),
+        education=entries(),
+        experience=entries(),
+        licences=entries(),
+        hobby=_text(rng, 3000),
+        motivation=_text(rng, 3000),
+        request=_text(rng, 3000),
+    )
+
+
+def fuzz_cases(seed: int = 0, count: int = 20) -> list[StressCase]:
+    """count random documents; the same seed gives the same documents."""
+    rng = random.Random(seed)
+    cases = []
+    for i in range(count):
+        case_rng = random.Random(rng.getrandbits(64))
+        if case_rng.random() < 0.6:
+            data, options = _fuzz_work_history(case_rng)
+            cases.append(StressCase(f"fuzz-{seed}-{i}", "work_history", lambda _, d=data: d, options, SUPERVISED))
+        else:
+            data = _fuzz_resume(case_rng)
+            cases.append(StressCase(f"fuzz-{seed}-{i}", "resume", lambda _, d=data: d, expect=SUPERVISED))
+    return cases
@@ -0,0 +1,20 @@
+"""Shared fixtures."""
+
+import zipfile
+from pathlib import Path
+
+import pytest
+
+FONT_ZIP = Path(__file__).parent.parent / "fonts" / "ipaexg.zip"
+
+
+@pytest.fixture(scope="session")
+def ipaex_font_dir(tmp_path_factory) -> Path:
+    """Directory containing ipaexg.ttf, extracted from the bundled zip."""
+    if not FONT_ZIP.exists():
+        pytest.skip("fonts/ipaexg.zip not found")
+    font_dir = tmp_path_factory.mktemp("fonts")
+    with zipfile.ZipFile(FONT_ZIP) as zf:
+        (font_dir / "ipaexg.ttf").write_bytes(zf.read("ipaexg00401/ipaexg.ttf"))
+    return font_dir
+
@@ -0,0 +1,19 @@
+"""PDF inspection helpers shared by the tests."""
+
+import base64
+import re
+import zlib
+
+
+def content_streams(pdf: bytes) -> list[bytes]:
+    """Decompressed page content streams (ASCII85 + Flate, as reportlab writes them), in file order."""
+    streams = []
+    for m in re.finditer(rb"/Filter \[ /ASCII85Decode /FlateDecode \] /Length (\d+)\s*>>\s*stream\r?\n", pdf):
+        data = pdf[m.end():m.end() + int(m.group(1))]
+        streams.append(zlib.decompress(base64.a85decode(data, adobe=True)))
+    return streams
+
+
+def page_count(pdf: bytes) -> int:
+    """Number of page objects (not counting the /Pages tree nodes)."""
+    return len(re.findall(rb"/Type /Page\b(?!s)", pdf))
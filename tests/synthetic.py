@@ -0,0 +1,73 @@
+"""Synthetic 職務経歴書 models for benchmarks and tests."""
+
+from __future__ import annotations
+
+from jp_tenshoku_docs_builder.work_history.models import (
+    Environment,
+    Qualification,
+    SelfPRSection,
+    SkillCategory,
+    SkillItem,
+    StandardCompany,
+    StandardProject,
+    StandardWorkHistory,
+)
+
+_SENTENCE = "既存システムの老朽化に伴い、業務要件の整理から設計・実装・移行までを一貫して担当した。"
+
+
+def make_work_history(
+    companies: int = 3,
+    projects_per_company: int = 10,
+    skill_categories: int = 8,
+    skills_per_category: int = 8,
+    qualifications: int = 20,
+) -> StandardWorkHistory:
+    """Build a StandardWorkHistory of the requested size."""
+    return StandardWorkHistory(
+        date="2024年1月1日現在",
+        name="山田　太郎",
+        summary="\n".join(_SENTENCE for _ in range(4)),
+        highlights=[f"経験・知識・技術 {i}" for i in range(5)],
+        experience=[
+            StandardCompany(
+                company=f"株式会社サンプル{c}",
+                period="2010年4月～現在",
+                business="システム開発",
+                capital="1億円",
+                employees="500人",
+                employment_type="正社員",
+                projects=[
+                    StandardProject(
+                        period=f"20{10 + p % 14:02d}年{p % 12 + 1}月～20{11 + p % 14:02d}年{p % 12 + 1}月",
+                        industry="金融業界",
+                        name=f"プロジェクト{c}-{p}",
+                        overview="\n".join(_SENTENCE for _ in range(2)),
+                        phases="要件定義、基本設計、詳細設計、実装、テスト",
+                        responsibilities=[f"担当業務 {i}: {_SENTENCE}" for i in range(3)],
+                        achievements=[f"実績 {i}: 処理時間を{10 + i}%短縮" for i in range(2)],
+                        environment=Environment(
+                            languages=["Python", "TypeScript"],
+                            os=["Linux"],
+                            db=["PostgreSQL"],
+                            frameworks=["Django", "React"],
+                            tools=["Git", "Docker"],
+                        ),
+                        team_size="全8名",
+                        role="リーダー",
+                    )
+                    for p in range(projects_per_company)
+                ],
+            )
+            for c in range(companies)
+        ],
+        technical_skills=[
+            SkillCategory(
+                category=f"カテゴリ{k}",
+                items=[SkillItem(name=f"スキル{k}-{i}", period=f"{i + 1}年", level="実務経験あり") for i in range(skills_per_category)],
+            )
+            for k in range(skill_categories)
+        ],
+        qualifications=[Qualification(name=f"資格{i}", date="2020年4月取得") for i in range(qualifications)],
+        self_pr=[SelfPRSection(title="自己PR", content="\n".join(_SENTENCE for _ in range(5)))],
+    )
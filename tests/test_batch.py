@@ -0,0 +1,142 @@
+"""Tests for the pipelined batch renderer."""
+
+import json
+import shutil
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import yaml
+
+from jp_tenshoku_docs_builder.batch import _DONE, BatchJob, BatchPipeline, _load, _TrackedQueue, write_file
+from jp_tenshoku_docs_builder.cli import main
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+def _jobs(tmp_path: Path, font_dir, count: int = 3) -> list[BatchJob]:
+    jobs = []
+    for i in range(count):
+        source = tmp_path / f"wh{i}.yaml"
+        shutil.copy(SAMPLE_DIR / "work_history_standard.yaml", source)
+        jobs.append(BatchJob(source, tmp_path / "out" / f"wh{i}.pdf", CREDENTIAL, options={"font_dir": font_dir}))
+    return jobs
+
+
+class TestBatchPipeline:
+    def test_renders_all_jobs(self, ipaex_font_dir, tmp_path):
+        jobs = _jobs(tmp_path, ipaex_font_dir)
+        jobs.append(BatchJob(
+            SAMPLE_DIR / "resume.yaml", tmp_path / "out" / "resume.pdf", CREDENTIAL, "resume",
+            options={"font_dir": ipaex_font_dir},
+        ))
+        result = BatchPipeline(render_workers=2, processes=False).run(jobs)
+        assert sorted(result.written) == sorted(job.output for job in jobs)
+        assert all(job.output.read_bytes().startswith(b"%PDF") for job in jobs)
+        assert not list((tmp_path / "out").glob("*.tmp"))
+        assert [s.stage for s in result.stages] == ["load", "render", "write"]
+        assert all(s.items == 4 for s in result.stages)
+        assert all(0 < s.utilisation <= 1 for s in result.stages)
+
+    def test_failures_are_recorded_per_stage(self, ipaex_font_dir, tmp_path):
+        jobs = _jobs(tmp_path, ipaex_font_dir, count=2)
+        jobs[0].content_format = "star"  # the standard sample does not validate as STAR
+
+        def writer(path: Path, pdf: bytes) -> None:
+            raise OSError("disk full")
+
+        result = BatchPipeline(processes=False, writer=writer).run(jobs)
+        assert result.written == []
+        assert [(f.stage, f.message.split(":")[0]) for f in result.failures] == [
+            ("load", "ValidationError"), ("write", "OSError"),
+        ]
+        assert "2 failed" in result.to_text()
+
+    def test_backpressure_bounds_queues(self, ipaex_font_dir, tmp_path):
+        in_flight = 0
+        highest = 0
+        lock = threading.Lock()
+
+        def slow_writer(path: Path, pdf: bytes) -> None:
+            nonlocal in_flight, highest
+            with lock:
+                in_flight += 1
+                highest = max(highest, in_flight)
+            time.sleep(0.3)
+            write_file(path, pdf)
+            with lock:
+                in_flight -= 1
+
+        pipeline = BatchPipeline(write_workers=1, queue_size=1, lookahead=1, processes=False, writer=slow_writer)
+        result = pipeline.run(_jobs(tmp_path, ipaex_font_dir, count=5))
+        load, render, write = result.stages
+        assert len(result.written) == 5
+        assert highest == 1
+        assert write.max_queued == 1 and render.max_queued == 1
+        assert render.blocked > 0  # the renderer waited for the slow writer
+        assert write.busy >= 5 * 0.3
+
+    def test_cost_warnings(self, ipaex_font_dir, tmp_path):
+        jobs = _jobs(tmp_path, ipaex_font_dir, count=2)
+        warned = []
+        result = BatchPipeline(max_cost=0.001, on_warning=warned.append, processes=False).run(jobs)
+        assert len(result.written) == 2
+        assert warned == result.warnings
+        assert sorted(w.input for w in warned) == sorted(str(job.input) for job in jobs)
+        assert all(w.estimate > 0.001 for w in warned)
+        assert "over the cost threshold" in result.to_text()
+
+    def test_render_queue_is_longest_first(self):
+        render_queue = _TrackedQueue(8, [], key=lambda item: -item[1][1])
+        for name, cost in [("a", 0.1), ("b", 2.0), ("c", 0.5), ("d", 2.0)]:
+            render_queue.put((name, (None, cost)))
+        render_queue.put(_DONE)
+        order = [render_queue.get() for _ in range(5)]
+        assert [item[0] for item in order[:4]] == ["b", "d", "c", "a"]
+        assert order[4] is _DONE
+
+    def test_include_root(self, tmp_path):
+        data = yaml.safe_load((SAMPLE_DIR / "work_history_standard.yaml").read_text(encoding="utf-8"))
+        (tmp_path / "shared").mkdir()
+        (tmp_path / "shared" / "skills.yaml").write_text(
+            yaml.safe_dump(data.pop("technical_skills"), allow_unicode=True), encoding="utf-8",
+        )
+        (tmp_path / "variants").mkdir()
+        variant = tmp_path / "variants" / "a.yaml"
+        variant.write_text(
+            yaml.safe_dump(data, allow_unicode=True) + "technical_skills: !include ../shared/skills.yaml\n",
+            encoding="utf-8",
+        )
+        loaded, _ = _load(BatchJob(variant, tmp_path / "a.pdf", CREDENTIAL, include_root=tmp_path), None)
+        assert loaded.technical_skills
+
+    def test_process_pools(self, ipaex_font_dir, tmp_path):
+        result = BatchPipeline(render_workers=2).run(_jobs(tmp_path, ipaex_font_dir, count=2))
+        assert len(result.written) == 2 and not result.failures
+        assert json.loads(json.dumps(result.to_dict()))["stages"][1]["workers"] == 2
+
+    @pytest.mark.parametrize(
+        "option", ["load_workers", "render_workers", "write_workers", "queue_size", "lookahead", "max_cost"],
+    )
+    def test_invalid_option(self, option):
+        with pytest.raises(ValueError, match=option):
+            BatchPipeline(**{option: -1})
+
+
+def test_write_file_cleans_up_on_failure(tmp_path):
+    target = tmp_path / "out" / "a.pdf"
+    with mock.patch("os.replace", side_effect=OSError("disk full")), pytest.raises(OSError):
+        write_file(target, b"%PDF-")
+    assert list(target.parent.iterdir()) == []
+
+
+def test_cli_batch(ipaex_font_dir, tmp_path, capsys):
+    inputs = [str(job.input) for job in _jobs(tmp_path, ipaex_font_dir, count=2)]
+    main(["batch", *inputs, "-c", str(CREDENTIAL), "-o", str(tmp_path / "pdf"), "--font-dir", str(ipaex_font_dir),
+          "--render-workers", "1", "--output-format", "json"])
+    result = json.loads(capsys.readouterr().out)
+    assert sorted(Path(p).name for p in result["written"]) == ["wh0.pdf", "wh1.pdf"]
+    assert [s["stage"] for s in result["stages"]] == ["load", "render", "write"]
@@ -0,0 +1,83 @@
+"""Tests for the rendered-PDF cache."""
+
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.cache import RenderCache
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from jp_tenshoku_docs_builder.work_history.styles import StyleScale
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+
+@pytest.fixture(scope="module")
+def work_history():
+    return load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=SAMPLE_DIR / "credential.yaml")
+
+
+class TestRenderCache:
+    def test_lru_eviction_by_bytes(self):
+        cache = RenderCache(max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        assert cache.get("a") == b"1234"  # "b" is now least recently used
+        cache.put("c", b"1234")
+        assert cache.get("b") is None
+        assert cache.stats.entries == 2
+        assert cache.stats.bytes == 8
+        assert cache.stats.evictions == 1
+
+    def test_oversized_entry_not_stored(self):
+        cache = RenderCache(max_bytes=4)
+        cache.put("a", b"12345")
+        assert len(cache) == 0
+
+    def test_replace_updates_size(self):
+        cache = RenderCache(max_bytes=100)
+        cache.put("a", b"1234")
+        cache.put("a", b"12")
+        assert cache.stats.bytes == 2
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            RenderCache(max_bytes=0)
+
+
+class TestCachedRender:
+    def test_hit_returns_same_bytes(self, work_history, ipaex_font_dir):
+        cache = RenderCache()
+        first = cache.render_work_history(work_history, ipaex_font_dir)
+        second = cache.render_work_history(work_history, ipaex_font_dir)
+        assert first.startswith(b"%PDF")
+        assert second is first
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+        assert cache.stats.hit_rate == 0.5
+
+    def test_options_and_data_are_part_of_the_key(self, work_history, ipaex_font_dir):
+        cache = RenderCache()
+        cache.render_work_history(work_history, ipaex_font_dir)
+        cache.render_work_history(work_history, ipaex_font_dir, scale=StyleScale.uniform(0.9))
+        cache.render_work_history(work_history, ipaex_font_dir, split_in_row=0)
+        cache.render_work_history(work_history, ipaex_font_dir, table_layout="company")
+        changed = work_history.model_copy(update={"summary": "別の職務要約"})
+        cache.render_work_history(changed, ipaex_font_dir)
+        assert (cache.stats.hits, cache.stats.misses) == (0, 5)
+
+    def test_resume(self, ipaex_font_dir):
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=SAMPLE_DIR / "credential.yaml")
+        cache = RenderCache()
+        pdf = cache.render_resume(data, ipaex_font_dir)
+        assert cache.render_resume(data, ipaex_font_dir) is pdf
+        cache.render_resume(data, ipaex_font_dir, photo_dpi=150)
+        assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+    def test_plans_are_cached_separately(self, work_history, ipaex_font_dir):
+        cache = RenderCache()
+        cache.render_work_history(work_history, ipaex_font_dir)
+        plan = cache.plan_work_history(work_history, ipaex_font_dir)
+        again = cache.plan_work_history(work_history, ipaex_font_dir)
+        assert again == plan
+        assert again is not plan
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.entries) == (1, 2, 2)
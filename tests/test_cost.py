@@ -0,0 +1,40 @@
+"""Tests for the render cost estimate."""
+
+from pathlib import Path
+
+from jp_tenshoku_docs_builder.cost import COEFFICIENTS, cost_features, estimate_render_cost
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from tests.synthetic import make_work_history
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+class TestEstimateRenderCost:
+    def test_work_history_features(self):
+        data = load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+        features = cost_features(data)
+        assert set(features) == set(COEFFICIENTS["work_history"]) - {"base"}
+        assert features["companies"] == len(data.experience) + len(data.side_experience)
+        assert features["skill_rows"] == (
+            sum(len(c.items) for c in data.technical_skills) + len(data.qualifications)
+        )
+        assert features["characters"] > len(data.summary)
+
+    def test_resume_features(self):
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+        assert set(cost_features(data)) == set(COEFFICIENTS["resume"]) - {"base"}
+        assert estimate_render_cost(data) >= COEFFICIENTS["resume"]["base"]
+
+    def test_resume_photo(self):
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+        with_photo = data.model_copy(update={"photo": "photo.jpg"})
+        assert cost_features(with_photo)["photo"] == 1
+        assert estimate_render_cost(with_photo) > estimate_render_cost(data.model_copy(update={"photo": ""}))
+
+    def test_grows_with_document_size(self):
+        small = estimate_render_cost(make_work_history(companies=1, projects_per_company=2))
+        large = estimate_render_cost(make_work_history(companies=8, projects_per_company=15))
+        assert 0 < small < large
+        assert large / small > 5
@@ -0,0 +1,128 @@
+"""Tests for the glyph coverage pre-flight and fallback font routing."""
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import reportlab
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen.canvas import Canvas
+
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.coverage import covers, scan_coverage, split_runs
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.resume.builder import _FallbackCanvas
+from jp_tenshoku_docs_builder.work_history.builder import _plain_paragraph
+from jp_tenshoku_docs_builder.work_history.models import StandardCompany, StandardWorkHistory
+from jp_tenshoku_docs_builder.work_history.styles import build_styles
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+# Bitstream Vera ships with reportlab and has "™", which IPAex lacks
+VERA = Path(os.path.dirname(reportlab.__file__)) / "fonts" / "Vera.ttf"
+
+
+@pytest.fixture
+def fonts(ipaex_font_dir):
+    return register_fonts(ipaex_font_dir, VERA)
+
+
+@pytest.fixture
+def data():
+    return StandardWorkHistory(
+        date="2024年1月1日現在",
+        name="山田　太郎",
+        experience=[StandardCompany(company="株式会社サンプル™", period="2020年～現在")],
+        self_pr=[{"title": "強み", "content": "𠮷野家™"}],
+    )
+
+
+class TestScanCoverage:
+    def test_covers(self, fonts):
+        assert covers(fonts.gothic, "職")
+        assert not covers(fonts.gothic, "™")
+        assert covers(fonts.fallback, "™")
+
+    def test_reports_fields(self, data, fonts):
+        report = scan_coverage(data, fonts)
+        missing = {m.char: m for m in report.missing}
+        assert set(missing) == {"™", "𠮷"}
+        assert sorted(missing["™"].fields) == ["experience[0].company", "self_pr[0].content"]
+        assert missing["™"].fallback
+        assert not missing["𠮷"].fallback
+        assert not report.ok
+        assert "U+20BB7" in report.to_text()
+
+    def test_ok_without_missing(self, ipaex_font_dir):
+        report = scan_coverage(StandardWorkHistory(date="2024年", name="山田"), register_fonts(ipaex_font_dir))
+        assert report.ok and report.missing == []
+
+
+class TestFallbackRouting:
+    def test_split_runs(self, fonts):
+        assert split_runs("会社™です", fonts.gothic, fonts.fallback) == [
+            (fonts.gothic, "会社"), (fonts.fallback, "™"), (fonts.gothic, "です"),
+        ]
+        # Characters neither font has stay with the primary font
+        assert split_runs("𠮷", fonts.gothic, fonts.fallback) == [(fonts.gothic, "𠮷")]
+
+    def test_paragraph_frags(self, fonts):
+        paragraph = _plain_paragraph(["会社™です"], build_styles(fonts)["cell"])
+        assert [(f.fontName, f.text) for f in paragraph.frags] == [
+            (fonts.mincho, "会社"), (fonts.fallback, "™"), (fonts.mincho, "です"),
+        ]
+
+    def test_resume_canvas(self, fonts, tmp_path):
+        c = _FallbackCanvas(str(tmp_path / "out.pdf"), pagesize=A4, fallback=fonts.fallback)
+        c.setFont(fonts.gothic, 12)
+        c.drawString(10, 10, "会社™")
+        assert c._fontname == fonts.gothic
+        c.showPage()
+        c.save()
+        assert b"Vera" in (tmp_path / "out.pdf").read_bytes()
+
+    @pytest.mark.parametrize("method, anchor", [("drawRightString", 1), ("drawCentredString", 0.5)])
+    def test_resume_canvas_aligned_spacing(self, fonts, tmp_path, method, anchor):
+        c = _FallbackCanvas(str(tmp_path / "out.pdf"), pagesize=A4, fallback=fonts.fallback)
+        c.setFont(fonts.gothic, 12)
+        with mock.patch.object(Canvas, "drawString") as draw:
+            getattr(c, method)(100, 10, "会社™", charSpace=2, mode=1)
+        assert [call.args[2:4] for call in draw.call_args_list] == [("会社", 1), ("™", 1)]
+        assert all(call.args[4] == 2 for call in draw.call_args_list)
+        glyphs = c.stringWidth("会社", fonts.gothic, 12) + c.stringWidth("™", fonts.fallback, 12)
+        first_x, second_x = (call.args[0] for call in draw.call_args_list)
+        assert first_x == pytest.approx(100 - (glyphs + 2 * 2) * anchor)
+        assert second_x - first_x == pytest.approx(c.stringWidth("会社", fonts.gothic, 12) + 2 * 2)
+
+
+class TestCheckGlyphsCli:
+    def test_reports_missing_and_fails(self, tmp_path, ipaex_font_dir, capsys):
+        yaml_path = tmp_path / "wh.yaml"
+        text = (SAMPLE_DIR / "work_history_standard.yaml").read_text(encoding="utf-8")
+        yaml_path.write_text(text.replace("株式会社テクノシステム", "株式会社テクノシステム™", 1), encoding="utf-8")
+        argv = [str(yaml_path), "-c", str(SAMPLE_DIR / "credential.yaml"),
+                "--font-dir", str(ipaex_font_dir), "--check-glyphs"]
+        with pytest.raises(SystemExit) as exc:
+            main(argv)
+        assert exc.value.code == 1
+        assert "U+2122" in capsys.readouterr().out
+
+        main(argv + ["--fallback-font", str(VERA)])
+        assert "fallback" in capsys.readouterr().out
+
+    def test_render_warns_only_with_fallback(self, tmp_path, ipaex_font_dir, capsys):
+        yaml_path = tmp_path / "wh.yaml"
+        text = (SAMPLE_DIR / "work_history_standard.yaml").read_text(encoding="utf-8")
+        yaml_path.write_text(text.replace("株式会社テクノシステム", "株式会社テクノシステム™ก", 1), encoding="utf-8")
+        argv = [str(yaml_path), "-c", str(SAMPLE_DIR / "credential.yaml"),
+                "--font-dir", str(ipaex_font_dir), "-o", str(tmp_path / "out.pdf")]
+        with mock.patch("jp_tenshoku_docs_builder.coverage.scan_coverage") as scan:
+            main(argv)
+        scan.assert_not_called()
+        assert "WARNING" not in capsys.readouterr().err
+
+        main(argv + ["--fallback-font", str(VERA)])
+        err = capsys.readouterr().err
+        assert "1 character(s)" in err
+        assert "ก" in err
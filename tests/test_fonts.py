@@ -0,0 +1,93 @@
+"""Tests for font registration."""
+
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from jp_tenshoku_docs_builder import fonts as fonts_module
+from jp_tenshoku_docs_builder.fonts import _load_font, register_fonts
+from jp_tenshoku_docs_builder.work_history.builder import build_pdf
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+
+class TestRegisterFonts:
+    def test_content_derived_name(self, ipaex_font_dir):
+        fonts = register_fonts(ipaex_font_dir)
+        assert fonts.gothic.startswith("IPAexGothic-")
+        assert fonts.gothic in pdfmetrics.getRegisteredFontNames()
+
+    def test_idempotent(self, ipaex_font_dir):
+        first = register_fonts(ipaex_font_dir)
+        font = pdfmetrics.getFont(first.gothic)
+        assert register_fonts(ipaex_font_dir) == first
+        assert pdfmetrics.getFont(first.gothic) is font
+
+    def test_same_content_same_name(self, ipaex_font_dir, tmp_path):
+        shutil.copy(ipaex_font_dir / "ipaexg.ttf", tmp_path / "ipaexg.ttf")
+        assert register_fonts(tmp_path) == register_fonts(ipaex_font_dir)
+
+    def test_different_content_different_name(self, ipaex_font_dir, tmp_path):
+        data = (ipaex_font_dir / "ipaexg.ttf").read_bytes()
+        (tmp_path / "ipaexg.ttf").write_bytes(data + b"\0\0\0\0")
+        assert register_fonts(tmp_path).gothic != register_fonts(ipaex_font_dir).gothic
+
+
+class TestFontSnapshot:
+    TEXT = "職務経歴書 Python 2024年"
+
+    @pytest.fixture
+    def font_path(self, ipaex_font_dir):
+        return ipaex_font_dir / "ipaexg.ttf"
+
+    def test_written_then_loaded(self, font_path, tmp_path, monkeypatch):
+        parsed = _load_font("SnapshotTest", font_path, None, tmp_path)
+        assert len(list(tmp_path.glob("font-*.pickle"))) == 1
+
+        def no_parse(*args, **kwargs):
+            raise AssertionError("font file parsed again")
+
+        monkeypatch.setattr(TTFont, "__init__", no_parse)
+        loaded = _load_font("SnapshotTest", font_path, None, tmp_path)
+        assert isinstance(loaded, TTFont)
+        assert loaded.stringWidth(self.TEXT, 10) == parsed.stringWidth(self.TEXT, 10)
+        subset = [0] + [ord(ch) for ch in self.TEXT]
+        assert loaded.face.makeSubset(subset) == parsed.face.makeSubset(subset)
+
+    def test_stale_snapshot_ignored(self, font_path, tmp_path, monkeypatch):
+        _load_font("SnapshotTest", font_path, None, tmp_path)
+        snapshot = next(tmp_path.glob("font-*.pickle"))
+        monkeypatch.setattr(fonts_module, "_SNAPSHOT_FORMAT", fonts_module._SNAPSHOT_FORMAT + 1)
+        _load_font("SnapshotTest", font_path, None, tmp_path)
+        assert snapshot.exists()  # old format left alone
+        assert len(list(tmp_path.glob("font-*.pickle"))) == 2
+
+    def test_corrupt_snapshot_replaced(self, font_path, tmp_path):
+        _load_font("SnapshotTest", font_path, None, tmp_path)
+        snapshot = next(tmp_path.glob("font-*.pickle"))
+        snapshot.write_bytes(b"garbage")
+        font = _load_font("SnapshotTest", font_path, None, tmp_path)
+        assert font.stringWidth(self.TEXT, 10) > 0
+        assert snapshot.read_bytes() != b"garbage"
+
+
+def test_concurrent_renders_with_different_font_dirs(ipaex_font_dir, tmp_path):
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    (other_dir / "ipaexg.ttf").write_bytes((ipaex_font_dir / "ipaexg.ttf").read_bytes() + b"\0\0\0\0")
+    data = load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=SAMPLE_DIR / "credential.yaml")
+
+    def render(i: int) -> Path:
+        font_dir = ipaex_font_dir if i % 2 else other_dir
+        return build_pdf(data, tmp_path / f"out{i}.pdf", font_dir)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        outputs = list(pool.map(render, range(8)))
+    for out in outputs:
+        pdf = out.read_bytes()
+        assert pdf.startswith(b"%PDF") and b"IPAexGothic" in pdf
@@ -0,0 +1,123 @@
+"""Tests for linearized PDF output."""
+
+import re
+import zlib
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.linearize import linearize_pdf
+from jp_tenshoku_docs_builder.resume.builder import render_resume_pdf
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.work_history.builder import render_pdf
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from tests.pdf_helpers import content_streams
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+@pytest.fixture(scope="module")
+def work_history_pdf(ipaex_font_dir):
+    data = load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+    return render_pdf(data, ipaex_font_dir)
+
+
+def _lin_dict(pdf: bytes) -> dict[str, object]:
+    m = re.search(rb"<<\s*/Linearized 1(.*?)>>", pdf[:1024], re.S)
+    assert m, "no linearization dictionary in the first 1024 bytes"
+    values = dict(re.findall(rb"/(\w+)\s+(\d+)", m.group(1)))
+    h = re.search(rb"/H\s*\[\s*(\d+)\s+(\d+)", m.group(1))
+    return {k.decode(): int(v) for k, v in values.items()} | {"H": (int(h.group(1)), int(h.group(2)))}
+
+
+def _xref(pdf: bytes, at: int) -> tuple[dict[int, int], bytes]:
+    """Read one cross-reference section: ({object: offset}, trailer dictionary)."""
+    assert pdf.startswith(b"xref", at)
+    trailer_at = pdf.index(b"trailer", at)
+    tokens = pdf[at + 4:trailer_at].split()
+    first, count = int(tokens[0]), int(tokens[1])
+    offsets = {}
+    for i in range(count):
+        offset, _, kind = tokens[2 + 3 * i:5 + 3 * i]
+        if kind == b"n":
+            offsets[first + i] = int(offset)
+    return offsets, pdf[trailer_at:pdf.index(b"startxref", trailer_at)]
+
+
+def _object(pdf: bytes, offsets: dict[int, int], num: int) -> bytes:
+    at = offsets[num]
+    assert pdf.startswith(b"%d 0 obj" % num, at)
+    return pdf[at:pdf.index(b"endobj", at) + 6]
+
+
+def _refs(obj: bytes) -> set[int]:
+    head = obj.split(b"stream", 1)[0]
+    head = re.sub(rb"/Parent\s+\d+\s+0\s+R", b"", head)
+    return {int(n) for n in re.findall(rb"(\d+) 0 R", head)}
+
+
+class TestLinearize:
+    def test_cross_references(self, work_history_pdf):
+        pdf = linearize_pdf(work_history_pdf)
+        lin = _lin_dict(pdf)
+        assert lin["L"] == len(pdf)
+        assert lin["N"] == 3
+
+        first_xref_at = pdf.index(b"xref")
+        first, first_trailer = _xref(pdf, first_xref_at)
+        prev = int(re.search(rb"/Prev (\d+)", first_trailer).group(1))
+        main_offsets, _ = _xref(pdf, prev)
+        assert pdf[lin["T"]:lin["T"] + 11] == b"\n0000000000"
+        assert int(pdf[pdf.rindex(b"startxref") + 9:].split()[0]) == first_xref_at
+        assert set(first).isdisjoint(main_offsets)
+        offsets = first | main_offsets
+        for num in offsets:
+            _object(pdf, offsets, num)
+        assert len(offsets) == work_history_pdf.count(b" 0 obj") + 2  # + linearization dict, hint stream
+
+    def test_first_page_readable_from_prefix(self, work_history_pdf):
+        pdf = linearize_pdf(work_history_pdf)
+        lin = _lin_dict(pdf)
+        prefix = pdf[:lin["E"]]
+
+        offsets, _ = _xref(prefix, prefix.index(b"xref"))
+        needed, queue = set(), [lin["O"]]
+        while queue:
+            num = queue.pop()
+            if num in needed:
+                continue
+            needed.add(num)
+            obj = _object(prefix, offsets, num)  # fails if outside the prefix
+            queue.extend(_refs(obj))
+
+        page = _object(prefix, offsets, lin["O"])
+        contents = int(re.search(rb"/Contents (\d+) 0 R", page).group(1))
+        [text] = content_streams(_object(prefix, offsets, contents))
+        assert b" Tj" in text
+
+    def test_hint_stream(self, work_history_pdf):
+        pdf = linearize_pdf(work_history_pdf)
+        offset, length = _lin_dict(pdf)["H"]
+        hint = pdf[offset:offset + length]
+        assert re.match(rb"\d+ 0 obj\s*<<[^>]*/S \d+", hint)
+        data = zlib.decompress(hint.split(b"stream\n", 1)[1].rsplit(b"\nendstream", 1)[0])
+        least_objects = int.from_bytes(data[:4], "big")
+        assert least_objects >= 2  # page object + content stream
+
+    def test_resume(self, ipaex_font_dir):
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+        pdf = linearize_pdf(render_resume_pdf(data, ipaex_font_dir))
+        assert _lin_dict(pdf)["N"] == 2
+
+    def test_already_linearized(self, work_history_pdf):
+        with pytest.raises(ValueError):
+            linearize_pdf(linearize_pdf(work_history_pdf))
+
+
+def test_cli_flag(tmp_path, ipaex_font_dir):
+    out = tmp_path / "out.pdf"
+    main([str(SAMPLE_DIR / "work_history_standard.yaml"), "-c", str(CREDENTIAL),
+          "--font-dir", str(ipaex_font_dir), "-o", str(out), "--linearize"])
+    assert _lin_dict(out.read_bytes())["L"] == out.stat().st_size
@@ -0,0 +1,112 @@
+"""Tests for the per-phase memory profile."""
+
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.memprofile import note, phase, profile_memory
+from jp_tenshoku_docs_builder.resume.builder import render_resume_pdf
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.work_history.builder import render_pdf
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+class TestProfileMemory:
+    def test_work_history_phases(self, ipaex_font_dir):
+        with profile_memory(top=0) as profile:
+            data = load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+            render_pdf(data, font_dir=ipaex_font_dir)
+        assert [(p.phase, p.function) for p in profile.phases] == [
+            ("load", "work_history.loader.load_yaml"),
+            ("validate", "work_history.loader.load_yaml"),
+            ("fonts", "work_history.builder.render_pdf"),
+            ("build", "work_history.builder._layout"),
+            ("layout", "work_history.builder._layout"),
+            ("build", "work_history.builder._render"),
+            ("write", "work_history.builder._render"),
+        ]
+        assert all(p.peak >= max(p.retained, 0) for p in profile.phases)
+        assert profile.peak >= max(p.peak for p in profile.phases)
+        assert profile.pages == 3
+        assert profile.projects == sum(len(c.projects) for c in data.experience)
+        assert profile.per_page == profile.peak / 3
+        assert not tracemalloc.is_tracing()
+
+    def test_resume_top_sites(self, ipaex_font_dir):
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+        with profile_memory(top=3) as profile:
+            render_resume_pdf(data, font_dir=ipaex_font_dir)
+        assert [p.phase for p in profile.phases] == ["fonts", "photo", "write"]
+        write = profile.phases[-1]
+        assert write.function == "resume.builder._render"
+        assert 0 < len(write.top) <= 3
+        assert all(site.size > 0 and ":" in site.location for site in write.top)
+        assert profile.pages == 2 and profile.per_project is None
+
+    def test_nested_phase_peak(self):
+        with profile_memory(top=0) as profile:
+            with phase("outer"):
+                with phase("inner"):
+                    block = bytearray(4 * 1024 * 1024)
+                    del block
+        inner, outer = profile.phases
+        assert inner.peak >= 4 * 1024 * 1024
+        assert outer.peak >= inner.peak
+        assert outer.function.endswith("TestProfileMemory.test_nested_phase_peak")
+
+    def test_noop_without_profile(self):
+        with phase("load"):
+            note(pages=1)
+        assert not tracemalloc.is_tracing()
+
+    def test_to_dict_is_json(self):
+        with profile_memory(top=0) as profile:
+            with phase("load"):
+                pass
+            note(pages=2, projects=4)
+        d = json.loads(json.dumps(profile.to_dict()))
+        assert d["phases"][0]["phase"] == "load"
+        assert d["per_page"] == d["peak"] / 2 and d["per_project"] == d["peak"] / 4
+        assert profile.to_text().startswith("peak: ")
+
+    def test_negative_top(self):
+        with pytest.raises(ValueError):
+            with profile_memory(top=-1):
+                pass
+
+
+def test_cli_memprofile(tmp_path):
+    report = tmp_path / "mem.json"
+    main([str(SAMPLE_DIR / "work_history_standard.yaml"), "-c", str(CREDENTIAL),
+          "--preview", "markdown", "-o", str(tmp_path / "out.md"), "--memprofile", str(report)])
+    profile = json.loads(report.read_text(encoding="utf-8"))
+    assert [p["phase"] for p in profile["phases"]] == ["load", "validate"]
+    assert (tmp_path / "out.md").exists()
+
+
+def test_cli_memprofile_written_on_failure(tmp_path):
+    report = tmp_path / "mem.json"
+    with pytest.raises(SystemExit):
+        main([str(SAMPLE_DIR / "work_history_standard.yaml"), "-c", str(CREDENTIAL), "--format", "star",
+              "--preview", "markdown", "-o", str(tmp_path / "out.md"), "--memprofile", str(report)])
+    profile = json.loads(report.read_text(encoding="utf-8"))
+    assert profile["phases"][0]["phase"] == "load"
+    assert not (tmp_path / "out.md").exists()
+
+
+def test_cli_memprofile_start_failure(tmp_path, monkeypatch):
+    def failing_profile(top=10):
+        raise RuntimeError("tracemalloc unavailable")
+
+    monkeypatch.setattr("jp_tenshoku_docs_builder.memprofile.profile_memory", failing_profile)
+    report = tmp_path / "mem.json"
+    with pytest.raises(RuntimeError, match="tracemalloc unavailable"):
+        main([str(SAMPLE_DIR / "work_history_standard.yaml"), "-c", str(CREDENTIAL),
+              "--preview", "markdown", "-o", str(tmp_path / "out.md"), "--memprofile", str(report)])
+    assert not report.exists()
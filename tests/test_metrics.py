@@ -0,0 +1,58 @@
+"""Tests for the glyph-width tables."""
+
+import pytest
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen.canvas import Canvas
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.metrics import glyph_widths
+from jp_tenshoku_docs_builder.resume.builder import _draw_textbox
+
+TEXT = "東京都千代田区丸の内1-2-3 Tower Building　12F ABCビル"
+
+
+@pytest.fixture
+def gothic(ipaex_font_dir):
+    return register_fonts(ipaex_font_dir).gothic
+
+
+class TestGlyphWidths:
+    @pytest.mark.parametrize("font_name", ["Helvetica", "gothic"])
+    def test_matches_reportlab(self, font_name, request):
+        if font_name == "gothic":
+            font_name = request.getfixturevalue("gothic")
+        widths = glyph_widths(font_name)
+        assert widths.string_width(TEXT, 12) == pytest.approx(pdfmetrics.stringWidth(TEXT, font_name, 12))
+        cumulative = widths.cumulative(TEXT)
+        for i in (0, 5, len(TEXT) - 1):
+            assert cumulative[i] * 12 / 1000 == pytest.approx(pdfmetrics.stringWidth(TEXT[:i + 1], font_name, 12))
+
+    def test_cached_per_font(self, gothic):
+        assert glyph_widths(gothic) is glyph_widths(gothic)
+
+    def test_split_at_last_space(self, gothic):
+        widths = glyph_widths(gothic)
+        max_width = widths.string_width(TEXT[:TEXT.index("　") + 3], 12)
+        assert widths.split(TEXT, 12, max_width) == ("東京都千代田区丸の内1-2-3 Tower Building", "12F ABCビル")
+
+    def test_split_hard_break(self, gothic):
+        widths = glyph_widths(gothic)
+        first, rest = widths.split("あいうえおかきくけこ", 12, 12 * 3.5)
+        assert (first, rest) == ("あいう", "えおかきくけこ")
+        assert widths.split("あいう", 12, 1) == ("あ", "いう")
+
+    def test_wrap(self, gothic):
+        widths = glyph_widths(gothic)
+        lines = widths.wrap("あ" * 25, 10, 10 * 10)
+        assert lines == ["あ" * 10, "あ" * 10, "あ" * 5]
+        assert widths.wrap("", 10, 100) == [""]
+
+
+def test_textbox_wraps_long_lines(gothic, tmp_path):
+    c = Canvas(str(tmp_path / "out.pdf"), pagesize=A4)
+    drawn = []
+    c.drawString = lambda x, y, text: drawn.append(text)
+    _draw_textbox(c, 2, 150, 30, 28, "あ" * 25 + "\n短い行", font_size=12, font_name=gothic)
+    assert "".join(drawn) == "あ" * 25 + "短い行"
+    assert all(glyph_widths(gothic).string_width(line, 12) <= 30 * 72 / 25.4 for line in drawn)
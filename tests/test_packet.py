@@ -0,0 +1,60 @@
+"""Tests for the 履歴書 + 職務経歴書 packet PDF."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.packet import RESUME_PAGES, render_packet_pdf
+from jp_tenshoku_docs_builder.resume.builder import render_resume_pdf
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.work_history.builder import layout_pdf, render_pdf
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from tests.pdf_helpers import content_streams, page_count
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+@pytest.fixture(scope="module")
+def documents():
+    resume = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+    work_history = load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+    return resume, work_history
+
+
+def _page_numbers(pdf: bytes) -> list[str]:
+    """Page number strings ("n / total") drawn in the content streams."""
+    return [n.decode() for text in content_streams(pdf) for n in re.findall(rb"\((\d+ / \d+)\) Tj", text)]
+
+
+class TestPacket:
+    def test_pages_and_numbering(self, documents, ipaex_font_dir):
+        resume, work_history = documents
+        pdf = render_packet_pdf(resume, work_history, ipaex_font_dir)
+        total = layout_pdf(work_history, ipaex_font_dir).pages
+        assert page_count(pdf) == RESUME_PAGES + total
+        assert _page_numbers(pdf) == [f"{n} / {total}" for n in range(1, total + 1)]
+
+    def test_fonts_embedded_once(self, documents, ipaex_font_dir):
+        resume, work_history = documents
+        packet = render_packet_pdf(resume, work_history, ipaex_font_dir)
+        separate = render_resume_pdf(resume, ipaex_font_dir) + render_pdf(work_history, ipaex_font_dir)
+        subsets = re.findall(rb"/FontName /(\w+)\+", packet)
+        assert len(subsets) == len(set(subsets))
+        assert packet.count(b"/FontFile2") < separate.count(b"/FontFile2")
+        assert len(packet) < 0.9 * len(separate)
+
+
+def test_cli_packet(tmp_path, ipaex_font_dir):
+    out = tmp_path / "packet.pdf"
+    main([str(SAMPLE_DIR / "work_history_standard.yaml"), "-c", str(CREDENTIAL), "--font-dir", str(ipaex_font_dir),
+          "-o", str(out), "--packet", str(SAMPLE_DIR / "resume.yaml")])
+    assert page_count(out.read_bytes()) > RESUME_PAGES
+
+
+def test_cli_packet_rejected_for_resume():
+    with pytest.raises(SystemExit):
+        main([str(SAMPLE_DIR / "resume.yaml"), "-c", str(CREDENTIAL), "--type", "resume",
+              "--packet", str(SAMPLE_DIR / "resume.yaml")])
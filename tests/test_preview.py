@@ -0,0 +1,93 @@
+"""Tests for the HTML / Markdown preview backend."""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.preview import to_html, to_markdown
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.resume.models import HistoryEntry
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from jp_tenshoku_docs_builder.work_history.models import StandardWorkHistory
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+@pytest.fixture
+def standard_data():
+    return load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+
+
+class TestWorkHistoryPreview:
+    def test_section_order_matches_pdf(self, standard_data):
+        html = to_html(standard_data)
+        sections = re.findall(r"<h2>■(.+?)</h2>", html)
+        assert sections == [
+            "職務要約", "活かせる経験・知識・技術", "職務経歴",
+            "副業・その他経歴", "テクニカルスキル", "資格", "自己PR",
+        ]
+        assert html.rstrip().endswith("</html>")
+
+    def test_diamond_structure(self, standard_data):
+        html = to_html(standard_data)
+        for label in ("プロジェクト概要", "担当フェーズ", "業務内容", "実績・取り組み", "言語"):
+            assert f"◆ {label}" in html
+        md = to_markdown(standard_data)
+        assert "**◆ 業務内容**" in md
+
+    def test_star_labels(self):
+        data = load_yaml(SAMPLE_DIR / "work_history_star.yaml", credential_path=CREDENTIAL, content_format="star")
+        html = to_html(data)
+        for label in ("状況（Situation）", "課題（Task）", "行動（Action）", "結果（Result）"):
+            assert f"◆ {label}" in html
+
+    def test_escapes_markup(self):
+        data = StandardWorkHistory(date="2024年", name="<script>&")
+        html = to_html(data)
+        assert "&lt;script&gt;&amp;" in html
+        assert "<script>" not in html
+        md = to_markdown(data)
+        assert "&lt;script&gt;&amp;" in md
+        assert "<script>" not in md
+
+    def test_markdown_table_cells_escape_pipes(self):
+        data = StandardWorkHistory(
+            date="2024年", name="山田",
+            technical_skills=[{"category": "言語", "items": [{"name": "C|C++", "period": "3年", "level": "<b>"}]}],
+            qualifications=[{"name": "A|B", "date": "2020年"}],
+        )
+        md = to_markdown(data)
+        assert "| 言語 | C\\|C++ | 3年 | &lt;b&gt; |" in md
+        assert "| A\\|B | 2020年 |" in md
+
+
+class TestResumePreview:
+    def test_sections(self):
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+        html = to_html(data)
+        assert "学　歴" in html and "職　歴" in html
+        md = to_markdown(data)
+        for label in ("## 学歴・職歴", "## 免許・資格", "## 趣味・特技", "## 志望動機", "## 本人希望記入欄"):
+            assert label in md
+
+    def test_markdown_escapes_markup(self):
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+        data = data.model_copy(update={"hobby": "<img src=x onerror=alert(1)>", "licences": [HistoryEntry(value="a|b")]})
+        md = to_markdown(data)
+        assert "&lt;img src=x onerror=alert(1)&gt;" in md and "<img" not in md
+        assert "| a\\|b |" in md
+
+
+def test_does_not_import_reportlab():
+    code = (
+        "import sys\n"
+        "from jp_tenshoku_docs_builder.preview import to_html\n"
+        "from jp_tenshoku_docs_builder.work_history.loader import load_yaml\n"
+        f"to_html(load_yaml({str(SAMPLE_DIR / 'work_history_standard.yaml')!r}, {str(CREDENTIAL)!r}))\n"
+        "assert 'reportlab' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
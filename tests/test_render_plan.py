@@ -0,0 +1,106 @@
+"""Tests for render plans (recorded drawing calls painted to PDF)."""
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from reportlab import rl_config
+
+from jp_tenshoku_docs_builder.render_plan import RenderPlan, paint_pdf, replay
+from jp_tenshoku_docs_builder.resume.builder import plan_resume_pdf, render_resume_pdf
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.work_history.builder import plan_pdf, render_pdf
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+@pytest.fixture(autouse=True)
+def invariant(monkeypatch):
+    """Fixed creation date and document ID, so equal PDFs are equal bytes."""
+    monkeypatch.setattr(rl_config, "invariant", 1)
+
+
+@pytest.fixture(scope="module")
+def resume():
+    return load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+
+
+@pytest.fixture(scope="module")
+def work_history():
+    return load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+
+
+class _TextCollector:
+    """A minimal backend: collects the strings drawn, ignores everything else."""
+
+    def __init__(self, texts: list[str]):
+        self.texts = texts
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            if name in ("drawString", "drawRightString", "drawCentredString", "_textOut", "textLine"):
+                self.texts.append(args[-1] if name.startswith("draw") else args[0])
+            return self
+
+        return call
+
+
+class TestPaint:
+    @pytest.mark.parametrize("content_format", ["standard", "star"])
+    def test_work_history_same_pdf(self, ipaex_font_dir, content_format):
+        data = load_yaml(
+            SAMPLE_DIR / f"work_history_{content_format}.yaml", credential_path=CREDENTIAL, content_format=content_format,
+        )
+        plan = plan_pdf(data, ipaex_font_dir, content_format=content_format, split_in_row=0)
+        expected = render_pdf(data, ipaex_font_dir, content_format=content_format, split_in_row=0)
+        assert paint_pdf(plan) == expected
+
+    def test_resume_same_pdf(self, resume, ipaex_font_dir, tmp_path):
+        photo = tmp_path / "photo.png"
+        Image.new("RGB", (600, 800), "gray").save(photo)  # prepared (resampled) before drawing
+        data = resume.model_copy(update={"photo": str(photo), "name": resume.name + "①"})
+        fallback = ipaex_font_dir / "ipaexg.ttf"
+        plan = plan_resume_pdf(data, ipaex_font_dir, fallback_font=fallback)
+        assert len(plan.images) == 1
+        assert paint_pdf(plan) == render_resume_pdf(data, ipaex_font_dir, fallback_font=fallback)
+
+    def test_json_round_trip(self, resume, ipaex_font_dir):
+        plan = plan_resume_pdf(resume, ipaex_font_dir)
+        restored = RenderPlan.from_json(plan.to_json())
+        assert restored == plan
+        assert paint_pdf(restored) == paint_pdf(plan)
+
+    def test_output_options(self, work_history, ipaex_font_dir):
+        plan = plan_pdf(work_history, ipaex_font_dir)
+        compressed = paint_pdf(plan)
+        plain = paint_pdf(plan, compression=False, metadata={"title": "Work History"})
+        assert b"BT 1 0 0 1 " not in compressed
+        assert b"BT 1 0 0 1 " in plain
+        assert b"(Work History)" in plain
+        assert len(plan.pages) == compressed.count(b"/Type /Page\n")
+
+    def test_replay_to_another_backend(self, work_history, ipaex_font_dir):
+        texts = []
+        replay(plan_pdf(work_history, ipaex_font_dir), _TextCollector(texts))
+        assert texts[0] == "1 / 3"  # page number, drawn before the frame content
+        assert {"職 務 経 歴 書", "■職務要約", "以上"} <= set(texts)
+
+
+class TestErrors:
+    def test_unregistered_font(self, resume, ipaex_font_dir):
+        plan = plan_resume_pdf(resume, ipaex_font_dir)
+        plan.fonts = [*plan.fonts, "NoSuchFont"]
+        with pytest.raises(ValueError, match="NoSuchFont"):
+            paint_pdf(plan)
+
+    def test_unknown_metadata(self, resume, ipaex_font_dir):
+        with pytest.raises(ValueError, match="colour"):
+            paint_pdf(plan_resume_pdf(resume, ipaex_font_dir), metadata={"colour": "red"})
+
+    def test_unsupported_version(self, resume, ipaex_font_dir):
+        d = plan_resume_pdf(resume, ipaex_font_dir).to_dict()
+        d["version"] = 0
+        with pytest.raises(ValueError, match="version"):
+            RenderPlan.from_dict(d)
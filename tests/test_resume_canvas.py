@@ -0,0 +1,140 @@
+"""Tests for the graphics-state-tracking canvas."""
+
+import re
+from pathlib import Path
+
+import pytest
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen.canvas import Canvas
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.resume.builder import _draw_page1, _draw_page2, render_resume_pdf
+from jp_tenshoku_docs_builder.resume.canvas import RenderStats, StateTrackingCanvas
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+@pytest.fixture(scope="module")
+def resume():
+    return load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+
+
+def _page_code(canvas_class, draw) -> list[str]:
+    c = canvas_class(None, pagesize=A4)
+    draw(c)
+    return list(c._code)
+
+
+def _painted(code: list[str]) -> list[tuple]:
+    """Replay the state operators; list each painting operation with the state it sees."""
+    state = {"w": "1", "d": "[] 0", "Tf": "/F1 12 Tf 14.4 TL"}
+    stack, painted = [], []
+    for op in code:
+        if op == "q":
+            stack.append(dict(state))
+        elif op == "Q":
+            state = stack.pop()
+        elif op.endswith(" w"):
+            state["w"] = op[:-2]
+        elif op.endswith(" d"):
+            state["d"] = op[:-2]
+        elif op.startswith("BT"):
+            # Font selections inside a text object persist after ET
+            parts = re.split(r"(/\S+ [\d.]+ Tf [\d.]+ TL) ?", op)
+            fonts = []
+            for i, part in enumerate(parts):
+                if i % 2:
+                    state["Tf"] = part
+                else:
+                    fonts += [state["Tf"]] * part.count(" Tj")
+            if fonts:
+                painted.append(("text", fonts, "".join(parts[::2])))
+        else:
+            painted.append(("path", state["w"], state["d"], op))
+    return painted
+
+
+class TestStateTrackingCanvas:
+    @pytest.mark.parametrize("font_dir", [None, "ipaex"])
+    def test_same_drawing_fewer_operators(self, resume, font_dir, ipaex_font_dir):
+        fonts = register_fonts(ipaex_font_dir if font_dir else None)
+        for draw in (lambda c: _draw_page1(c, resume, fonts), lambda c: _draw_page2(c, resume, fonts)):
+            plain = _page_code(Canvas, draw)
+            tracked = _page_code(StateTrackingCanvas, draw)
+            assert _painted(tracked) == _painted(plain)
+            assert len(tracked) < len(plain)
+
+    def test_elides_only_repeats(self):
+        c = StateTrackingCanvas(None)
+        c.setLineWidth(1)  # initial value
+        c.setLineWidth(0.5)
+        c.setLineWidth(0.5)
+        c.setDash()
+        c.setDash(3, 3)
+        c.setDash([3, 3], 0)
+        c.setFont("Helvetica", 12)  # set by the page preamble
+        c.setFont("Helvetica", 9)
+        c.setFontSize(9)
+        c.setFillColor(colors.red)
+        c.setFillColor(colors.red)
+        c.setStrokeColor(colors.red)
+        assert c._code == [".5 w", "[3 3] 0 d", "BT /F1 9 Tf 10.8 TL ET", "1 0 0 rg", "1 0 0 RG"]
+        assert c.stats.elided == {"line_width": 2, "dash": 2, "font": 2, "fill_color": 1}
+
+    def test_restore_state(self):
+        c = StateTrackingCanvas(None)
+        c.setLineWidth(2)
+        c.saveState()
+        c.setLineWidth(0.5)
+        c.restoreState()
+        c.setLineWidth(0.5)  # back to 2 after Q
+        assert c._code[-2:] == ["Q", ".5 w"]
+        assert c.stats.elided["line_width"] == 0
+
+    def test_font_set_in_text_object(self):
+        c = StateTrackingCanvas(None)
+        t = c.beginText(0, 0)
+        t.setFont("Courier", 10)
+        t.textLine("x")
+        c.drawText(t)
+        c.setFont("Helvetica", 12)  # the text object left Courier selected
+        assert c._code[-1] == "BT /F1 12 Tf 14.4 TL ET"
+
+    def test_truetype_font_carried_across_text_objects(self, ipaex_font_dir):
+        fonts = register_fonts(ipaex_font_dir)
+        c = StateTrackingCanvas(None)
+        c.setFont(fonts.mincho, 9)
+        c.drawString(0, 0, "A")
+        c.drawString(0, 10, "B")
+        c.setFont(fonts.mincho, 10)
+        c.drawString(0, 20, "C")
+        assert [op.count(" Tf ") for op in c._code] == [1, 0, 1]
+        assert c.stats.elided["font"] == 1
+
+    def test_new_page_resets_state(self):
+        c = StateTrackingCanvas(None)
+        c.setLineWidth(0.5)
+        c.showPage()
+        c.setLineWidth(0.5)
+        assert c._code == [".5 w"]
+        assert c.stats.pages == 1
+
+
+def test_render_stats(resume, ipaex_font_dir):
+    stats = RenderStats()
+    render_resume_pdf(resume, ipaex_font_dir, stats=stats)
+    assert stats.pages == 2
+    assert stats.content_bytes > 0
+    assert stats.elided["line_width"] > 40
+    assert stats.elided["dash"] > 20
+    assert stats.elided["font"] > 10
+    assert "line_width" in stats.to_text()
+
+
+def test_fallback_canvas_tracks_state(resume, ipaex_font_dir):
+    stats = RenderStats()
+    render_resume_pdf(resume, ipaex_font_dir, fallback_font=ipaex_font_dir / "ipaexg.ttf", stats=stats)
+    assert stats.elided["line_width"] > 0
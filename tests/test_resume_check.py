@@ -0,0 +1,97 @@
+"""Tests for the 履歴書 overflow check."""
+
+from pathlib import Path
+
+import pytest
+from reportlab.lib.units import mm
+
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.metrics import glyph_widths
+from jp_tenshoku_docs_builder.resume.builder import (
+    _CELLS,
+    _CONTACT_NOTE,
+    _CONTACT_NOTE_RIGHT,
+    _FS_SMALL,
+    _MX,
+    plan_resume_pdf,
+)
+from jp_tenshoku_docs_builder.resume.check import check_resume
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.resume.models import HistoryEntry
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+
+@pytest.fixture
+def resume():
+    return load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=SAMPLE_DIR / "credential.yaml")
+
+
+def _overflows(data, font_dir):
+    return {(o.field, o.kind): o for o in check_resume(data, font_dir)}
+
+
+class TestCheckResume:
+    def test_sample_fits(self, resume, ipaex_font_dir):
+        assert check_resume(resume, ipaex_font_dir) == []
+
+    def test_cell_width(self, resume, ipaex_font_dir):
+        data = resume.model_copy(update={"email": "a.very.long.mail.address@example-company.co.jp"})
+        overflow = _overflows(data, ipaex_font_dir)[("email", "width")]
+        assert overflow.limit == 64
+        assert overflow.actual > 64
+
+    def test_contact_zip_ends_at_note(self, resume, ipaex_font_dir):
+        data = resume.model_copy(update={"address_zip2": "123-4567 " * 8})
+        overflow = _overflows(data, ipaex_font_dir)[("address_zip2", "width")]
+        note = glyph_widths(register_fonts(ipaex_font_dir).mincho).string_width(_CONTACT_NOTE, _FS_SMALL) / mm
+        assert overflow.limit == pytest.approx(_CONTACT_NOTE_RIGHT - note - 16)
+        assert overflow.actual > overflow.limit
+
+    def test_history_rows(self, resume, ipaex_font_dir):
+        entries = [HistoryEntry(year="2020", month="4", value="入社") for _ in range(14)]
+        data = resume.model_copy(update={"education": [], "experience": entries})
+        overflow = _overflows(data, ipaex_font_dir)[("education/experience", "rows")]
+        assert (overflow.limit, overflow.actual) == (15, 16)
+
+    def test_history_value_width(self, resume, ipaex_font_dir):
+        data = resume.model_copy(update={"licences": [HistoryEntry(value="資格" * 40)]})
+        assert ("licences[0].value", "width") in _overflows(data, ipaex_font_dir)
+
+    def test_textbox_lines(self, resume, ipaex_font_dir):
+        data = resume.model_copy(update={"motivation": "\n".join(["志望動機"] * 6)})
+        overflow = _overflows(data, ipaex_font_dir)[("motivation", "lines")]
+        assert (overflow.limit, overflow.actual) == (5, 6)
+
+    def test_address_lines(self, resume, ipaex_font_dir):
+        data = resume.model_copy(update={"address": "東京都千代田区" * 20})
+        assert ("address", "lines") in _overflows(data, ipaex_font_dir)
+
+
+def test_cells_match_drawn_positions(resume, ipaex_font_dir):
+    # Each field drawn where _CELLS puts it, in the font size check_resume measures with
+    data = resume.model_copy(update={field: f"<{field}>" for field in _CELLS})
+    drawn = {}
+    for page in plan_resume_pdf(data, ipaex_font_dir).pages:
+        size = None
+        for target, method, args, _, _ in page:
+            if target is None and method == "setFont":
+                size = args[1]
+            elif target is None and method == "drawString":
+                drawn[args[2]] = (args[0] / mm - _MX, args[1] / mm, size)
+    for field, (x, y, _, font_size) in _CELLS.items():
+        assert drawn[f"<{field}>"] == (pytest.approx(x), pytest.approx(y), font_size), field
+
+
+class TestCheckCli:
+    def test_exit_code(self, tmp_path, ipaex_font_dir, capsys):
+        argv = [str(SAMPLE_DIR / "resume.yaml"), "--type", "resume", "-c", str(SAMPLE_DIR / "credential.yaml"),
+                "--font-dir", str(ipaex_font_dir), "-o", str(tmp_path / "out.pdf"), "--check"]
+        main(argv)
+        assert "OK" in capsys.readouterr().out
+        assert not (tmp_path / "out.pdf").exists()
+
+    def test_work_history_rejected(self):
+        with pytest.raises(SystemExit):
+            main([str(SAMPLE_DIR / "work_history_standard.yaml"), "-c", str(SAMPLE_DIR / "credential.yaml"), "--check"])
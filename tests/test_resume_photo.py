@@ -0,0 +1,91 @@
+"""Tests for the 履歴書 photo preparation."""
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from jp_tenshoku_docs_builder.resume import photo as photo_module
+from jp_tenshoku_docs_builder.resume.builder import build_resume_pdf
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.resume.photo import prepare_photo, target_size
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+
+@pytest.fixture(autouse=True)
+def empty_memory_cache(monkeypatch):
+    monkeypatch.setattr(photo_module, "_MEMORY_CACHE", type(photo_module._MEMORY_CACHE)())
+
+
+@pytest.fixture
+def large_jpeg(tmp_path):
+    path = tmp_path / "large.jpg"
+    Image.effect_noise((1200, 1600), 50).convert("RGB").save(path, quality=90)
+    return path
+
+
+def _size(image):
+    return Image.open(image.fp).size
+
+
+class TestPreparePhoto:
+    def test_target_size(self):
+        assert target_size(30, 40, 300) == (354, 472)
+
+    def test_small_jpeg_passes_through(self, tmp_path):
+        path = tmp_path / "small.jpg"
+        Image.new("RGB", (300, 400), "gray").save(path)
+        assert prepare_photo(path, 30, 40) == str(path)
+
+    def test_large_jpeg_is_downscaled(self, large_jpeg):
+        image = prepare_photo(large_jpeg, 30, 40, dpi=150)
+        width, height = _size(image)
+        assert (width, height) == target_size(30, 40, 150)
+        assert image.jpeg_fh() is not None  # embedded as JPEG, not raw pixels
+
+    def test_png_with_alpha_is_flattened(self, tmp_path):
+        path = tmp_path / "photo.png"
+        Image.new("RGBA", (100, 100), (255, 0, 0, 0)).save(path)
+        image = prepare_photo(path, 30, 40)
+        assert Image.open(image.fp).mode == "RGB"
+
+    def test_exif_rotation_applied(self, tmp_path):
+        path = tmp_path / "rotated.jpg"
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotate 90° clockwise
+        Image.new("RGB", (400, 300), "gray").save(path, exif=exif)
+        assert _size(prepare_photo(path, 30, 40)) == (300, 400)
+
+    def test_cached_in_memory_and_on_disk(self, large_jpeg, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        first = prepare_photo(large_jpeg, 30, 40, cache_dir=cache_dir)
+        assert len(list(cache_dir.glob("photo-*.jpg"))) == 1
+
+        calls = []
+        monkeypatch.setattr(photo_module, "_resample", lambda *a: calls.append(a))
+        second = prepare_photo(large_jpeg, 30, 40, cache_dir=cache_dir)
+        assert second.fp.getvalue() == first.fp.getvalue()
+
+        monkeypatch.setattr(photo_module, "_MEMORY_CACHE", type(photo_module._MEMORY_CACHE)())
+        third = prepare_photo(large_jpeg, 30, 40, cache_dir=cache_dir)
+        assert third.fp.getvalue() == first.fp.getvalue()
+        assert calls == []
+
+    def test_unwritable_cache_dir_warns(self, large_jpeg, tmp_path, capsys):
+        cache_dir = tmp_path / "not-a-dir"
+        cache_dir.write_text("", encoding="utf-8")
+        image = prepare_photo(large_jpeg, 30, 40, cache_dir=cache_dir)
+        assert _size(image) == (354, 472)
+        assert "WARNING: Could not write photo cache" in capsys.readouterr().err
+
+    def test_dpi_is_part_of_the_key(self, large_jpeg):
+        assert _size(prepare_photo(large_jpeg, 30, 40, dpi=150)) != _size(prepare_photo(large_jpeg, 30, 40, dpi=300))
+
+
+def test_resume_pdf_embeds_downscaled_photo(large_jpeg, tmp_path):
+    data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=SAMPLE_DIR / "credential.yaml")
+    data = data.model_copy(update={"photo": str(large_jpeg)})
+    out = build_resume_pdf(data, tmp_path / "out.pdf", photo_dpi=150)
+    assert out.stat().st_size < large_jpeg.stat().st_size / 10
+    assert b"/Width 177" in out.read_bytes()
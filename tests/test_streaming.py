@@ -0,0 +1,118 @@
+"""Tests for page-streaming PDF output."""
+
+import re
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.streaming import DeferredFlowables, DeferringDocTemplate, StreamingCanvas
+from jp_tenshoku_docs_builder.work_history.builder import _layout, build_pdf
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from jp_tenshoku_docs_builder.work_history.styles import StyleScale, build_styles
+from tests.pdf_helpers import content_streams, page_count
+from tests.synthetic import make_work_history
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+@pytest.fixture(scope="module")
+def work_history():
+    return load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+
+
+def _xref_offsets(pdf: bytes) -> dict[int, int]:
+    at = int(pdf[pdf.rindex(b"startxref") + 9:].split()[0])
+    assert pdf.startswith(b"xref", at)
+    tokens = pdf[at + 4:pdf.index(b"trailer", at)].split()
+    first = int(tokens[0])
+    return {
+        first + i: int(tokens[2 + 3 * i])
+        for i in range(int(tokens[1]))
+        if tokens[4 + 3 * i] == b"n"
+    }
+
+
+class TestStreamingOutput:
+    def test_same_pages_as_regular_render(self, tmp_path, ipaex_font_dir, work_history):
+        regular = build_pdf(work_history, tmp_path / "regular.pdf", ipaex_font_dir).read_bytes()
+        streamed = build_pdf(work_history, tmp_path / "streamed.pdf", ipaex_font_dir, streaming=True).read_bytes()
+        assert content_streams(streamed) == content_streams(regular)
+        assert streamed.count(b" 0 obj") == regular.count(b" 0 obj")
+
+    def test_cross_reference_table(self, tmp_path, ipaex_font_dir, work_history):
+        pdf = build_pdf(work_history, tmp_path / "out.pdf", ipaex_font_dir, streaming=True).read_bytes()
+        assert pdf.startswith(b"%PDF-1.4")
+        offsets = _xref_offsets(pdf)
+        assert len(offsets) == pdf.count(b" 0 obj")
+        for num, offset in offsets.items():
+            assert pdf.startswith(b"%d 0 obj" % num, offset)
+        size = int(re.search(rb"/Size (\d+)", pdf[pdf.rindex(b"trailer"):]).group(1))
+        assert size == max(offsets) + 1
+
+    def test_content_streams_written_before_fonts(self, tmp_path, ipaex_font_dir, work_history):
+        pdf = build_pdf(work_history, tmp_path / "out.pdf", ipaex_font_dir, streaming=True).read_bytes()
+        offsets = _xref_offsets(pdf)
+        contents = [int(n) for n in re.findall(rb"/Contents (\d+) 0 R", pdf)]
+        assert max(offsets[n] for n in contents) < pdf.index(b"/FontFile2")
+
+
+class TestDeferredFlowables:
+    def test_layout_unchanged(self, ipaex_font_dir):
+        data = make_work_history(companies=4, projects_per_company=6)
+        styles = build_styles(register_fonts(ipaex_font_dir), StyleScale())
+        eager = _layout(data, styles)
+        deferred = _layout(data, styles, deferred=True)
+        assert deferred.pages == eager.pages
+        assert deferred.anchors == eager.anchors
+
+    def test_expanded_on_demand(self):
+        built = []
+
+        def factory():
+            built.append(1)
+            return []
+
+        flowables = [DeferredFlowables(factory)]
+        doc = DeferringDocTemplate("")
+        doc.filterFlowables(flowables)
+        assert built == [1]
+        assert flowables == [None]
+
+    def test_getpdfdata_unavailable(self, tmp_path):
+        canvas = StreamingCanvas(str(tmp_path / "out.pdf"))
+        with pytest.raises(TypeError, match="use save"):
+            canvas.getpdfdata()
+        canvas.save()
+
+
+def test_memory_bounded_for_200_pages(tmp_path, ipaex_font_dir):
+    data = make_work_history(companies=46)
+    register_fonts(ipaex_font_dir)  # font loading is not part of the measurement
+    tracemalloc.start()
+    try:
+        build_pdf(data, tmp_path / "long.pdf", ipaex_font_dir, streaming=True)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    pages = page_count((tmp_path / "long.pdf").read_bytes())
+    assert pages >= 200
+    # A regular render of this document peaks at over 20MB
+    assert peak < 12 * 1024 * 1024
+
+
+def test_cli_flag(tmp_path, ipaex_font_dir):
+    out = tmp_path / "out.pdf"
+    main([str(SAMPLE_DIR / "work_history_standard.yaml"), "-c", str(CREDENTIAL),
+          "--font-dir", str(ipaex_font_dir), "-o", str(out), "--streaming"])
+    assert _xref_offsets(out.read_bytes())
+
+
+def test_cli_rejects_resume(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main([str(SAMPLE_DIR / "resume.yaml"), "-c", str(CREDENTIAL), "--type", "resume",
+              "-o", str(tmp_path / "out.pdf"), "--streaming"])
+    assert "--streaming" in capsys.readouterr().err
@@ -0,0 +1,88 @@
+"""Tests for the validation-only subcommand."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.validate import validate_file
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+@pytest.fixture
+def invalid_yaml(tmp_path):
+    path = tmp_path / "invalid.yaml"
+    path.write_text(
+        'date: "2024年1月1日"\n'
+        "experience:\n"
+        '  - company: "A社"\n'
+        "    period: 3\n"
+        "    projects:\n"
+        '      - name: "x"\n',
+        encoding="utf-8",
+    )
+    return path
+
+
+class TestValidateFile:
+    @pytest.mark.parametrize("name,doc_type,content_format", [
+        ("work_history_standard.yaml", "work-history", "standard"),
+        ("work_history_star.yaml", "work-history", "star"),
+        ("resume.yaml", "resume", "standard"),
+    ])
+    def test_samples_valid(self, name, doc_type, content_format):
+        assert validate_file(SAMPLE_DIR / name, doc_type, content_format, CREDENTIAL) == []
+
+    def test_errors_have_line_and_column(self, invalid_yaml):
+        issues = {i.field: i for i in validate_file(invalid_yaml, credential=CREDENTIAL)}
+        assert (issues["experience[0].period"].line, issues["experience[0].period"].column) == (4, 13)
+        # Missing field: points at the mapping that should contain it
+        missing = issues["experience[0].projects[0].period"]
+        assert (missing.line, missing.column, missing.type) == (6, 9, "missing")
+
+    def test_missing_top_level_fields_need_credential(self, tmp_path):
+        path = tmp_path / "wh.yaml"
+        path.write_text('date: "2024年1月1日"\n', encoding="utf-8")
+        assert validate_file(path) == []
+        empty = tmp_path / "credential.yaml"
+        empty.write_text("{}\n", encoding="utf-8")
+        assert [i.field for i in validate_file(path, credential=empty)] == ["name"]
+
+    def test_credential_errors_point_into_credential(self, tmp_path):
+        path = tmp_path / "wh.yaml"
+        path.write_text('date: "2024年1月1日"\nname: "A"\n', encoding="utf-8")
+        credential = tmp_path / "credential.yaml"
+        credential.write_text("name:\n  - list\n", encoding="utf-8")
+        [issue] = validate_file(path, credential=credential)
+        assert (issue.file, issue.line) == (str(credential), 2)
+
+    def test_syntax_error(self, tmp_path):
+        path = tmp_path / "broken.yaml"
+        path.write_text("a: [1\n", encoding="utf-8")
+        [issue] = validate_file(path)
+        assert issue.type == "yaml"
+        assert issue.line == 2
+
+
+class TestValidateCli:
+    def test_json_output(self, invalid_yaml, capsys):
+        with pytest.raises(SystemExit):
+            main(["validate", str(SAMPLE_DIR / "work_history_standard.yaml"), str(invalid_yaml),
+                  "--output-format", "json"])
+        issues = json.loads(capsys.readouterr().out)
+        assert {i["file"] for i in issues} == {str(invalid_yaml)}
+        assert {i["field"] for i in issues} == {"experience[0].period", "experience[0].projects[0].period"}
+
+    def test_does_not_import_reportlab(self):
+        code = (
+            "import sys\n"
+            "from jp_tenshoku_docs_builder.cli import main\n"
+            f"main(['validate', {str(SAMPLE_DIR / 'resume.yaml')!r}, '--type', 'resume'])\n"
+            "assert not any(m.startswith('reportlab') for m in sys.modules), 'reportlab imported'\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,79 @@
+"""Tests for supervised rendering with time and memory limits."""
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.resume.loader import load_resume_yaml
+from jp_tenshoku_docs_builder.watchdog import RenderError, RenderFailure, RenderWatchdog
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from tests.adversarial import SUPERVISED, fuzz_cases, stress_cases
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+def _case(name: str):
+    return next(case for case in stress_cases() if case.name == name)
+
+
+def _failure(watchdog: RenderWatchdog, case, font_dir, tmp_path) -> RenderFailure:
+    render = watchdog.render_resume if case.kind == "resume" else watchdog.render_work_history
+    with pytest.raises(RenderError) as e:
+        render(case.build(tmp_path), font_dir=font_dir, **case.options)
+    return e.value.failure
+
+
+class TestRenderWatchdog:
+    def test_work_history(self, ipaex_font_dir):
+        data = load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+        pdf = RenderWatchdog().render_work_history(data, font_dir=ipaex_font_dir, split_in_row=0)
+        assert pdf.startswith(b"%PDF")
+
+    def test_resume(self, ipaex_font_dir):
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+        pdf = RenderWatchdog().render_resume(data, font_dir=ipaex_font_dir)
+        assert pdf.startswith(b"%PDF")
+
+    def test_layout_error(self, ipaex_font_dir, tmp_path):
+        failure = _failure(RenderWatchdog(), _case("tall_row_no_split"), ipaex_font_dir, tmp_path)
+        assert failure.kind == "layout"
+        assert failure.message.startswith("LayoutError: ")
+
+    def test_timeout_kills_render(self, ipaex_font_dir, tmp_path):
+        failure = _failure(RenderWatchdog(timeout=2), _case("many_responsibilities"), ipaex_font_dir, tmp_path)
+        assert failure.kind == "timeout"
+        assert failure.elapsed >= 2
+        assert not [p for p in multiprocessing.active_children() if p.name.startswith("render-")]
+
+    def test_memory_limit(self, ipaex_font_dir, tmp_path):
+        pytest.importorskip("resource")
+        watchdog = RenderWatchdog(max_memory=256 * 1024 * 1024)
+        # The limit is above the baseline of a render process...
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+        assert watchdog.render_resume(data, font_dir=ipaex_font_dir).startswith(b"%PDF")
+        # ...and below a photo that decodes to 243 MB
+        failure = _failure(watchdog, _case("resume_large_photo"), ipaex_font_dir, tmp_path)
+        assert failure.kind == "memory"
+        assert failure.to_dict()["kind"] == "memory"
+
+    def test_error(self, ipaex_font_dir):
+        data = load_resume_yaml(SAMPLE_DIR / "resume.yaml", credential_path=CREDENTIAL)
+        with pytest.raises(RenderError, match="^error: TypeError"):
+            RenderWatchdog().render_resume(data, font_dir=ipaex_font_dir, no_such_option=1)
+
+    @pytest.mark.parametrize("limits", [{"timeout": 0}, {"max_memory": -1}])
+    def test_invalid_limits(self, limits):
+        with pytest.raises(ValueError):
+            RenderWatchdog(**limits)
+
+
+def test_fuzz_cases_are_supervised(ipaex_font_dir, tmp_path):
+    watchdog = RenderWatchdog(timeout=30)
+    for case in fuzz_cases(seed=1, count=6):
+        render = watchdog.render_resume if case.kind == "resume" else watchdog.render_work_history
+        try:
+            render(case.build(tmp_path), font_dir=ipaex_font_dir, **case.options)
+        except RenderError as e:
+            assert e.failure.kind in SUPERVISED, case.name
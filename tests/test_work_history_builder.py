@@ -0,0 +1,93 @@
+"""Tests for work history flowable construction."""
+
+import io
+import re
+
+import pytest
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Paragraph, Table
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.work_history.builder import (
+    _build_company_table,
+    _build_elements,
+    _escape,
+    _make_doc,
+    _plain_paragraph,
+)
+from jp_tenshoku_docs_builder.work_history.styles import build_styles
+from tests.synthetic import make_work_history
+
+
+def _drawn(paragraph: Paragraph, width: float) -> list[str]:
+    canvas = Canvas(io.BytesIO())
+    paragraph.wrapOn(canvas, width, 1000)
+    paragraph.drawOn(canvas, 0, 0)
+    # The parser splits fragments around entities ("(R) Tj (&) Tj (D) Tj");
+    # adjacent show-text operators place glyphs identically, so merge them.
+    return [re.sub(r"\) Tj \(", "", op) for op in canvas._code]
+
+
+class TestPlainParagraph:
+    @pytest.mark.parametrize("lines", [
+        ["Python"],
+        ["◆ 言語", "Python", "Go"],
+        ["", "leading blank", ""],
+        ["  collapse   inner \t spaces  "],
+        ["資本金：5千万円　売上高：3億円"],
+        ["a & b < c > d", "R&D"],
+        ["long line " * 20],
+        [],
+    ])
+    def test_identical_to_markup_parser(self, lines):
+        style = ParagraphStyle("t", fontName="Helvetica", fontSize=8, leading=12.8)
+        parsed = Paragraph("<br/>".join(_escape(line) for line in lines), style)
+        direct = _plain_paragraph(lines, style)
+        assert _drawn(direct, 120) == _drawn(parsed, 120)
+        assert direct.getPlainText() == parsed.getPlainText()
+
+
+class _HeaderCountingCanvas(Canvas):
+    """Records how many column-header rows (their grey fill) each page draws."""
+
+    headers: list[int] = []
+
+    def showPage(self):
+        self.headers.append(self._code.count(".95 .95 .95 rg"))
+        super().showPage()
+
+
+def _header_rows_per_page(data, styles, split_in_row: int, table_layout: str) -> list[int]:
+    _HeaderCountingCanvas.headers = []
+    doc = _make_doc(io.BytesIO(), lambda canvas, doc: None)
+    doc.build(
+        _build_elements(data, styles, split_in_row=split_in_row, table_layout=table_layout),
+        canvasmaker=_HeaderCountingCanvas,
+    )
+    return _HeaderCountingCanvas.headers
+
+
+@pytest.fixture(scope="module")
+def styles(ipaex_font_dir):
+    return build_styles(register_fonts(ipaex_font_dir))
+
+
+class TestCompanyTableLayout:
+    def test_one_table_per_company(self, styles):
+        company = make_work_history(companies=1, projects_per_company=5).experience[0]
+        tables = [f for f in _build_company_table(company, styles, table_layout="company") if isinstance(f, Table)]
+        projects = tables[-1]
+        assert len(tables) == 3  # company header, company info, projects
+        assert projects._nrows == 6
+        assert projects.repeatRows == 1
+
+    @pytest.mark.parametrize("split_in_row", [1, 0])
+    def test_header_once_per_page(self, styles, split_in_row):
+        data = make_work_history(companies=1, projects_per_company=12, skill_categories=0, qualifications=0)
+        per_project = _header_rows_per_page(data, styles, split_in_row, "project")
+        per_company = _header_rows_per_page(data, styles, split_in_row, "company")
+        assert max(per_project) > 1
+        # The projects span every page; the header is drawn at the top of each
+        assert per_company == [1] * len(per_company)
+        assert len(per_company) <= len(per_project)
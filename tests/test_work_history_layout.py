@@ -0,0 +1,87 @@
+"""Tests for the layout-only (dry run) pass of the work history builder."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.work_history.builder import build_pdf, layout_pdf
+from jp_tenshoku_docs_builder.work_history.fit import fit_to_pages
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from jp_tenshoku_docs_builder.work_history.styles import StyleScale
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+
+
+@pytest.fixture
+def standard_data():
+    return load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=SAMPLE_DIR / "credential.yaml")
+
+
+class TestLayoutPdf:
+    def test_sections_in_order(self, standard_data):
+        report = layout_pdf(standard_data)
+        sections = [a.label for a in report.anchors if a.kind == "section"]
+        assert sections == [
+            "職務経歴書", "職務要約", "活かせる経験・知識・技術", "職務経歴",
+            "副業・その他経歴", "テクニカルスキル", "資格", "自己PR",
+        ]
+        companies = [a.label for a in report.anchors if a.kind == "company"]
+        assert companies == ["株式会社テクノシステム", "フリーランス"]
+
+    def test_positions_are_monotonic(self, standard_data):
+        report = layout_pdf(standard_data)
+        positions = [(a.page, a.y_mm) for a in report.anchors]
+        assert positions == sorted(positions)
+        assert all(1 <= a.page <= report.pages for a in report.anchors)
+
+    def test_page_count_matches_render(self, standard_data, tmp_path):
+        out = build_pdf(standard_data, tmp_path / "out.pdf")
+        assert f"/Count {layout_pdf(standard_data).pages}".encode() in out.read_bytes()
+
+
+class TestDryRunCli:
+    def test_json_output_writes_no_pdf(self, tmp_path, capsys):
+        out = tmp_path / "out.pdf"
+        main([
+            str(SAMPLE_DIR / "work_history_standard.yaml"),
+            "-c", str(SAMPLE_DIR / "credential.yaml"),
+            "-o", str(out),
+            "--dry-run-layout", "json",
+        ])
+        report = json.loads(capsys.readouterr().out)
+        assert report["pages"] >= 1
+        assert report["anchors"][0]["label"] == "職務経歴書"
+        assert not out.exists()
+
+    def test_company_table_layout(self, standard_data, capsys):
+        main([
+            str(SAMPLE_DIR / "work_history_standard.yaml"),
+            "-c", str(SAMPLE_DIR / "credential.yaml"),
+            "--dry-run-layout", "json", "--table-layout", "company",
+        ])
+        report = json.loads(capsys.readouterr().out)
+        expected = layout_pdf(standard_data, table_layout="company")
+        assert report["pages"] == expected.pages
+        assert [a["label"] for a in report["anchors"]] == [a.label for a in expected.anchors]
+
+
+class TestFitToPages:
+    def test_already_fits(self, standard_data):
+        pages = layout_pdf(standard_data).pages
+        result = fit_to_pages(standard_data, pages)
+        assert result.scale == StyleScale()
+        assert result.passes == 1
+
+    def test_shrinks_to_fit(self, standard_data):
+        pages = layout_pdf(standard_data).pages
+        result = fit_to_pages(standard_data, pages - 1)
+        assert result.pages <= pages - 1
+        assert StyleScale.readability_floor() <= result.scale.font < 1.0
+        assert result.passes <= 8
+        assert layout_pdf(standard_data, scale=result.scale).pages == result.pages
+
+    def test_refuses_below_readability_floor(self, standard_data):
+        with pytest.raises(ValueError, match="readability floor"):
+            fit_to_pages(standard_data, 1)
@@ -0,0 +1,69 @@
+"""Tests for Japanese line breaking (禁則処理) in work history paragraphs."""
+
+import pytest
+
+from jp_tenshoku_docs_builder.fonts import register_fonts
+from jp_tenshoku_docs_builder.work_history.builder import _plain_paragraph
+from jp_tenshoku_docs_builder.work_history.linebreak import CANNOT_END, CANNOT_START, HANGING, JapaneseParagraph
+from jp_tenshoku_docs_builder.work_history.styles import build_styles
+
+# 8pt IPAex: full-width characters are 8pt wide, so 10 per 80pt line
+WIDTH = 80
+
+
+@pytest.fixture
+def cell_style(ipaex_font_dir):
+    return build_styles(register_fonts(ipaex_font_dir))["cell"]
+
+
+def _lines(paragraph, width=WIDTH):
+    paragraph.wrap(width, 10000)
+    return ["".join(w.text for w in line.words) for line in paragraph.blPara.lines]
+
+
+class TestKinsoku:
+    def test_styles_use_cjk_wrap(self, cell_style):
+        assert cell_style.wordWrap == "CJK"
+
+    def test_plain_japanese_fills_lines(self, cell_style):
+        assert _lines(_plain_paragraph(["あ" * 25], cell_style)) == ["あ" * 10, "あ" * 10, "あ" * 5]
+
+    def test_line_start_prohibited_pushes_previous_char(self, cell_style):
+        lines = _lines(_plain_paragraph(["あ" * 9 + "いっ" + "う"], cell_style))
+        assert lines == ["あ" * 9, "いっう"]
+
+    def test_punctuation_hangs(self, cell_style):
+        lines = _lines(_plain_paragraph(["あ" * 10 + "。次の文"], cell_style))
+        assert lines == ["あ" * 10 + "。", "次の文"]
+
+    def test_punctuation_before_bracket_does_not_hang(self, cell_style):
+        lines = _lines(_plain_paragraph(["あ" * 10 + "。」次の文"], cell_style))
+        assert lines == ["あ" * 9, "あ。」次の文"]
+
+    def test_line_end_prohibited(self, cell_style):
+        lines = _lines(_plain_paragraph(["あ" * 9 + "「かぎ」"], cell_style))
+        assert lines == ["あ" * 9, "「かぎ」"]
+
+    def test_latin_word_kept_whole(self, cell_style):
+        lines = _lines(_plain_paragraph(["あ" * 7 + "Python3を使用"], cell_style))
+        assert lines == ["あ" * 7, "Python3を使用"]
+
+    def test_rules_hold_for_long_text(self, cell_style):
+        text = "既存システム（COBOL）の老朽化に伴い、業務要件の整理から「設計・実装」までを一貫して担当した。" * 4
+        lines = _lines(_plain_paragraph([text], cell_style), 97)
+        assert "".join(lines) == text
+        for line in lines[1:]:
+            assert line[0] not in CANNOT_START or line[0] in HANGING
+        for line in lines[:-1]:
+            assert line[-1] not in CANNOT_END
+
+    def test_line_breaks_and_markup(self, cell_style):
+        lines = _lines(JapaneseParagraph("<b>太字</b>と本文<br/><br/>改行後", cell_style))
+        assert lines == ["太字と本文", "", "改行後"]
+
+    def test_split_keeps_all_text(self, cell_style):
+        paragraph = _plain_paragraph(["あ" * 50], cell_style)
+        paragraph.wrap(WIDTH, 10000)
+        first, second = paragraph.split(WIDTH, cell_style.leading * 2.5)
+        assert _lines(first) == ["あ" * 10] * 2
+        assert _lines(second) == ["あ" * 10] * 3
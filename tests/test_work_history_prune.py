@@ -0,0 +1,140 @@
+"""Tests for period parsing and partial rendering (--sections / --since)."""
+
+from pathlib import Path
+
+import pytest
+
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.work_history.builder import layout_pdf
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from jp_tenshoku_docs_builder.work_history.models import (
+    SideCompany,
+    SideProject,
+    StandardCompany,
+    StandardProject,
+    StandardWorkHistory,
+)
+from jp_tenshoku_docs_builder.work_history.period import Period, YearMonth, parse_period
+from jp_tenshoku_docs_builder.work_history.prune import prune
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+class TestParsePeriod:
+    @pytest.mark.parametrize("text, expected", [
+        ("2018年4月～2020年3月", Period(YearMonth(2018, 4), YearMonth(2020, 3))),
+        ("2020年4月～現在", Period(YearMonth(2020, 4), None, current=True)),
+        ("２０２０年４月〜", Period(YearMonth(2020, 4), None, current=True)),
+        ("2020/04 - 2021/03", Period(YearMonth(2020, 4), YearMonth(2021, 3))),
+        ("2020.4", Period(YearMonth(2020, 4), YearMonth(2020, 4))),
+        ("令和2年4月～令和5年3月", Period(YearMonth(2020, 4), YearMonth(2023, 3))),
+        ("平成元年～", Period(YearMonth(1989, 1), None, current=True)),
+        ("2019年～2021年", Period(YearMonth(2019, 1), YearMonth(2021, 12))),
+    ])
+    def test_parse(self, text, expected):
+        assert parse_period(text) == expected
+
+    @pytest.mark.parametrize("text", ["20xx年xx月～現在", "8年0カ月", "2020年13月～", "2021年4月～2020年3月", ""])
+    def test_unparsable(self, text):
+        assert parse_period(text) is None
+
+    def test_reaches(self):
+        assert parse_period("2018年4月～2020年3月").reaches(YearMonth(2020, 3))
+        assert not parse_period("2018年4月～2020年3月").reaches(YearMonth(2020, 4))
+        assert parse_period("2010年4月～現在").reaches(YearMonth(2099, 1))
+
+    def test_year_month(self):
+        assert YearMonth.parse("2020-04") == YearMonth(2020, 4)
+        assert str(YearMonth(2020, 4)) == "2020-04"
+        for text in ("2020/04", "2020-13"):
+            with pytest.raises(ValueError):
+                YearMonth.parse(text)
+
+    def test_span_follows_period(self):
+        project = StandardProject(period="2020年4月～現在", name="P")
+        assert project.span.start == YearMonth(2020, 4)
+        assert "span" not in project.model_dump()
+        copied = project.model_copy(update={"period": "2018年4月～2019年3月"})
+        assert copied.span == Period(YearMonth(2018, 4), YearMonth(2019, 3))
+        project.period = "2021年1月～現在"
+        assert project.span.start == YearMonth(2021, 1)
+
+
+def _data() -> StandardWorkHistory:
+    def project(period: str) -> StandardProject:
+        return StandardProject(period=period, name=period)
+
+    return StandardWorkHistory(
+        date="2024年1月1日現在",
+        name="山田　太郎",
+        summary="要約",
+        highlights=["実績"],
+        experience=[
+            StandardCompany(company="A", period="2019年4月～現在", projects=[
+                project("2023年4月～現在"), project("2019年4月～2021年3月"), project("20xx年xx月～20xx年xx月"),
+            ]),
+            StandardCompany(company="B", period="2010年4月～2019年3月", projects=[project("2010年4月～2019年3月")]),
+            StandardCompany(company="C", period="2008年4月～2010年3月"),
+        ],
+        side_experience=[
+            SideCompany(company="S", period="2015年～2016年", projects=[SideProject(period="2015年～2016年", name="S")]),
+        ],
+    )
+
+
+class TestPrune:
+    def test_sections(self):
+        data = prune(_data(), sections=["experience"])
+        assert data.summary == "" and data.highlights == [] and data.side_experience == []
+        assert len(data.experience) == 3
+        assert data.name == "山田　太郎"
+
+    def test_since(self):
+        source = _data()
+        data = prune(source, since=YearMonth(2021, 1))
+        assert [c.company for c in data.experience] == ["A"]
+        assert [p.name for p in data.experience[0].projects] == [
+            "2023年4月～現在", "2019年4月～2021年3月", "20xx年xx月～20xx年xx月",
+        ]
+        assert data.side_experience == []
+        assert len(source.experience) == 3  # the source is not modified
+
+    def test_since_keeps_company_without_projects(self):
+        data = prune(_data(), since=YearMonth(2010, 1))
+        assert [c.company for c in data.experience] == ["A", "B", "C"]
+
+    def test_unknown_section(self):
+        with pytest.raises(ValueError, match="unknown section: foo"):
+            prune(_data(), sections=["experience", "foo"])
+
+    def test_pruned_layout_is_shorter(self, ipaex_font_dir):
+        data = load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+        full = layout_pdf(data, ipaex_font_dir)
+        pruned = layout_pdf(prune(data, sections=["summary", "self_pr"]), ipaex_font_dir)
+        assert pruned.pages < full.pages
+        assert [a.label for a in pruned.anchors if a.kind == "section"] == ["職務経歴書", "職務要約", "自己PR"]
+
+
+class TestCli:
+    def _preview(self, tmp_path, *options) -> str:
+        out = tmp_path / "out.md"
+        main([str(SAMPLE_DIR / "work_history_standard.yaml"), "-c", str(CREDENTIAL),
+              "--preview", "markdown", "-o", str(out), *options])
+        return out.read_text(encoding="utf-8")
+
+    def test_sections(self, tmp_path):
+        text = self._preview(tmp_path, "--sections", "summary, self_pr")
+        assert "職務要約" in text and "自己PR" in text
+        assert "職務経歴" not in text.replace("職務経歴書", "")
+
+    def test_invalid(self, tmp_path, capsys):
+        for options in (["--sections", "foo"], ["--since", "2020/01"]):
+            with pytest.raises(SystemExit):
+                self._preview(tmp_path, *options)
+        assert "Error: expected YYYY-MM" in capsys.readouterr().err
+
+    def test_resume_rejects_filters(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main([str(SAMPLE_DIR / "resume.yaml"), "-c", str(CREDENTIAL), "--type", "resume",
+                  "--since", "2020-01", "-o", str(tmp_path / "r.pdf")])
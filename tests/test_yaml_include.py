@@ -0,0 +1,190 @@
+"""Tests for !include fragments in the YAML loaders."""
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import yaml
+from yaml.constructor import ConstructorError
+
+from jp_tenshoku_docs_builder import yaml_include
+from jp_tenshoku_docs_builder.cli import main
+from jp_tenshoku_docs_builder.validate import validate_file
+from jp_tenshoku_docs_builder.work_history.loader import load_yaml
+from jp_tenshoku_docs_builder.yaml_include import load_yaml_file
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+CREDENTIAL = SAMPLE_DIR / "credential.yaml"
+
+
+@pytest.fixture(autouse=True)
+def empty_fragment_cache():
+    yaml_include._fragments.clear()
+    yield
+    yaml_include._fragments.clear()
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _split_sample(tmp_path: Path, variant: str = "a.yaml") -> Path:
+    """The standard sample with its skills and companies moved into fragments under shared/."""
+    shared_from_variant = "../" * (len(Path(variant).parts) - 1) + "shared"
+    data = yaml.safe_load((SAMPLE_DIR / "work_history_standard.yaml").read_text(encoding="utf-8"))
+    shared = tmp_path / "shared"
+    _write(shared / "skills.yaml", yaml.safe_dump(data.pop("technical_skills"), allow_unicode=True))
+    companies = []
+    for i, company in enumerate(data.pop("experience")):
+        _write(shared / f"company{i}.yaml", yaml.safe_dump(company, allow_unicode=True))
+        companies.append(f"  - !include {shared_from_variant}/company{i}.yaml")
+    body = yaml.safe_dump(data, allow_unicode=True)
+    return _write(
+        tmp_path / variant,
+        body + f"technical_skills: !include {shared_from_variant}/skills.yaml\nexperience:\n"
+        + "\n".join(companies) + "\n",
+    )
+
+
+class TestInclude:
+    def test_same_data_as_single_file(self, tmp_path):
+        variant = _split_sample(tmp_path)
+        expected = load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+        assert load_yaml(variant, credential_path=CREDENTIAL) == expected
+
+    def test_sibling_shared_directory_with_include_root(self, tmp_path):
+        variant = _split_sample(tmp_path, "variants/a.yaml")
+        expected = load_yaml(SAMPLE_DIR / "work_history_standard.yaml", credential_path=CREDENTIAL)
+        assert load_yaml(variant, credential_path=CREDENTIAL, include_root=tmp_path) == expected
+        with pytest.raises(ConstructorError, match="outside"):
+            load_yaml(variant, credential_path=CREDENTIAL)
+
+    def test_include_root_still_contains(self, tmp_path):
+        _write(tmp_path / "secret.yaml", "token: x\n")
+        _write(tmp_path / "cv" / "shared" / "skills.yaml", "- Python\n")
+        top = _write(tmp_path / "cv" / "variants" / "a.yaml", "x: !include ../../secret.yaml\n")
+        with pytest.raises(ConstructorError, match="outside"):
+            load_yaml_file(top, root=tmp_path / "cv")
+
+    def test_cli_include_root(self, tmp_path):
+        variant = _split_sample(tmp_path, "variants/a.yaml")
+        out = tmp_path / "out.md"
+        main([str(variant), "-c", str(CREDENTIAL), "--preview", "markdown", "-o", str(out),
+              "--include-root", str(tmp_path)])
+        assert "株式会社" in out.read_text(encoding="utf-8")
+
+    def test_relative_to_including_file(self, tmp_path):
+        _write(tmp_path / "a" / "b" / "leaf.yaml", "value: 1\n")
+        _write(tmp_path / "a" / "mid.yaml", "leaf: !include b/leaf.yaml\n")
+        top = _write(tmp_path / "top.yaml", "mid: !include a/mid.yaml\n")
+        assert load_yaml_file(top) == {"mid": {"leaf": {"value": 1}}}
+
+    def test_cycle(self, tmp_path):
+        _write(tmp_path / "a.yaml", "b: !include b.yaml\n")
+        _write(tmp_path / "b.yaml", "a: !include a.yaml\n")
+        with pytest.raises(ConstructorError, match=r"!include cycle: .*a\.yaml -> .*b\.yaml -> .*a\.yaml"):
+            load_yaml_file(tmp_path / "a.yaml")
+
+    def test_cycle_through_cached_fragment(self, tmp_path):
+        _write(tmp_path / "b.yaml", "c: !include c.yaml\n")
+        _write(tmp_path / "c.yaml", "1\n")
+        top = _write(tmp_path / "top.yaml", "b: !include b.yaml\n")
+        load_yaml_file(top)
+        with pytest.raises(ConstructorError, match="cycle"):
+            load_yaml_file(_write(tmp_path / "c.yaml", "b: !include b.yaml\n"))
+
+    def test_missing_fragment(self, tmp_path):
+        top = _write(tmp_path / "top.yaml", "skills: !include nowhere.yaml\n")
+        with pytest.raises(ConstructorError, match="cannot include nowhere.yaml") as e:
+            load_yaml_file(top)
+        assert e.value.problem_mark.line == 0
+
+    @pytest.mark.parametrize("name", ["../secret.yaml", "/etc/passwd"])
+    def test_outside_root_rejected(self, tmp_path, name):
+        _write(tmp_path / "secret.yaml", "token: x\n")
+        top = _write(tmp_path / "docs" / "top.yaml", f"x: !include {name}\n")
+        with pytest.raises(ConstructorError, match="outside"):
+            load_yaml_file(top)
+
+    def test_nested_include_checked_against_top_level_root(self, tmp_path):
+        _write(tmp_path / "secret.yaml", "token: x\n")
+        _write(tmp_path / "docs" / "sub" / "mid.yaml", "x: !include ../../secret.yaml\n")
+        top = _write(tmp_path / "docs" / "top.yaml", "mid: !include sub/mid.yaml\n")
+        with pytest.raises(ConstructorError, match="outside"):
+            load_yaml_file(top)
+
+    def test_cached_fragment_checked_against_root(self, tmp_path):
+        _write(tmp_path / "secret.yaml", "token: x\n")
+        _write(tmp_path / "sub" / "mid.yaml", "x: !include ../secret.yaml\n")
+        load_yaml_file(_write(tmp_path / "top.yaml", "mid: !include sub/mid.yaml\n"))
+        with pytest.raises(ConstructorError, match="outside"):
+            load_yaml_file(_write(tmp_path / "sub" / "top.yaml", "mid: !include mid.yaml\n"))
+
+    def test_unsafe_tags_rejected(self, tmp_path):
+        _write(tmp_path / "evil.yaml", "!!python/object/apply:os.system ['true']\n")
+        top = _write(tmp_path / "top.yaml", "x: !include evil.yaml\n")
+        with pytest.raises(ConstructorError):
+            load_yaml_file(top)
+
+
+class TestFragmentCache:
+    def test_shared_fragments_parsed_once(self, tmp_path):
+        _write(tmp_path / "skills.yaml", "- name: Python\n")
+        variants = [_write(tmp_path / f"v{i}.yaml", f"name: v{i}\nskills: !include skills.yaml\n") for i in range(5)]
+        with mock.patch.object(yaml_include, "_parse", wraps=yaml_include._parse) as parse:
+            results = [load_yaml_file(v) for v in variants]
+        parsed = [call.args[0].name for call in parse.call_args_list]
+        assert parsed.count("skills.yaml") == 1
+        assert all(r["skills"] == [{"name": "Python"}] for r in results)
+
+    def test_nested_change_invalidates(self, tmp_path):
+        leaf = _write(tmp_path / "leaf.yaml", "1\n")
+        _write(tmp_path / "mid.yaml", "leaf: !include leaf.yaml\n")
+        top = _write(tmp_path / "top.yaml", "mid: !include mid.yaml\n")
+        assert load_yaml_file(top) == {"mid": {"leaf": 1}}
+        stat = leaf.stat()
+        leaf.write_text("2\n", encoding="utf-8")
+        os.utime(leaf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert load_yaml_file(top) == {"mid": {"leaf": 2}}
+
+    def test_cache_is_bounded(self, tmp_path):
+        fragments = [_write(tmp_path / f"f{i}.yaml", f"{i}\n") for i in range(4)]
+        top = _write(tmp_path / "top.yaml", "[" + ", ".join(f"!include {f.name}" for f in fragments) + "]\n")
+        with mock.patch.object(yaml_include, "_MAX_FRAGMENTS", 2):
+            assert load_yaml_file(top) == [0, 1, 2, 3]
+        assert list(yaml_include._fragments) == [f.resolve() for f in fragments[2:]]
+
+    def test_results_are_independent(self, tmp_path):
+        _write(tmp_path / "skills.yaml", "- Python\n")
+        top = _write(tmp_path / "top.yaml", "skills: !include skills.yaml\n")
+        load_yaml_file(top)["skills"].append("Go")
+        assert load_yaml_file(top) == {"skills": ["Python"]}
+
+
+class TestValidate:
+    def test_error_in_fragment_points_at_include(self, tmp_path):
+        variant = _split_sample(tmp_path)
+        _write(tmp_path / "shared" / "skills.yaml", "- category: OS\n  items: not-a-list\n")
+        issues = validate_file(variant)
+        assert issues
+        assert all(i.file == str(variant) for i in issues)
+        include_line = variant.read_text(encoding="utf-8").splitlines().index(
+            "technical_skills: !include shared/skills.yaml",
+        ) + 1
+        assert {i.line for i in issues} == {include_line}
+
+    def test_include_root(self, tmp_path):
+        variant = _split_sample(tmp_path, "variants/a.yaml")
+        assert validate_file(variant, include_root=tmp_path) == []
+        [issue] = validate_file(variant)
+        assert issue.type == "yaml" and "outside" in issue.message
+
+    def test_syntax_error_in_fragment(self, tmp_path):
+        _write(tmp_path / "bad.yaml", "key: [unclosed\n")
+        top = _write(tmp_path / "top.yaml", "skills: !include bad.yaml\n")
+        [issue] = validate_file(top)
+        assert issue.type == "yaml"
+        assert Path(issue.file).name == "bad.yaml"